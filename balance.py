@@ -0,0 +1,143 @@
+"""Tune wolf counts per player count and special-role deck toward a target village win rate.
+
+Each candidate (players, deck, wolves) is played with sim_batch in rounds, and every round's
+wins are added to a JSON cache, so an interrupted or repeated run resumes instead of starting
+over. A candidate stops being played once its confidence interval is narrow enough, or as
+soon as even its best case is further from the target than another candidate's worst case.
+The output is the table rules.load_balance() reads when the server starts.
+"""
+from __future__ import annotations
+
+import json
+import math
+import statistics
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import rules
+import sim
+import sim_batch
+from rules import Role
+
+ALL_DECKS: List[FrozenSet[Role]] = [frozenset(r for r, on in zip(rules.SPECIAL_ROLES, config) if on) for config in sim.ALL_CONFIGS]
+
+
+def z_score(confidence: float) -> float:
+    return statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+@dataclass
+class Estimate:
+    """Village wins out of games played for one candidate."""
+    wins: int = 0
+    games: int = 0
+
+    @property
+    def rate(self) -> float:
+        return self.wins / self.games if self.games else 0.5
+
+    def interval(self, z: float) -> Tuple[float, float]:
+        """Wilson score interval; (0, 1) before any game."""
+        if not self.games:
+            return 0.0, 1.0
+        n, p = self.games, self.rate
+        centre = (p + z * z / (2 * n)) / (1 + z * z / n)
+        half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return max(0.0, centre - half), min(1.0, centre + half)
+
+    def distance(self, target: float, z: float) -> Tuple[float, float]:
+        """Closest and furthest the true rate can be from target, within the interval."""
+        lo, hi = self.interval(z)
+        worst = max(abs(lo - target), abs(hi - target))
+        return (0.0 if lo <= target <= hi else min(abs(lo - target), abs(hi - target))), worst
+
+
+class Cache:
+    """(wins, games) per candidate, persisted as JSON so runs accumulate."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.entries: Dict[str, List[int]] = {}
+        if path and path.exists():
+            self.entries = json.loads(path.read_text(encoding="utf-8"))
+
+    @staticmethod
+    def key(policy: str, players: int, deck: FrozenSet[Role], wolves: int) -> str:
+        return f"{policy}|{players}|{rules.deck_key(deck)}|{wolves}"
+
+    def get(self, key: str) -> Estimate:
+        wins, games = self.entries.get(key, (0, 0))
+        return Estimate(wins, games)
+
+    def add(self, key: str, wins: int, games: int) -> Estimate:
+        est = self.get(key)
+        self.entries[key] = [est.wins + wins, est.games + games]
+        return self.get(key)
+
+    def save(self) -> None:
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.entries, sort_keys=True), encoding="utf-8")
+
+
+def wolf_options(players: int, deck: FrozenSet[Role]) -> List[int]:
+    """Wolf counts worth trying: at least one, fewer than everyone else, with room for the deck."""
+    return [w for w in range(1, players) if w < players - w and w + len(deck) <= players]
+
+
+def play(players: int, deck: FrozenSet[Role], wolves: int, games: int, policy: str, rng: np.random.Generator) -> int:
+    """Village wins out of `games` simulated games."""
+    config = tuple(r in deck for r in rules.SPECIAL_ROLES)
+    winners, _ = sim_batch.Batch(sim_batch.deal(games, players, config, rng, wolves=wolves), policy, rng).run().results()
+    return int((winners == sim_batch.VILLAGERS).sum())
+
+
+def tune_deck(players: int, deck: FrozenSet[Role], cache: Cache, target: float = 0.5, confidence: float = 0.95,
+              precision: float = 0.01, round_games: int = 20000, max_games: int = 400000,
+              policy: str = "informed", seed: int = 0) -> Tuple[int, Dict[int, Estimate]]:
+    """Best wolf count for one table size and deck, plus the estimate of every candidate tried."""
+    z = z_score(confidence)
+    estimates = {w: cache.get(Cache.key(policy, players, deck, w)) for w in wolf_options(players, deck)}
+    live = set(estimates)
+    while True:
+        # Early stop: drop candidates that can no longer be the closest to target
+        best_worst = min(estimates[w].distance(target, z)[1] for w in live)
+        live = {w for w in live if estimates[w].distance(target, z)[0] <= best_worst}
+        todo = [w for w in sorted(live) if estimates[w].games < max_games
+                and (estimates[w].interval(z)[1] - estimates[w].interval(z)[0]) / 2 > precision]
+        if not todo:
+            break
+        for w in todo:
+            key = Cache.key(policy, players, deck, w)
+            rng = np.random.default_rng([seed, players, w, sum(1 << i for i, r in enumerate(rules.SPECIAL_ROLES) if r in deck),
+                                         estimates[w].games])  # Fresh stream for every round, also across resumed runs
+            estimates[w] = cache.add(key, play(players, deck, w, round_games, policy, rng), round_games)
+        cache.save()
+    best = min(live, key=lambda w: (abs(estimates[w].rate - target), w))
+    return best, {w: estimates[w] for w in sorted(estimates) if estimates[w].games}
+
+
+def tune(player_counts: Sequence[int], decks: Iterable[FrozenSet[Role]] = ALL_DECKS, cache: Optional[Cache] = None,
+         target: float = 0.5, confidence: float = 0.95, policy: str = "informed", **kw: Any) -> Dict[str, Any]:
+    """Balance table for rules.load_balance(): the chosen wolf count per (players, deck), with its interval."""
+    cache = cache or Cache()
+    z = z_score(confidence)
+    counts: Dict[str, Dict[str, Any]] = {}
+    recommended: Dict[str, str] = {}
+    for n in player_counts:
+        row = counts[str(n)] = {}
+        for deck in decks:
+            if not wolf_options(n, deck):
+                continue
+            wolves, estimates = tune_deck(n, deck, cache, target=target, confidence=confidence, policy=policy, **kw)
+            est = estimates[wolves]
+            lo, hi = est.interval(z)
+            row[rules.deck_key(deck)] = {"wolves": wolves, "villager_win": round(est.rate, 4),
+                                         "ci": [round(lo, 4), round(hi, 4)], "games": est.games,
+                                         "tried": {str(w): round(e.rate, 4) for w, e in estimates.items()}}
+        if row:
+            recommended[str(n)] = min(row, key=lambda k: (abs(row[k]["villager_win"] - target), -len(rules.parse_deck(k))))
+    return {"target": target, "confidence": confidence, "policy": policy, "counts": counts, "recommended": recommended}
@@ -0,0 +1,285 @@
+"""Loup-Garou rules as pure functions: a Table and the players' inputs in, a new Table and events out.
+
+Nothing here touches asyncio, sockets, the clock or the global `random`: every random choice
+takes an explicit random.Random, so the same seed and inputs replay the same game. server.Game
+collects input under its deadlines and turns the returned events into narration and messages.
+"""
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import dataclass, replace
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+
+class Role(str, Enum):
+    VILLAGER = "villager"
+    WEREWOLF = "werewolf"
+    SEER = "seer"
+    WITCH = "witch"
+    CUPID = "cupid"
+
+
+WEREWOLF_COUNT_RANGES = {
+    (5, 7): 1,
+    (8, 11): 2,
+    (12, 15): 3,
+    (16, 99): 4,
+}
+
+UNIQUE_ROLES = {Role.SEER, Role.WITCH, Role.CUPID}
+SPECIAL_ROLES = (Role.SEER, Role.WITCH, Role.CUPID)  # In deck_key order
+
+# Tuned wolf counts by (player count, enabled special roles), from scripts/tune_balance.py.
+# Empty unless load_balance() was called; WEREWOLF_COUNT_RANGES covers everything else.
+BALANCE: Dict[Tuple[int, FrozenSet[Role]], int] = {}
+
+
+def deck_key(specials: Iterable[Role]) -> str:
+    """Stable name for a set of special roles, as used in balance tables: "seer+witch", "none"."""
+    chosen = set(specials)
+    return "+".join(r.value for r in SPECIAL_ROLES if r in chosen) or "none"
+
+
+def parse_deck(key: str) -> FrozenSet[Role]:
+    return frozenset() if key == "none" else frozenset(Role(name) for name in key.split("+"))
+
+
+def load_balance(path: Union[str, Path]) -> int:
+    """Replace BALANCE with the "counts" of a tuned table; returns how many entries were loaded."""
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    table = {}
+    for players, decks in data["counts"].items():
+        for key, entry in decks.items():
+            wolves, deck = int(entry["wolves"]), parse_deck(key)
+            if not 1 <= wolves < int(players):
+                raise ValueError(f"{path}: bad wolf count {wolves} for {players} players")
+            if wolves + len(deck) > int(players):
+                raise ValueError(f"{path}: {wolves} wolves and deck {key} don't fit {players} players")
+            table[(int(players), deck)] = wolves
+    BALANCE.clear()
+    BALANCE.update(table)
+    return len(table)
+
+
+def get_werewolf_count(player_count: int, specials: Optional[Iterable[Role]] = None) -> int:
+    if specials is not None:
+        tuned = BALANCE.get((player_count, frozenset(specials)))
+        if tuned is not None:
+            return tuned
+    for (min_p, max_p), wolf_count in WEREWOLF_COUNT_RANGES.items():
+        if min_p <= player_count <= max_p:
+            return wolf_count
+    return 1
+
+
+@dataclass(frozen=True)
+class Seat:
+    """One player as the rules see them; field names match server.Player."""
+    id: str
+    role: Optional[Role] = None
+    alive: bool = True
+    lover_id: Optional[str] = None
+    witch_heal_used: bool = False
+    witch_poison_used: bool = False
+
+
+@dataclass(frozen=True)
+class Table:
+    """Everything the rules need between steps; field names match server.GameState."""
+    seats: Tuple[Seat, ...] = ()
+    night_count: int = 0
+    day_count: int = 0
+    wolves_victim: Optional[str] = None
+    witch_heal: bool = False
+    witch_poison_target: Optional[str] = None
+
+    def seat(self, player_id: Any) -> Optional[Seat]:
+        for s in self.seats:
+            if s.id == player_id:
+                return s
+        return None
+
+    def is_alive(self, player_id: Any) -> bool:
+        s = self.seat(player_id)
+        return s is not None and s.alive
+
+    def alive(self) -> List[Seat]:
+        return [s for s in self.seats if s.alive]
+
+    def by_role(self, role: Role) -> List[Seat]:
+        """Alive seats holding role, in seat order."""
+        return [s for s in self.seats if s.alive and s.role == role]
+
+    def with_seats(self, changes: Mapping[str, Dict[str, Any]]) -> "Table":
+        """Copy with the given fields replaced on the given seats."""
+        return replace(self, seats=tuple(replace(s, **changes[s.id]) if s.id in changes else s for s in self.seats))
+
+
+SEAT_FIELDS = ("role", "alive", "lover_id", "witch_heal_used", "witch_poison_used")
+TABLE_FIELDS = ("night_count", "day_count", "wolves_victim", "witch_heal", "witch_poison_target")
+
+
+@dataclass(frozen=True)
+class LoversLinked:
+    a: str
+    b: str
+
+
+@dataclass(frozen=True)
+class VictimChosen:
+    victim: Optional[str]
+    forced: bool  # No valid wolf vote: picked at random among non-wolves
+
+
+@dataclass(frozen=True)
+class SeerSaw:
+    seer_id: str
+    target_id: str
+    role: Optional[Role]
+
+
+@dataclass(frozen=True)
+class Died:
+    player_id: str
+    role: Optional[Role]
+    cause: str  # "night", "grief" or "vote"
+    lover_of: Optional[str] = None  # For grief: the lover whose death caused this one
+
+
+@dataclass(frozen=True)
+class VoteResolved:
+    tally: Tuple[Tuple[str, int], ...]  # (target, votes), most votes first
+    eliminated: Optional[str]
+
+
+Event = Union[LoversLinked, VictimChosen, SeerSaw, Died, VoteResolved]
+Step = Tuple[Table, List[Event]]
+
+
+def deal(player_ids: Sequence[str], rng: random.Random, seer: bool = True, witch: bool = True, cupid: bool = True,
+         wolves: Optional[int] = None) -> Table:
+    """Fresh table with roles dealt: the werewolf count for the table size and deck (or `wolves`),
+    the enabled special roles, villagers for the rest."""
+    ids = list(player_ids)
+    rng.shuffle(ids)
+    specials = [role for role, on in zip(SPECIAL_ROLES, (seer, witch, cupid)) if on]
+    roles = [Role.WEREWOLF] * (wolves if wolves is not None else get_werewolf_count(len(ids), specials))
+    roles += specials
+    roles += [Role.VILLAGER] * (len(ids) - len(roles))
+    rng.shuffle(roles)
+    dealt = dict(zip(ids, roles))
+    return Table(seats=tuple(Seat(id=pid, role=dealt.get(pid)) for pid in player_ids))
+
+
+def begin_night(table: Table) -> Table:
+    return replace(table, night_count=table.night_count + 1, wolves_victim=None, witch_heal=False, witch_poison_target=None)
+
+
+def begin_day(table: Table) -> Table:
+    return replace(table, day_count=table.day_count + 1)
+
+
+def link_lovers(table: Table, targets: Sequence[Any]) -> Step:
+    """Cupid's pick: exactly two distinct living players become lovers, otherwise nothing happens."""
+    lovers = list(dict.fromkeys(t for t in targets if table.is_alive(t)))
+    if len(lovers) != 2:
+        return table, []
+    a, b = lovers
+    return table.with_seats({a: {"lover_id": b}, b: {"lover_id": a}}), [LoversLinked(a, b)]
+
+
+def wolves_choose(table: Table, votes: Mapping[str, Any], rng: random.Random) -> Step:
+    """Majority of the living wolves' votes for a living non-wolf, ties broken at random.
+
+    Wolves must kill: with no valid vote the victim is a random non-wolf.
+    """
+    tally: Dict[str, int] = {}
+    for wid, target in votes.items():
+        wolf, victim = table.seat(wid), table.seat(target)
+        if wolf and wolf.alive and wolf.role == Role.WEREWOLF and victim and victim.alive and victim.role != Role.WEREWOLF:
+            tally[victim.id] = tally.get(victim.id, 0) + 1
+    if tally:
+        top = max(tally.values())
+        victim_id: Optional[str] = rng.choice([s.id for s in table.seats if tally.get(s.id) == top])
+        forced = False
+    else:
+        non_wolves = [s.id for s in table.alive() if s.role != Role.WEREWOLF]
+        victim_id = rng.choice(non_wolves) if non_wolves else None
+        forced = victim_id is not None
+    return replace(table, wolves_victim=victim_id), [VictimChosen(victim_id, forced)]
+
+
+def seer_peek(table: Table, seer_id: str, target: Any) -> Step:
+    """The seer learns a living player's role; nothing else changes."""
+    seen = table.seat(target)
+    if seen is None or not seen.alive:
+        return table, []
+    return table, [SeerSaw(seer_id, seen.id, seen.role)]
+
+
+def witch_decide(table: Table, witch_id: str, heal: bool, poison_target: Any) -> Step:
+    """Each potion works once per game; poison needs a living target."""
+    witch = table.seat(witch_id)
+    if witch is None:
+        return table, []
+    changes: Dict[str, Any] = {}
+    if heal and not witch.witch_heal_used:
+        changes["witch_heal_used"] = True
+        table = replace(table, witch_heal=True)
+    if table.is_alive(poison_target) and not witch.witch_poison_used:
+        changes["witch_poison_used"] = True
+        table = replace(table, witch_poison_target=poison_target)
+    if changes:
+        table = table.with_seats({witch_id: changes})
+    return table, []
+
+
+def resolve_night(table: Table) -> Step:
+    """Apply the wolves' kill (unless healed) and the poison; lovers of the dead die of grief."""
+    deaths: List[Died] = []
+    for pid in (None if table.witch_heal else table.wolves_victim, table.witch_poison_target):
+        seat = table.seat(pid)
+        if seat and seat.alive and all(d.player_id != pid for d in deaths):
+            deaths.append(Died(seat.id, seat.role, "night"))
+    deaths.sort(key=lambda d: [s.id for s in table.seats].index(d.player_id))
+    for d in deaths:  # Grows while iterating: a grief death can trigger its own lover's
+        lover = table.seat(table.seat(d.player_id).lover_id)
+        if lover and lover.alive and all(x.player_id != lover.id for x in deaths):
+            deaths.append(Died(lover.id, lover.role, "grief", lover_of=d.player_id))
+    return table.with_seats({d.player_id: {"alive": False} for d in deaths}), list(deaths)
+
+
+def resolve_vote(table: Table, votes: Mapping[str, Any], rng: random.Random) -> Step:
+    """Village vote among the living: most votes is eliminated, ties at random, no votes at all picks anyone."""
+    tally: Dict[str, int] = {}
+    for voter, target in votes.items():
+        if table.is_alive(voter) and table.is_alive(target):
+            tally[target] = tally.get(target, 0) + 1
+    if tally:
+        top = max(tally.values())
+        eliminated: Optional[str] = rng.choice([s.id for s in table.seats if tally.get(s.id) == top])
+    else:
+        alive = table.alive()
+        eliminated = rng.choice(alive).id if alive else None
+    ranked = tuple(sorted(tally.items(), key=lambda item: -item[1]))
+    events: List[Event] = [VoteResolved(ranked, eliminated)]
+    if eliminated is None:
+        return table, events
+    events.append(Died(eliminated, table.seat(eliminated).role, "vote"))
+    return table.with_seats({eliminated: {"alive": False}}), events
+
+
+def winner(table: Table) -> Optional[str]:
+    """"nobody", "villagers" or "werewolves" once the game is decided, else None."""
+    wolves = len(table.by_role(Role.WEREWOLF))
+    others = len(table.alive()) - wolves
+    if wolves + others == 0:
+        return "nobody"
+    if wolves == 0:
+        return "villagers"
+    if wolves >= others:
+        return "werewolves"
+    return None
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark Game._broadcast_public latency against the number of connected clients.
+
+Clients are in-memory fake sockets with a small random send latency; one of
+them can be made artificially slow to show that it no longer holds up the
+whole broadcast. The "fan-out" column times a broadcast until every client's
+writer task delivered the frame; the "sequential" column replays the old
+one-by-one loop (json.dumps per client, awaited in turn) for comparison.
+
+    python scripts/bench_broadcast.py --clients 1 4 8 16 32 --slow-ms 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server import Game, Player, WSClient, WSClientType  # noqa: E402
+
+
+class BenchSocket:
+    def __init__(self, latency: float, delivered: "Delivery") -> None:
+        self.latency = latency
+        self.delivered = delivered
+
+    async def send_text(self, data: str) -> None:
+        await asyncio.sleep(self.latency)
+        self.delivered.tick()
+
+    async def close(self) -> None:
+        pass
+
+
+class Delivery:
+    """Counts frames that reached a socket so a broadcast can be timed end to end."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.target = 0
+        self.done = asyncio.Event()
+
+    def expect(self, n: int) -> None:
+        self.count = 0
+        self.target = n
+        self.done.clear()
+
+    def tick(self) -> None:
+        self.count += 1
+        if self.count >= self.target:
+            self.done.set()
+
+
+def build_game(n_clients: int, n_players: int, base_ms: float, slow_ms: float, delivered: Delivery) -> Game:
+    game = Game()
+    game.SEND_TIMEOUT = 10.0
+    for i in range(n_players):
+        pid = f"p{i}"
+        game.players[pid] = Player(id=pid, name=f"Joueur {i}")
+    for i in range(n_clients):
+        latency = random.uniform(0, base_ms) / 1000
+        if slow_ms and i == 0:
+            latency = slow_ms / 1000
+        game._register_client(WSClient(websocket=BenchSocket(latency, delivered), client_type=WSClientType.TV))
+    return game
+
+
+async def sequential(game: Game, msg: dict) -> None:
+    for c in list(game._clients):
+        await c.websocket.send_text(json.dumps(msg, ensure_ascii=False))
+
+
+async def fanout(game: Game, msg: dict, delivered: Delivery) -> None:
+    """Queue the broadcast and wait until every client's writer delivered it."""
+    delivered.expect(len(game._clients))
+    await game._broadcast_public(msg)
+    await delivered.done.wait()
+
+
+async def measure(fn, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description="Broadcast latency vs client count")
+    ap.add_argument("--clients", type=int, nargs="+", default=[1, 4, 8, 13, 16, 32, 64])
+    ap.add_argument("--players", type=int, default=12, help="Players in the snapshot payload")
+    ap.add_argument("--base-ms", type=float, default=2.0, help="Max random per-send latency")
+    ap.add_argument("--slow-ms", type=float, default=0.0, help="Latency of one slow client (0 = none)")
+    ap.add_argument("--rounds", type=int, default=20)
+    args = ap.parse_args()
+
+    print(f"{'clients':>8} {'sequential ms':>14} {'fan-out ms':>11} {'speedup':>8}")
+    for n in args.clients:
+        delivered = Delivery()
+        game = build_game(n, args.players, args.base_ms, args.slow_ms, delivered)
+        msg = {"type": "NARRATOR_LINE", "line": "x" * 200, "data": game._public_snapshot()}
+        delivered.expect(10**9)
+        seq = await measure(lambda: sequential(game, msg), args.rounds)
+        fan = await measure(lambda: fanout(game, msg, delivered), args.rounds)
+        for c in list(game._clients):
+            game._unregister_client(c)
+        await asyncio.sleep(0)
+        print(f"{n:>8} {seq:>14.2f} {fan:>11.2f} {seq / fan if fan else 0:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
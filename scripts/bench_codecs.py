@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark the /ws codecs: encode time and bytes per tick.
+
+A "tick" is what one _sync_all pushes: the public snapshot once, plus one
+private snapshot per player. Each codec encodes the same messages from a
+started game with N players.
+
+    python scripts/bench_codecs.py --players 8 16 32 --rounds 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server import CODECS, Game  # noqa: E402
+
+
+async def build_game(n_players: int) -> Game:
+    game = Game()
+    for i in range(n_players):
+        await game.join(f"Joueur {i}")
+    game._assign_roles()
+    return game
+
+
+def size(frame) -> int:
+    return len(frame.encode("utf-8") if isinstance(frame, str) else frame)
+
+
+def measure(encode, msgs, rounds: int) -> float:
+    samples = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for msg in msgs:
+            encode(msg)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1e6
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description="Encode time and size per codec")
+    ap.add_argument("--players", type=int, nargs="+", default=[6, 12, 24])
+    ap.add_argument("--rounds", type=int, default=200)
+    args = ap.parse_args()
+
+    print(f"{'players':>8} {'codec':>12} {'public B':>9} {'private B':>10} {'tick B':>8} {'tick us':>9}")
+    for n in args.players:
+        game = await build_game(n)
+        public = {"type": "PUBLIC_STATE", "data": game._public_snapshot()}
+        privates = [{"type": "PRIVATE_STATE", "data": game._private_snapshot(pid)} for pid in game.players]
+        for name, encode in CODECS.items():
+            pub_b = size(encode(public))
+            priv_b = sum(size(encode(m)) for m in privates)
+            tick_us = measure(encode, [public, *privates], args.rounds)
+            print(f"{n:>8} {name:>12} {pub_b:>9} {priv_b // n:>10} {pub_b + priv_b:>8} {tick_us:>9.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark request throughput with 1, 2 and 4 room shards.
+
+For each shard count this starts scripts/run_shards.py on a free port, creates
+--rooms rooms, then runs --concurrency HTTP clients for --seconds. The clients
+mix joins (capped per room), /api/state reads and health checks on random rooms.
+Requests that land on a non-owning process are forwarded, so the numbers
+include that hop. Expect scaling only up to the number of CPU cores.
+
+    python scripts/bench_shards.py --shards 1 2 4 --rooms 64 --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get("/api/rooms")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            if time.monotonic() > deadline:
+                raise
+        await asyncio.sleep(0.1)
+
+
+async def worker(client: httpx.AsyncClient, codes: list, joined: dict, stop: float, latencies: list) -> None:
+    while time.monotonic() < stop:
+        code = random.choice(codes)
+        t0 = time.perf_counter()
+        r = random.random()
+        if r < 0.2 and joined[code] < 12:
+            joined[code] += 1
+            await client.post(f"/api/rooms/{code}/join", json={"name": f"J{joined[code]}"})
+        elif r < 0.8:
+            await client.get(f"/api/rooms/{code}/state")
+        else:
+            await client.get(f"/api/rooms/{code}/health")
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+
+async def run(shards: int, args: argparse.Namespace) -> tuple:
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, str(ROOT / "scripts" / "run_shards.py"), "--shards", str(shards),
+         "--host", "127.0.0.1", "--port", str(port), "--socket", f"/tmp/lg-bench-{port}-{{}}.sock"],
+        stdout=subprocess.DEVNULL,
+    )
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=30) as client:
+            await wait_ready(client)
+            codes = [(await client.post("/api/rooms")).json()["room"] for _ in range(args.rooms)]
+            joined = {code: 0 for code in codes}
+            latencies: list = []
+            t0 = time.monotonic()
+            stop = t0 + args.seconds
+            await asyncio.gather(*(worker(client, codes, joined, stop, latencies) for _ in range(args.concurrency)))
+            elapsed = time.monotonic() - t0
+    finally:
+        proc.terminate()
+        proc.wait()
+    q = statistics.quantiles(latencies, n=100)
+    return len(latencies) / elapsed, q[49], q[98]
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description="Throughput vs number of room shards")
+    ap.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--rooms", type=int, default=64)
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--seconds", type=float, default=10.0)
+    args = ap.parse_args()
+
+    print(f"{'shards':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for n in args.shards:
+        rps, p50, p99 = await run(n, args)
+        print(f"{n:>7} {rps:>9.0f} {p50:>8.1f} {p99:>8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
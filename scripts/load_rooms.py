@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Load test: run hundreds of rooms concurrently in one process.
+
+Every room gets its own Game from a GameRegistry, a handful of server.Bot
+players (the in-process twin of player.js ?bot=1: they receive every message
+through the normal outbox and answer through the /ws RPC handler), one TV on
+an in-memory sink, and phase timers shrunk to --step seconds. The report shows how
+many games reached GAME_OVER, wall time, and event-loop lag percentiles,
+which is what players would feel as input and broadcast latency.
+
+    python scripts/load_rooms.py --rooms 300 --players 8 --step 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from server import Game, GameRegistry, Phase, WSClient, WSClientType, add_bots  # noqa: E402
+
+class SinkSocket:
+    """Accepts frames and counts bytes, like a fast client on the LAN.
+
+    Every frame counts as answered, so the heartbeat reaper sees a live TV.
+    """
+
+    def __init__(self, counter: Counter) -> None:
+        self.counter = counter
+        self.client: Optional[WSClient] = None
+
+    async def send_text(self, data: str) -> None:
+        self._got(len(data))
+
+    async def send_bytes(self, data: bytes) -> None:
+        self._got(len(data))
+
+    def _got(self, size: int) -> None:
+        self.counter["frames"] += 1
+        self.counter["bytes"] += size
+        if self.client:
+            self.client.last_seen = time.time()
+
+    async def close(self) -> None:
+        pass
+
+
+async def run_room(game: Game, players: int, step: float, sink: Counter, bot_frames: Counter) -> None:
+    bots = await add_bots(game, players, think=(0.0, step / 2))
+    game.T_NIGHT_STEP = game.T_DISCUSS = game.T_VOTE = step
+    game.T_RESULT = 0
+    tv = SinkSocket(sink)
+    tv.client = WSClient(websocket=tv, client_type=WSClientType.TV)
+    game._register_client(tv.client)
+    await game.start()
+    try:
+        await game._runner_task
+    finally:
+        for bot in bots:
+            bot_frames.update(bot.stats)
+            bot.stop()
+
+
+async def lag_monitor(samples: list, interval: float = 0.01) -> None:
+    while True:
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - t0 - interval) * 1000)
+
+
+def pct(values: list, q: float) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else (values[0] if values else 0.0)
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description="Many concurrent rooms in one process")
+    ap.add_argument("--rooms", type=int, default=300)
+    ap.add_argument("--players", type=int, default=8)
+    ap.add_argument("--step", type=float, default=0.2, help="Seconds per timed phase")
+    ap.add_argument("--timeout", type=float, default=120.0)
+    args = ap.parse_args()
+
+    registry = GameRegistry(max_rooms=args.rooms + 1)
+    sink: Counter = Counter()
+    bot_frames: Counter = Counter()
+    lag: list = []
+    monitor = asyncio.create_task(lag_monitor(lag))
+
+    t0 = time.perf_counter()
+    rooms = [registry.create()[1] for _ in range(args.rooms)]
+    results = await asyncio.wait_for(
+        asyncio.gather(*(run_room(g, args.players, args.step, sink, bot_frames) for g in rooms), return_exceptions=True),
+        args.timeout,
+    )
+    wall = time.perf_counter() - t0
+    monitor.cancel()
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    over = sum(1 for g in rooms if g.state.phase == Phase.GAME_OVER)
+    winners = Counter(g.state.winner for g in rooms)
+    for code in [r["room"] for r in registry.list() if r["room"] != registry.DEFAULT_ROOM]:
+        await registry.close(code)
+
+    print(f"rooms          {args.rooms} x {args.players} players, {args.step}s phases")
+    print(f"game over      {over}/{args.rooms}  ({dict(winners)}), errors: {len(errors)}")
+    print(f"wall time      {wall:.1f}s")
+    print(f"frames sent    {sink['frames']} to TVs ({sink['bytes'] / 1e6:.1f} MB), {sum(bot_frames.values())} to bots")
+    print(f"bot answers    {bot_frames['ACTION_ok']} actions, {bot_frames['VOTE_ok']} votes")
+    print(f"loop lag ms    p50 {pct(lag, 50):.1f}  p99 {pct(lag, 99):.1f}  max {max(lag, default=0):.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Load generator: real players over HTTP and WebSocket, from any OS, in one asyncio process.
+
+For each of --rooms rooms it creates the room, joins --players players through
+/api/rooms/{room}/join, opens one /ws player socket per player plus --tvs TV
+sockets, then starts the game. Each player plays like player.js with ?bot=1.
+It answers ACTION_REQUESTs and pending night steps through /api/action, votes
+through /api/vote, and also presses "ready" through /api/ready so discussions
+end early. The run stops when every game is over or after --seconds.
+
+Measured, as p50/p95/p99/max in milliseconds:
+  action_to_state  POST /api/action or /api/vote until that player's socket receives a
+                   PUBLIC_STATE newer than the one it had when sending. The public view
+                   changes on phase steps and timer ticks, so this is what a player waits
+                   to see the table move.
+  http_*           round trip of each request type
+  fanout           first to last arrival of the same PUBLIC_STATE version across all of
+                   a room's sockets
+Message rates are counted per type, and everything goes to a JSON and/or CSV report.
+--label (a release tag, say) is stored in both, so reports from several releases can
+be compared or concatenated.
+
+Without --url, a plain uvicorn server is started on a free local port for the run.
+
+    python scripts/loadgen.py --rooms 20 --players 8 --seconds 120 --label v1.4 --json report.json --csv report.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import json
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+import websockets
+
+ROOT = Path(__file__).resolve().parent.parent
+HEARTBEAT_ACK = json.dumps({"type": "HEARTBEAT_ACK"})  # What player.js and tv.js answer, or the server reaps the socket
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if (await client.get("/api/rooms")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            if time.monotonic() > deadline:
+                raise
+        await asyncio.sleep(0.1)
+
+
+def summary(values: List[float]) -> Dict[str, float]:
+    """count, mean and p50/p95/p99/max of a list of milliseconds."""
+    if not values:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    q = statistics.quantiles(values, n=100, method="inclusive") if len(values) > 1 else [values[0]] * 99
+    return {"count": len(values), "mean": round(statistics.fmean(values), 2), "p50": round(q[49], 2),
+            "p95": round(q[94], 2), "p99": round(q[98], 2), "max": round(max(values), 2)}
+
+
+class Recorder:
+    """Everything measured during a run, shared by all connections."""
+
+    def __init__(self) -> None:
+        self.latency: Dict[str, List[float]] = defaultdict(list)
+        self.messages: Counter = Counter()
+        self.errors: Counter = Counter()
+        # (room, PUBLIC_STATE version) -> [first arrival, last arrival, sockets reached]
+        self.arrivals: Dict[tuple, List[float]] = {}
+
+    def arrived(self, room: str, version: int, now: float) -> None:
+        seen = self.arrivals.get((room, version))
+        if seen is None:
+            self.arrivals[(room, version)] = [now, now, 1]
+        else:
+            seen[1] = now
+            seen[2] += 1
+
+    def fanout(self, sockets_per_room: int) -> List[float]:
+        """Spread of every version that reached all of its room's sockets."""
+        return [(last - first) * 1000 for first, last, n in self.arrivals.values() if n == sockets_per_room]
+
+
+class Player:
+    """One joined player: a /ws socket for input and HTTP for every move."""
+
+    def __init__(self, room: str, player_id: str, http: httpx.AsyncClient, rec: Recorder,
+                 rng: random.Random, think: tuple) -> None:
+        self.room = room
+        self.player_id = player_id
+        self.http = http
+        self.rec = rec
+        self.rng = rng
+        self.think = think
+        self.state: Dict[str, Any] = {}  # Last PRIVATE_STATE
+        self.version = -1  # Last PUBLIC_STATE version received
+        self.waiting: List[tuple] = []  # (sent at, public version then) per move awaiting a newer PUBLIC_STATE
+        self.done: set = set()
+        self.tasks: set = set()
+
+    async def run(self, ws_url: str, stop: asyncio.Event) -> None:
+        url = f"{ws_url}/ws?client=player&player_id={self.player_id}&room={self.room}"
+        async with websockets.connect(url, max_size=None) as ws:
+            reader = asyncio.create_task(self._read(ws))
+            await stop.wait()
+            reader.cancel()
+            for task in list(self.tasks):
+                task.cancel()
+
+    async def _read(self, ws: Any) -> None:
+        try:
+            async for frame in ws:
+                now = time.perf_counter()
+                msg = json.loads(frame)
+                kind = msg.get("type")
+                self.rec.messages[kind] += 1
+                if kind == "HEARTBEAT":
+                    await ws.send(HEARTBEAT_ACK)
+                elif kind == "PUBLIC_STATE":
+                    self.rec.arrived(self.room, msg["version"], now)
+                    self.version = msg["version"]
+                    still = []
+                    for sent, version in self.waiting:
+                        if msg["version"] > version:
+                            self.rec.latency["action_to_state"].append((now - sent) * 1000)
+                        else:
+                            still.append((sent, version))
+                    self.waiting = still
+                elif kind == "PRIVATE_STATE":
+                    self.state = msg.get("data") or {}
+                    self._on_state()
+                elif kind == "ACTION_REQUEST":
+                    self._act(msg.get("step"), msg.get("deadline"))
+        except websockets.ConnectionClosed:
+            pass
+        # Only reached when the server ended the connection (cleanly or not): the end of a run cancels this task
+        self.rec.errors["ws_closed"] += 1
+
+    def _on_state(self) -> None:
+        state, me = self.state, self.state.get("me") or {}
+        if not me.get("alive"):
+            return
+        if state.get("phase") == "VOTE":
+            key = f"VOTE:{(state.get('timers') or {}).get('phase_ends_at')}"
+            targets = [p["id"] for p in state.get("alive", ()) if p["id"] != self.player_id]
+            if targets and self._once(key):
+                self._post("vote", {"voter_id": self.player_id, "target_id": self.rng.choice(targets)}, timed=True)
+        elif state.get("phase") == "DAY" and self._once(f"READY:{state.get('day_count')}"):
+            self._post("ready", {"player_id": self.player_id})
+        if state.get("pending_step"):
+            self._act(state["pending_step"], state.get("pending_deadline"))
+
+    def _act(self, step: Optional[str], deadline: Any) -> None:
+        state, me = self.state, self.state.get("me") or {}
+        if not me.get("alive") or state.get("phase") != "NIGHT" or f"{step}:{deadline}" in self.done:
+            return
+        alive = [p["id"] for p in state.get("alive", ())]
+        targets = [pid for pid in alive if pid != self.player_id]
+        role = me.get("role")
+        if step in ("WOLVES", "SEER") and role == ("werewolf" if step == "WOLVES" else "seer") and targets:
+            data: Dict[str, Any] = {"target": self.rng.choice(targets)}
+        elif step == "WITCH" and role == "witch":
+            heal = not me.get("witch_heal_used") and self.rng.random() < 0.5
+            poison = self.rng.choice(targets) if targets and not me.get("witch_poison_used") and self.rng.random() < 0.35 else None
+            data = {"heal": heal, "poison_target": poison}
+        elif step == "CUPID" and role == "cupid" and len(alive) >= 2:
+            data = {"targets": self.rng.sample(alive, 2)}
+        else:
+            return
+        self.done.add(f"{step}:{deadline}")
+        self._post("action", {"player_id": self.player_id, "step": step, "data": data}, timed=True)
+
+    def _once(self, key: str) -> bool:
+        if key in self.done:
+            return False
+        self.done.add(key)
+        return True
+
+    def _post(self, endpoint: str, payload: Dict[str, Any], timed: bool = False) -> None:
+        task = asyncio.create_task(self._send(endpoint, payload, timed))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _send(self, endpoint: str, payload: Dict[str, Any], timed: bool) -> None:
+        await asyncio.sleep(self.rng.uniform(*self.think))
+        t0 = time.perf_counter()
+        if timed:
+            self.waiting.append((t0, self.version))
+        try:
+            r = await self.http.post(f"/api/rooms/{self.room}/{endpoint}", json=payload)
+            ok = r.status_code == 200 and r.json().get("ok")
+        except httpx.HTTPError:
+            ok = False
+        self.rec.latency[f"http_{endpoint}"].append((time.perf_counter() - t0) * 1000)
+        if not ok:
+            self.rec.errors[f"{endpoint}_failed"] += 1
+
+
+async def watch_tv(ws_url: str, room: str, rec: Recorder, stop: asyncio.Event) -> None:
+    """A TV socket: only counted, for message rates and fan-out."""
+    async with websockets.connect(f"{ws_url}/ws?client=tv&room={room}", max_size=None) as ws:
+        async def read() -> None:
+            try:
+                async for frame in ws:
+                    now = time.perf_counter()
+                    msg = json.loads(frame)
+                    rec.messages[msg.get("type")] += 1
+                    if msg.get("type") == "HEARTBEAT":
+                        await ws.send(HEARTBEAT_ACK)
+                    elif msg.get("type") == "PUBLIC_STATE":
+                        rec.arrived(room, msg["version"], now)
+            except websockets.ConnectionClosed:
+                pass
+            rec.errors["ws_closed"] += 1  # Server ended it; see Player._read
+
+        reader = asyncio.create_task(read())
+        await stop.wait()
+        reader.cancel()
+
+
+async def run_room(http: httpx.AsyncClient, ws_url: str, args: argparse.Namespace, rec: Recorder,
+                   rng: random.Random, finished: Counter, stop: asyncio.Event) -> None:
+    t0 = time.perf_counter()
+    room = (await http.post("/api/rooms", json={})).json()["room"]
+    rec.latency["http_room"].append((time.perf_counter() - t0) * 1000)
+    players = []
+    for i in range(args.players):
+        t0 = time.perf_counter()
+        joined = (await http.post(f"/api/rooms/{room}/join", json={"name": f"Load {i + 1}"})).json()
+        rec.latency["http_join"].append((time.perf_counter() - t0) * 1000)
+        players.append(Player(room, joined["player_id"], http, rec, random.Random(rng.random()), args.think))
+    sockets = [asyncio.create_task(p.run(ws_url, stop)) for p in players]
+    sockets += [asyncio.create_task(watch_tv(ws_url, room, rec, stop)) for _ in range(args.tvs)]
+    await asyncio.sleep(0.5)  # Let every socket get its HELLO before the game moves
+    await http.post(f"/api/rooms/{room}/config", json=args.timers)
+    await http.post(f"/api/rooms/{room}/start")
+
+    while not stop.is_set():
+        await asyncio.sleep(0.5)
+        health = (await http.get(f"/api/rooms/{room}/health")).json()
+        if health.get("phase") == "GAME_OVER":
+            finished["games"] += 1
+            break
+    finished["rooms_done"] += 1
+    if finished["rooms_done"] == args.rooms:
+        stop.set()
+    await asyncio.gather(*sockets, return_exceptions=True)
+
+
+async def run(url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    ws_url = "ws" + url[len("http"):]
+    rec = Recorder()
+    finished: Counter = Counter()
+    stop = asyncio.Event()
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.http_connections)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as http:
+        await wait_ready(http)
+        started = time.perf_counter()
+        rooms = asyncio.gather(*(run_room(http, ws_url, args, rec, rng, finished, stop) for _ in range(args.rooms)))
+        try:
+            await asyncio.wait_for(asyncio.shield(rooms), args.seconds)
+        except TimeoutError:
+            stop.set()
+            await rooms
+        elapsed = time.perf_counter() - started
+
+    total = sum(rec.messages.values())
+    return {
+        "label": args.label,
+        "url": url,
+        "rooms": args.rooms,
+        "players": args.players,
+        "tvs": args.tvs,
+        "seconds": round(elapsed, 2),
+        "games_over": finished["games"],
+        "latency_ms": {name: summary(values) for name, values in sorted(rec.latency.items())},
+        "fanout_ms": summary(rec.fanout(args.players + args.tvs)),
+        "messages": {"total": total, "per_second": round(total / elapsed, 1),
+                     "by_type": {k: round(v / elapsed, 2) for k, v in rec.messages.most_common()}},
+        "errors": dict(rec.errors),
+    }
+
+
+def write_csv(path: Path, report: Dict[str, Any]) -> None:
+    """One row per latency metric, prefixed by the label, so files from several runs can be concatenated."""
+    fields = ["label", "metric", "count", "mean", "p50", "p95", "p99", "max"]
+    new = not path.exists()
+    with path.open("a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        if new:
+            writer.writeheader()
+        for metric, s in [*report["latency_ms"].items(), ("fanout", report["fanout_ms"])]:
+            writer.writerow({"label": report["label"], "metric": metric, **s})
+        writer.writerow({"label": report["label"], "metric": "messages_per_second", "count": report["messages"]["total"],
+                         "mean": report["messages"]["per_second"]})
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="WebSocket + HTTP load generator with latency percentiles")
+    ap.add_argument("--url", help="Server to load, e.g. http://127.0.0.1:8000 (default: start one locally)")
+    ap.add_argument("--rooms", type=int, default=10)
+    ap.add_argument("--players", type=int, default=8, help="Players per room (at least 5)")
+    ap.add_argument("--tvs", type=int, default=1, help="TV sockets per room")
+    ap.add_argument("--seconds", type=float, default=300.0, help="Stop after this long even if games are still on")
+    ap.add_argument("--think", type=float, nargs=2, default=(0.45, 1.4), metavar=("MIN", "MAX"),
+                    help="Seconds a player waits before each move (player.js uses 0.45-1.4)")
+    ap.add_argument("--night", type=int, default=10, help="Seconds per night step (server minimum 10)")
+    ap.add_argument("--discuss", type=int, default=10)
+    ap.add_argument("--vote", type=int, default=10)
+    ap.add_argument("--result", type=int, default=3)
+    ap.add_argument("--http-connections", type=int, default=100)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--label", default="", help="Stored in the reports, e.g. a release tag")
+    ap.add_argument("--json", type=Path, help="Write the report here")
+    ap.add_argument("--csv", type=Path, help="Append one row per metric here")
+    args = ap.parse_args()
+    if args.players < 5:
+        ap.error("--players must be at least 5")
+    args.timers = {"nightAction": args.night, "dayDiscuss": args.discuss, "voteTime": args.vote, "resultTime": args.result}
+
+    proc = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "server:app", "--host", "127.0.0.1", "--port", str(port),
+             "--log-level", "warning"],
+            cwd=str(ROOT), stdout=subprocess.DEVNULL,
+        )
+        url = f"http://127.0.0.1:{port}"
+    try:
+        report = asyncio.run(run(url.rstrip("/"), args))
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+    print(f"{report['rooms']} rooms x {report['players']} players, {report['games_over']} games over in {report['seconds']}s")
+    print(f"{'metric':<16} {'count':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for metric, s in [*report["latency_ms"].items(), ("fanout", report["fanout_ms"])]:
+        print(f"{metric:<16} {s['count']:>7} {s['p50']:>8.1f} {s['p95']:>8.1f} {s['p99']:>8.1f} {s['max']:>8.1f}")
+    print(f"messages         {report['messages']['total']} ({report['messages']['per_second']}/s)")
+    if report["errors"]:
+        print(f"errors           {report['errors']}")
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.csv:
+        write_csv(args.csv, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Run the server as N shard processes behind one port.
+
+`uvicorn --workers N` would split players across N unrelated copies of the
+game. Here every process accepts on the same listening socket, but each room
+belongs to one shard (consistent hash of the room code, see server.ShardRing).
+A request or /ws connection that lands on the wrong process is forwarded to
+the owner over that shard's Unix socket.
+
+    python scripts/run_shards.py --shards 4 --port 8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def serve_shard(index: int, count: int, sock: socket.socket, socket_template: str, log_level: str) -> None:
+    os.environ.update(LG_SHARDS=str(count), LG_SHARD=str(index), LG_SHARD_SOCKET=socket_template)
+    sys.path.insert(0, str(ROOT))
+    import uvicorn
+    import server
+
+    uds = socket_template.format(index)
+    if os.path.exists(uds):
+        os.unlink(uds)
+    public = uvicorn.Server(uvicorn.Config(server.app, log_level=log_level))
+    internal = uvicorn.Server(uvicorn.Config(server.app, uds=uds, lifespan="off", log_level=log_level))
+
+    async def main() -> None:
+        await asyncio.gather(public.serve(sockets=[sock]), internal.serve())
+
+    asyncio.run(main())
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Run room-sharded server processes on one port")
+    ap.add_argument("--shards", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--socket", default="/tmp/loupgarou-shard-{}.sock", help="Per-shard Unix socket template")
+    ap.add_argument("--log-level", default="warning")
+    args = ap.parse_args()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    ctx = multiprocessing.get_context("fork")
+    procs = [
+        ctx.Process(target=serve_shard, args=(i, args.shards, sock, args.socket, args.log_level), daemon=True)
+        for i in range(args.shards)
+    ]
+    for p in procs:
+        p.start()
+    print(f"{args.shards} shard(s) on http://{args.host}:{args.port}", flush=True)
+
+    def stop(*_: object) -> None:
+        for p in procs:
+            p.terminate()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for p in procs:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()
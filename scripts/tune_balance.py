@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Tune the wolf count for every player count and special-role deck toward a target
+village win rate, and write the table the server loads at startup.
+
+Each candidate is simulated with the numpy batch engine in rounds of --round games
+until its --confidence interval is within +/- --precision, it hits --max-games, or it
+is clearly further from --target than another wolf count. Results accumulate in
+--cache, so rerunning (with a tighter precision, say) only plays the missing games.
+
+    python scripts/tune_balance.py --players 5-12 --target 0.5 --out balance.json
+
+The server reads balance.json from its own folder, or the file named by LG_BALANCE.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import sim  # noqa: E402
+from simulate import player_counts  # noqa: E402
+
+
+def main() -> None:
+    import balance  # Needs numpy
+
+    ap = argparse.ArgumentParser(description="Tune wolf counts per player count and deck")
+    ap.add_argument("--players", type=player_counts, default=player_counts("5-12"))
+    ap.add_argument("--decks", choices=["default", "all"], default="all",
+                    help="default: every role on; all: every seer/witch/cupid combination")
+    ap.add_argument("--target", type=float, default=0.5, help="Village win rate to aim for")
+    ap.add_argument("--confidence", type=float, default=0.95)
+    ap.add_argument("--precision", type=float, default=0.01, help="Confidence interval half-width to stop at")
+    ap.add_argument("--round", type=int, default=20000, help="Games per candidate per round")
+    ap.add_argument("--max-games", type=int, default=400000, help="Games per candidate at most")
+    ap.add_argument("--policy", choices=sorted(sim.POLICIES), default="informed")
+    ap.add_argument("--cache", type=Path, default=Path(tempfile.gettempdir()) / "loupgarou-balance-cache.json")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", type=Path, default=Path("balance.json"))
+    args = ap.parse_args()
+
+    decks = balance.ALL_DECKS if args.decks == "all" else balance.ALL_DECKS[:1]
+    started = time.perf_counter()
+    table = balance.tune(args.players, decks, balance.Cache(args.cache), target=args.target, confidence=args.confidence,
+                         policy=args.policy, precision=args.precision, round_games=args.round,
+                         max_games=args.max_games, seed=args.seed)
+    args.out.write_text(json.dumps(table, indent=2) + "\n", encoding="utf-8")
+
+    print(f"{'players':>7} {'deck':<18} {'wolves':>6} {'village':>8} {'interval':>15} {'games':>8}")
+    for n, row in table["counts"].items():
+        for deck, e in row.items():
+            mark = " *" if table["recommended"].get(n) == deck else ""
+            print(f"{n:>7} {deck:<18} {e['wolves']:>6} {e['villager_win']:>8.1%}"
+                  f" {e['ci'][0]:>7.1%}-{e['ci'][1]:<7.1%} {e['games']:>8}{mark}")
+    print(f"Wrote {args.out} in {time.perf_counter() - started:.1f}s (* = closest deck to {args.target:.0%})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
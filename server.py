@@ -1,20 +1,59 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
+import contextlib
+import hashlib
+import heapq
+import itertools
 import json
+import os
 import random
+import re
+import sys
+import tempfile
 import socket
 import time
 import uuid
-from dataclasses import dataclass, field
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
-
-from fastapi import FastAPI, WebSocket
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+
+if sys.version_info < (3, 11):
+    # asyncio.timeout bounds every socket send; without it each send would fail and drop its client
+    raise RuntimeError("Loup-Garou needs Python 3.11 or newer")
+
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+try:
+    import orjson  # Optional: faster JSON encoding for the binary JSON codec
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # Optional: compact binary frames
+except ImportError:
+    msgpack = None
+
+try:
+    import httpx  # Optional: only needed to forward requests between shards
+except ImportError:
+    httpx = None
+
+try:
+    from websockets.asyncio.client import unix_connect  # Optional: only needed to forward /ws between shards
+except ImportError:
+    unix_connect = None
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 from fastapi.middleware.cors import CORSMiddleware
 
+import rules
+from rules import UNIQUE_ROLES, WEREWOLF_COUNT_RANGES, Role, get_werewolf_count
+
 
 def get_local_ip() -> str:
     """Get the local IP address of this machine."""
@@ -30,14 +69,6 @@ def get_local_ip() -> str:
         return "127.0.0.1"
 
 
-class Role(str, Enum):
-    VILLAGER = "villager"
-    WEREWOLF = "werewolf"
-    SEER = "seer"
-    WITCH = "witch"
-    CUPID = "cupid"
-
-
 ROLE_FR = {
     Role.VILLAGER: "Le Villageois",
     Role.WEREWOLF: "Le Loup-Garou",
@@ -52,23 +83,6 @@ WINNER_FR = {
     "nobody": "Personne",
 }
 
-WEREWOLF_COUNT_RANGES = {
-    (5, 7): 1,
-    (8, 11): 2,
-    (12, 15): 3,
-    (16, 99): 4,
-}
-
-UNIQUE_ROLES = {Role.SEER, Role.WITCH, Role.CUPID}
-
-
-def get_werewolf_count(player_count: int) -> int:
-    for (min_p, max_p), wolf_count in WEREWOLF_COUNT_RANGES.items():
-        if min_p <= player_count <= max_p:
-            return wolf_count
-    return 1
-
-
 class Phase(str, Enum):
     LOBBY = "LOBBY"
     NIGHT = "NIGHT"
@@ -78,8 +92,27 @@ class Phase(str, Enum):
     GAME_OVER = "GAME_OVER"
 
 
+_state_version = 0
+
+
+class _Versioned:
+    """Dataclass mixin: every attribute assignment stamps the object with a new module-wide version.
+
+    The counter only ever grows, so a Game's newest stamp (Game._state_key) changes exactly when one
+    of its own objects does, and edits in other rooms leave its snapshot cache alone.
+    """
+
+    _version = 0
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        global _state_version
+        _state_version += 1
+        object.__setattr__(self, "_version", _state_version)
+        object.__setattr__(self, name, value)
+
+
 @dataclass
-class Player:
+class Player(_Versioned):
     id: str
     name: str
     alive: bool = True
@@ -90,9 +123,9 @@ class Player:
 
 
 @dataclass
-class Timers:
+class Timers(_Versioned):
     phase_ends_at: Optional[float] = None
-    seconds_left: Optional[int] = None
+    seconds_left: Optional[int] = None  # As of when phase_ends_at was set; UIs count down locally
 
 
 @dataclass
@@ -111,7 +144,7 @@ class VoteBox:
 
 
 @dataclass
-class GameState:
+class GameState(_Versioned):
     phase: Phase = Phase.LOBBY
     night_count: int = 0
     day_count: int = 0
@@ -125,6 +158,110 @@ class GameState:
     vote_box: VoteBox = field(default_factory=VoteBox)
     timers: Timers = field(default_factory=Timers)
     ready_to_vote: Set[str] = field(default_factory=set)  # Player IDs ready to vote
+    ready_event: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+@dataclass
+class ReplayRing:
+    """Recent sequenced messages for one audience; evicted is the newest seq no longer held."""
+    limit: int = 256
+    entries: Deque[Tuple[int, Dict[str, Any]]] = field(default_factory=deque)
+    evicted: int = 0
+
+    def add(self, seq: int, msg: Dict[str, Any]) -> None:
+        if len(self.entries) >= self.limit:
+            self.evicted = self.entries.popleft()[0]
+        self.entries.append((seq, msg))
+
+    def after(self, seq: int) -> Optional[List[Tuple[int, Dict[str, Any]]]]:
+        """Entries newer than seq, or None if some of them were already evicted."""
+        if seq < self.evicted:
+            return None
+        return [e for e in self.entries if e[0] > seq]
+
+
+@dataclass
+class SpectatorFeed:
+    """Public messages pre-encoded once as SSE events; every stream reader walks the same entries."""
+    limit: int = 256
+    entries: Deque[Tuple[int, bytes]] = field(default_factory=deque)
+    last_id: int = 0
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+    def publish(self, data: str) -> None:
+        self.last_id += 1
+        if len(self.entries) >= self.limit:
+            self.entries.popleft()
+        self.entries.append((self.last_id, f"id: {self.last_id}\ndata: {data}\n\n".encode("utf-8")))
+        # Wake every reader waiting on this round, then arm a fresh event for the next one
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    def after(self, event_id: int) -> Optional[bytes]:
+        """Events newer than event_id as one chunk, or None if some were already dropped."""
+        if event_id > self.last_id or (self.entries and event_id < self.entries[0][0] - 1):
+            return None
+        return b"".join(chunk for i, chunk in self.entries if i > event_id)
+
+
+@dataclass
+class Outbox:
+    """Sends queued while Game._lock is held; Game._mutate() delivers them, in order, once it is released."""
+    items: List[Tuple[str, Any]] = field(default_factory=list)
+
+    def narrate(self, line: str) -> None:
+        self.items.append(("narrate", line))
+
+    def public(self, msg: Dict[str, Any]) -> None:
+        self.items.append(("public", msg))
+
+    def private(self, player_id: str, msg: Dict[str, Any]) -> None:
+        self.items.append(("private", (player_id, msg)))
+
+    def sync(self) -> None:
+        self.items.append(("sync", None))
+
+
+Frame = Union[str, bytes]
+
+
+def _encode_json(msg: Dict[str, Any]) -> str:
+    return json.dumps(msg, ensure_ascii=False, separators=(",", ":"))
+
+
+def _encode_json_binary(msg: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(msg)
+    return _encode_json(msg).encode("utf-8")
+
+
+# Wire formats selectable with /ws?codec=...; str frames go out as text, bytes as binary
+CODECS: Dict[str, Callable[[Dict[str, Any]], Frame]] = {
+    "json": _encode_json,
+    "json-binary": _encode_json_binary,
+}
+if msgpack is not None:
+    CODECS["msgpack"] = msgpack.packb
+
+DEFAULT_CODEC = "json"
+
+
+def batch_frame(frames: List[Frame], codec: str = DEFAULT_CODEC) -> Frame:
+    """Wrap already-encoded frames in one BATCH message without decoding them again."""
+    if codec == "msgpack":
+        packer = msgpack.Packer()
+        return (b"\x82" + packer.pack("type") + packer.pack("BATCH") + packer.pack("messages")
+                + packer.pack_array_header(len(frames)) + b"".join(frames))
+    if codec == "json":
+        return '{"type":"BATCH","messages":[' + ",".join(frames) + "]}"
+    return b'{"type":"BATCH","messages":[' + b",".join(frames) + b"]}"
+
+
+def decode_frame(frame: Frame, codec: str = DEFAULT_CODEC) -> Dict[str, Any]:
+    """Decode an inbound frame; binary frames use the connection's codec, text is always JSON."""
+    if isinstance(frame, bytes) and codec == "msgpack":
+        return msgpack.unpackb(frame)
+    return json.loads(frame)
 
 
 class WSClientType(str, Enum):
@@ -137,16 +274,199 @@ class WSClient:
     websocket: WebSocket
     client_type: WSClientType
     player_id: Optional[str] = None
+    delta: bool = False  # Receives PUBLIC_PATCH instead of full PUBLIC_STATE
+    codec: str = "json"
+    batch: bool = False  # Frames queued in one scheduler turn go out as a single BATCH frame
+    outbox: Deque[Tuple[str, Frame]] = field(default_factory=deque)  # (message type, encoded frame)
+    wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    full_since: Optional[float] = None
+    last_seen: float = field(default_factory=time.time)  # Last inbound frame; any message counts as a heartbeat reply
+    private_last: Optional[Dict[str, Any]] = None  # Last PRIVATE_STATE data sent to a delta client
+    writer: Optional[asyncio.Task] = None
+
+
+# Player commands accepted in-band on /ws, each answered with an ACK carrying the request's id
+RPC_TYPES = {"ACTION", "VOTE", "READY"}
+
+# Message types where only the latest queued copy is worth sending
+COALESCED_TYPES = {"PUBLIC_STATE", "PRIVATE_STATE", "TIMER", "VOTE_STATUS", "HEARTBEAT"}
+
+
+def _pointer_escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """JSON-patch style ops turning old into new. Dicts are diffed per key, anything else is replaced whole."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_pointer_escape(key)}"})
+        for key, value in new.items():
+            sub = f"{path}/{_pointer_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": sub, "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, sub))
+        return ops
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def json_patch(doc: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Apply ops produced by json_diff to doc (in place for nested dicts) and return the result."""
+    for op in ops:
+        parts = [p.replace("~1", "/").replace("~0", "~") for p in op["path"].split("/")[1:]]
+        if not parts:
+            doc = op.get("value")
+            continue
+        parent = doc
+        for part in parts[:-1]:
+            parent = parent[part]
+        if op["op"] == "remove":
+            parent.pop(parts[-1], None)
+        else:
+            parent[parts[-1]] = op["value"]
+    return doc
 
 
-class Game:
+class DeadlineScheduler:
+    """One heap and one task for the phase deadlines of every room in the process.
+
+    A room registers (deadline, event) and the event is set once the deadline passes.
+    Phase loops sleep on their input event alone, so an idle room costs a heap entry,
+    not a timer of its own, and wakes only for an input or its deadline.
+    """
+
     def __init__(self) -> None:
+        self._heap: List[List[Any]] = []  # [deadline, order, event, cancelled]
+        self._order = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self.lag: Deque[float] = deque(maxlen=1024)  # Seconds between a deadline and its event being set
+        self.fired = 0
+
+    def call_at(self, deadline: float, event: asyncio.Event) -> List[Any]:
+        """Set event at wall-clock time deadline; returns a handle for cancel()."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # First use, or a new event loop (tests): entries of the old loop can never fire,
+            # and its runner task may never finish if that loop was closed without a shutdown
+            self._loop, self._heap, self._wakeup, self._task = loop, [], asyncio.Event(), None
+        entry = [deadline, next(self._order), event, False]
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:
+            self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return entry
+
+    def cancel(self, entry: List[Any]) -> None:
+        entry[3] = True  # Dropped lazily when it reaches the top of the heap
+
+    async def sleep(self, seconds: float) -> None:
+        event = asyncio.Event()
+        entry = self.call_at(time.time() + seconds, event)
+        try:
+            await event.wait()
+        finally:
+            self.cancel(entry)
+
+    async def _run(self) -> None:
+        while True:
+            while self._heap and self._heap[0][3]:
+                heapq.heappop(self._heap)
+            self._wakeup.clear()
+            delay = self._heap[0][0] - time.time() if self._heap else None
+            if delay is None or delay > 0:
+                try:
+                    async with asyncio.timeout(delay):
+                        await self._wakeup.wait()
+                except TimeoutError:
+                    pass
+                continue
+            now = time.time()
+            while self._heap and self._heap[0][0] <= now:
+                deadline, _, event, cancelled = heapq.heappop(self._heap)
+                if not cancelled:
+                    self.lag.append(now - deadline)
+                    self.fired += 1
+                    event.set()
+
+    def metrics(self) -> Dict[str, Any]:
+        lag = sorted(self.lag)
+        pick = (lambda q: round(lag[min(len(lag) - 1, int(q * len(lag)))] * 1000, 3)) if lag else (lambda q: None)
+        return {
+            "pending": sum(1 for e in self._heap if not e[3]),
+            "fired": self.fired,
+            "lag_ms": {"p50": pick(0.5), "p99": pick(0.99), "max": pick(1.0)},
+        }
+
+
+SCHEDULER = DeadlineScheduler()
+
+
+def _deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """sys.getsizeof summed over containers, dataclasses and plain objects, counting shared objects once."""
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, (type, asyncio.Event, asyncio.Task)):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(_deep_sizeof(v, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_sizeof(vars(obj), seen)
+    return size
+
+
+class Game:
+    def __init__(self, seed: Optional[int] = None) -> None:
         self.state = GameState()
         self.players: Dict[str, Player] = {}
         self._lock = asyncio.Lock()
         self._clients: Set[WSClient] = set()
+        self._player_clients: Dict[str, Set[WSClient]] = {}
+        self._public_version = 0
+        self._public_last: Optional[Dict[str, Any]] = None
+        self._public_frames: Dict[str, Frame] = {}  # PUBLIC_STATE for _public_version, encoded per codec
+        self._public_frames_version = 0
+        self._snapshot_key: Optional[Tuple[int, int, int]] = None
+        self._snapshot_cache: Dict[str, Any] = {}
         self._runner_task: Optional[asyncio.Task] = None
 
+        # Per-client send timeout (seconds) before a socket is considered dead
+        self.SEND_TIMEOUT = 2.0
+        # Outbound queue size per connection, and how long (seconds) it may stay full before eviction
+        self.OUTBOX_LIMIT = 64
+        self.SLOW_CONSUMER_TIMEOUT = 5.0
+        self.stats: Counter[str] = Counter()
+        # Interval (seconds) of the optional ticker re-pushing seconds_left. Disabled by
+        # default: UIs count down locally from timers.phase_ends_at (clock-synced via PING/PONG).
+        self.TICK_INTERVAL: Optional[float] = None
+        # Server-initiated HEARTBEAT every interval (seconds); a client silent for
+        # HEARTBEAT_MISSES intervals is closed and removed. None disables reaping.
+        self.HEARTBEAT_INTERVAL: Optional[float] = 10.0
+        self.HEARTBEAT_MISSES = 3
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        # Event messages are stamped with a room-wide seq and kept for ?since= resumes
+        self.REPLAY_LIMIT = 256
+        self._seq = 0
+        self._public_ring = ReplayRing(self.REPLAY_LIMIT)
+        self._player_rings: Dict[str, ReplayRing] = {}
+        # Oldest seq that can be resumed from: the rings start empty after a restore
+        self._replay_floor = 0
+        # Read-only public feed for /api/stream and /api/state; seconds between SSE keepalive comments
+        self._feed = SpectatorFeed()
+        self.STREAM_KEEPALIVE = 15.0
+        # Set by close() once the room is torn down (closed, or hibernated by the registry)
+        self.closed = False
+
         # Configurable timers
         self.T_DISCUSS = 15
         self.T_VOTE = 25
@@ -159,6 +479,75 @@ class Game:
         self.use_cupid = True
         self.use_hunter = False
 
+        # Last time a client connected or left; the registry hibernates rooms idle since then
+        self.last_active = time.time()
+        # Shared by all rooms: owns every phase deadline and result pause
+        self.scheduler = SCHEDULER
+        # Every random rule (dealing, tie-breaks, forced kills) draws from this, never the global random
+        self.rng = random.Random(seed)
+
+    # Settings kept when a room hibernates; clients, tasks, inboxes and replay buffers are runtime-only
+    CONFIG_FIELDS = ("T_DISCUSS", "T_VOTE", "T_NIGHT_STEP", "T_RESULT", "use_seer", "use_witch", "use_cupid", "use_hunter")
+
+    def dump(self) -> Dict[str, Any]:
+        """JSON-ready copy of the durable room state (players, game state, settings)."""
+        st = self.state
+        return {
+            "players": [asdict(p) for p in self.players.values()],
+            "state": {
+                "phase": st.phase.value,
+                "night_count": st.night_count,
+                "day_count": st.day_count,
+                "narrator": st.narrator,
+                "started": st.started,
+                "winner": st.winner,
+                "wolves_victim": st.wolves_victim,
+                "witch_heal": st.witch_heal,
+                "witch_poison_target": st.witch_poison_target,
+                "ready_to_vote": sorted(st.ready_to_vote),
+            },
+            "config": {k: getattr(self, k) for k in self.CONFIG_FIELDS},
+            "seq": self._seq,
+        }
+
+    @classmethod
+    def restore(cls, data: Dict[str, Any]) -> "Game":
+        game = cls()
+        for key, value in data.get("config", {}).items():
+            if key in cls.CONFIG_FIELDS:
+                setattr(game, key, value)
+        for p in data.get("players", []):
+            game.players[p["id"]] = Player(**{**p, "role": Role(p["role"]) if p.get("role") else None})
+        st = dict(data.get("state", {}))
+        st["phase"] = Phase(st.get("phase", Phase.LOBBY.value))
+        st["ready_to_vote"] = set(st.get("ready_to_vote", ()))
+        game.state = GameState(**st)
+        game._seq = data.get("seq", 0)  # So ?since= from before hibernation is recognized, not mistaken for a restart
+        game._replay_floor = game._seq  # ...and gets a full resync, since the rings weren't saved
+        return game
+
+    def memory_bytes(self) -> int:
+        """Approximate resident size of this room: players, state, replay buffers, feed and outboxes."""
+        return _deep_sizeof((self.players, self.state, self._public_ring, self._player_rings, self._feed,
+                             self._snapshot_cache, self._public_last, self._public_frames,
+                             [c.outbox for c in self._clients]))
+
+    def _table(self) -> rules.Table:
+        """The rules engine's view of this game."""
+        seats = tuple(rules.Seat(p.id, *(getattr(p, f) for f in rules.SEAT_FIELDS)) for p in self.players.values())
+        return rules.Table(seats, *(getattr(self.state, f) for f in rules.TABLE_FIELDS))
+
+    def _apply(self, table: rules.Table) -> None:
+        """Write a table returned by the rules back, assigning only fields that changed so the snapshot cache stays warm."""
+        for seat in table.seats:
+            p = self.players.get(seat.id)
+            for f in rules.SEAT_FIELDS if p else ():
+                if getattr(p, f) != getattr(seat, f):
+                    setattr(p, f, getattr(seat, f))
+        for f in rules.TABLE_FIELDS:
+            if getattr(self.state, f) != getattr(table, f):
+                setattr(self.state, f, getattr(table, f))
+
     def _alive_ids(self) -> List[str]:
         return [pid for pid, p in self.players.items() if p.alive]
 
@@ -173,7 +562,18 @@ class Game:
         self.state.narrator.append(f"[{ts}] {line}")
         self.state.narrator = self.state.narrator[-200:]
 
+    def _state_key(self) -> Tuple[int, int, int]:
+        """Changes whenever this game's state, timers, players or roster do."""
+        st = self.state
+        newest = max(st._version, st.timers._version, max((p._version for p in self.players.values()), default=0))
+        return newest, len(self.players), id(self.players)
+
     def _public_snapshot(self) -> Dict[str, Any]:
+        """Public view, cached until a tracked field changes or the roster grows. Callers must not mutate it."""
+        key = self._state_key()
+        if key == self._snapshot_key:
+            self.stats["snapshot_hits"] += 1
+            return self._snapshot_cache
         alive = []
         dead = []
         game_over = self.state.phase == Phase.GAME_OVER
@@ -191,7 +591,8 @@ class Game:
             else:
                 dead.append(entry)
 
-        return {
+        self._snapshot_key = key
+        self._snapshot_cache = {
             "phase": self.state.phase,
             "night_count": self.state.night_count,
             "day_count": self.state.day_count,
@@ -204,40 +605,24 @@ class Game:
                 "seconds_left": self.state.timers.seconds_left,
             },
         }
+        return self._snapshot_cache
 
-    def _private_snapshot(self, player_id: str) -> Dict[str, Any]:
-        p = self.players.get(player_id)
-        if not p:
-            return {}
-        base = self._public_snapshot()
-        base["me"] = {
-            "id": p.id,
-            "name": p.name,
-            "alive": p.alive,
-            "role": p.role.value if p.role else None,
-            "role_fr": ROLE_FR.get(p.role) if p.role else None,
-            "lover_id": p.lover_id,
-            "witch_heal_used": p.witch_heal_used,
-            "witch_poison_used": p.witch_poison_used,
-        }
-        
+    def _shared_private(self, role: Optional[Role], alive: bool) -> Dict[str, Any]:
+        """Private-view fields identical for every player with this role and liveness (one visibility class)."""
+        base = dict(self._public_snapshot())
+        base["pending_step"] = None
+        base["pending_deadline"] = None
         if self.state.phase == Phase.NIGHT and self.state.pending.step and time.time() <= self.state.pending.deadline:
             step = self.state.pending.step
-            is_actor = ((step == "WOLVES" and p.role == Role.WEREWOLF)
-                        or (step == "SEER" and p.role == Role.SEER)
-                        or (step == "WITCH" and p.role == Role.WITCH)
-                        or (step == "CUPID" and p.role == Role.CUPID))
-            if is_actor and p.alive:
+            is_actor = ((step == "WOLVES" and role == Role.WEREWOLF)
+                        or (step == "SEER" and role == Role.SEER)
+                        or (step == "WITCH" and role == Role.WITCH)
+                        or (step == "CUPID" and role == Role.CUPID))
+            if is_actor and alive:
                 base["pending_step"] = step
                 base["pending_deadline"] = self.state.pending.deadline
-            else:
-                base["pending_step"] = None
-                base["pending_deadline"] = None
-        else:
-            base["pending_step"] = None
-            base["pending_deadline"] = None
 
-        if p.role == Role.WEREWOLF:
+        if role == Role.WEREWOLF:
             wolves_team = self._players_by_role(Role.WEREWOLF)
             base["wolves_team"] = [{"id": w.id, "name": w.name} for w in wolves_team]
             if self.state.pending.step == "WOLVES" and time.time() <= self.state.pending.deadline:
@@ -251,46 +636,289 @@ class Game:
                         votes[w.id] = None
                 base["wolves_votes"] = votes
 
-        if p.role == Role.WITCH and self.state.phase == Phase.NIGHT and self.state.wolves_victim:
+        if role == Role.WITCH and self.state.phase == Phase.NIGHT and self.state.wolves_victim:
             victim = self.state.wolves_victim
             base["witch_ctx"] = {
                 "victim_id": victim,
                 "victim_name": self.players[victim].name if victim in self.players else None,
             }
+        return base
 
+    def _private_snapshot(self, player_id: str, shared: Optional[Dict[Tuple[Optional[Role], bool], Dict[str, Any]]] = None,
+                          public: bool = True) -> Dict[str, Any]:
+        """Shared section for the player's visibility class plus their own me/lover fields.
+
+        shared caches the class sections across calls; _sync_all passes one per tick so
+        each class is built once however many players are in it. public=False leaves out
+        the fields of the public snapshot, which delta clients already get as PUBLIC_PATCH.
+        """
+        p = self.players.get(player_id)
+        if not p:
+            return {}
+        cls = (p.role, p.alive)
+        section = shared.get(cls) if shared is not None else None
+        if section is None:
+            section = self._shared_private(p.role, p.alive)
+            if shared is not None:
+                shared[cls] = section
+        if public:
+            base = dict(section)
+        else:
+            shown = self._public_snapshot()
+            base = {k: v for k, v in section.items() if k not in shown}
+        base["me"] = {
+            "id": p.id,
+            "name": p.name,
+            "alive": p.alive,
+            "role": p.role.value if p.role else None,
+            "role_fr": ROLE_FR.get(p.role) if p.role else None,
+            "lover_id": p.lover_id,
+            "witch_heal_used": p.witch_heal_used,
+            "witch_poison_used": p.witch_poison_used,
+        }
         if p.lover_id and p.lover_id in self.players:
             base["lover_name"] = self.players[p.lover_id].name
         return base
 
-    async def _send(self, ws: WebSocket, msg: Dict[str, Any]) -> None:
-        await ws.send_text(json.dumps(msg, ensure_ascii=False))
+    def _encode(self, msg: Dict[str, Any], codec: str = DEFAULT_CODEC) -> Frame:
+        return CODECS[codec](msg)
+
+    def _enqueue(self, c: WSClient, kind: str, frame: Frame) -> bool:
+        """Queue a frame on the client's outbox. Returns False when the client is a slow consumer to evict.
+
+        A full outbox may skip a coalesced state frame (a newer one follows) for up to
+        SLOW_CONSUMER_TIMEOUT, but an event frame that can't be queued evicts at once: the
+        client would silently miss it, and a resume can't bring it back past later seqs.
+        """
+        if kind in COALESCED_TYPES:
+            # Only the latest state message matters; a full PUBLIC_STATE also supersedes pending patches
+            stale = {kind, "PUBLIC_PATCH"} if kind == "PUBLIC_STATE" else {kind}
+            if any(k in stale for k, _ in c.outbox):
+                c.outbox = deque((k, f) for k, f in c.outbox if k not in stale)
+        if c.full_since is not None and time.time() - c.full_since >= self.SLOW_CONSUMER_TIMEOUT:
+            return False
+        if len(c.outbox) >= self.OUTBOX_LIMIT:
+            if kind not in COALESCED_TYPES:
+                return False
+            if c.full_since is None:
+                c.full_since = time.time()
+            self.stats["frames_dropped"] += 1
+            return True
+        c.outbox.append((kind, frame))
+        c.wakeup.set()
+        return True
+
+    async def _writer(self, c: WSClient) -> None:
+        """Per-connection task draining the outbox, so the game loop never waits on a socket.
+
+        Ends once the client is unregistered: _unregister_client can't cancel the writer it
+        is called from (a bot stopping on RESET), so the writer checks after each send.
+        """
+        try:
+            while c in self._clients:
+                if not c.outbox:
+                    c.wakeup.clear()
+                    await c.wakeup.wait()
+                    continue
+                if c.batch:
+                    await asyncio.sleep(0)  # Let the rest of this scheduler turn queue its messages
+                    frames = [f for _, f in c.outbox]
+                    c.outbox.clear()
+                    frame = frames[0] if len(frames) == 1 else batch_frame(frames, c.codec)
+                    self.stats["frames_batched"] += len(frames) - 1
+                else:
+                    _, frame = c.outbox.popleft()
+                # asyncio.timeout rather than wait_for: wait_for can swallow a cancel that races a completed send
+                async with asyncio.timeout(self.SEND_TIMEOUT):
+                    if isinstance(frame, bytes):
+                        await c.websocket.send_bytes(frame)
+                    else:
+                        await c.websocket.send_text(frame)
+                if len(c.outbox) <= self.OUTBOX_LIMIT // 2:
+                    c.full_since = None  # Caught up enough to no longer count as stalled
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.stats["send_failed"] += 1
+            self._drop_client(c)
+
+    async def _fanout(self, clients: List[WSClient], msg: Dict[str, Any], frames: Optional[Dict[str, Frame]] = None) -> None:
+        """Encode msg once per codec in use and queue the shared frame on every client; evict slow consumers.
 
-    async def _broadcast_public(self, msg: Dict[str, Any]) -> None:
-        dead_clients = []
+        frames is an optional per-codec cache of msg already encoded, filled in as codecs are met.
+        """
+        if not clients:
+            return
+        if frames is None:
+            frames = {}
+        kind = msg.get("type", "")
+        for c in clients:
+            frame = frames.get(c.codec)
+            if frame is None:
+                frame = frames[c.codec] = self._encode(msg, c.codec)
+            if not self._enqueue(c, kind, frame):
+                self.stats["slow_evicted"] += 1
+                self._drop_client(c)
+
+    async def _send_client(self, c: WSClient, msg: Dict[str, Any], frames: Optional[Dict[str, Frame]] = None) -> None:
+        await self._fanout([c], msg, frames)
+
+    def _register_client(self, c: WSClient) -> None:
+        self._clients.add(c)
+        self.last_active = time.time()
+        if c.client_type == WSClientType.PLAYER and c.player_id:
+            self._player_clients.setdefault(c.player_id, set()).add(c)
+        if c.writer is None:
+            c.writer = asyncio.create_task(self._writer(c))
+        if self.HEARTBEAT_INTERVAL and (self._heartbeat_task is None or self._heartbeat_task.done()):
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+    def _unregister_client(self, c: WSClient) -> None:
+        self._clients.discard(c)
+        self.last_active = time.time()
+        if c.player_id in self._player_clients:
+            conns = self._player_clients[c.player_id]
+            conns.discard(c)
+            if not conns:
+                del self._player_clients[c.player_id]
+        if c.writer and c.writer is not asyncio.current_task():
+            c.writer.cancel()
+        c.outbox.clear()
+
+    def _drop_client(self, c: WSClient) -> None:
+        if c not in self._clients:
+            return
+        self._unregister_client(c)
+        asyncio.create_task(self._close_quietly(c.websocket))
+
+    async def _close_quietly(self, ws: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(ws.close(), self.SEND_TIMEOUT)
+        except Exception:
+            pass
+
+    async def _heartbeat_loop(self) -> None:
+        """One task per game: ping every client and reap the ones that stopped answering. Ends with the last client."""
+        while self._clients and self.HEARTBEAT_INTERVAL:
+            await asyncio.sleep(self.HEARTBEAT_INTERVAL)
+            self._reap_silent_clients()
+            await self._fanout(list(self._clients), {"type": "HEARTBEAT", "server_time": time.time()})
+
+    def _reap_silent_clients(self) -> None:
+        limit = self.HEARTBEAT_INTERVAL * self.HEARTBEAT_MISSES
+        now = time.time()
         for c in list(self._clients):
-            try:
-                await self._send(c.websocket, msg)
-            except Exception:
-                dead_clients.append(c)
-        for c in dead_clients:
-            self._clients.discard(c)
+            if now - c.last_seen > limit:
+                self.stats["heartbeat_reaped"] += 1
+                self._drop_client(c)
+
+    def _stamp(self, msg: Dict[str, Any], ring: ReplayRing) -> Dict[str, Any]:
+        self._seq += 1
+        msg = {**msg, "seq": self._seq}
+        ring.add(self._seq, msg)
+        return msg
+
+    async def _broadcast_public(self, msg: Dict[str, Any]) -> None:
+        msg = self._stamp(msg, self._public_ring)
+        frames: Dict[str, Frame] = {}
+        await self._fanout(list(self._clients), msg, frames)
+        self._feed.publish(frames.get("json") or _encode_json(msg))
 
     async def _send_private(self, player_id: str, msg: Dict[str, Any]) -> None:
-        dead_clients = []
-        for c in list(self._clients):
-            if c.client_type == WSClientType.PLAYER and c.player_id == player_id:
-                try:
-                    await self._send(c.websocket, msg)
-                except Exception:
-                    dead_clients.append(c)
-        for c in dead_clients:
-            self._clients.discard(c)
+        # Recorded even with no socket open, so a phone that was locked gets it on resume
+        ring = self._player_rings.get(player_id)
+        if ring is None:
+            ring = self._player_rings[player_id] = ReplayRing(self.REPLAY_LIMIT)
+        await self._fanout(list(self._player_clients.get(player_id, ())), self._stamp(msg, ring))
+
+    def _missed_messages(self, player_id: Optional[str], since: int) -> Optional[List[Dict[str, Any]]]:
+        """Public and private messages after seq `since`, in order; None if they can't all be replayed.
+
+        Only the newest copy of each coalesced type is kept, as on a live socket.
+        """
+        if since > self._seq:
+            return None  # From before a server restart
+        if since < self._replay_floor:
+            return None  # From before hibernation; those messages weren't kept
+        public = self._public_ring.after(since)
+        private = self._player_rings[player_id].after(since) if player_id in self._player_rings else []
+        if public is None or private is None:
+            return None
+        missed = [m for _, m in sorted(public + private, key=lambda e: e[0])]
+        latest = {m["type"]: m for m in missed if m.get("type") in COALESCED_TYPES}
+        return [m for m in missed if m.get("type") not in COALESCED_TYPES or latest[m["type"]] is m]
+
+    def _public_view(self) -> Dict[str, Any]:
+        """Full PUBLIC_STATE message for the last published version (what a new client starts from)."""
+        if self._public_last is None:
+            self._public_last = self._public_snapshot()
+            self._public_version += 1
+        return {"type": "PUBLIC_STATE", "version": self._public_version, "data": self._public_last}
+
+    def _public_view_frames(self) -> Dict[str, Frame]:
+        """Encoding cache for the current _public_view(), so joins and resyncs don't re-encode it."""
+        if self._public_frames_version != self._public_version:
+            self._public_frames = {}
+            self._public_frames_version = self._public_version
+        return self._public_frames
+
+    def _public_view_json(self) -> str:
+        view = self._public_view()
+        frames = self._public_view_frames()
+        if "json" not in frames:
+            frames["json"] = _encode_json(view)
+        return frames["json"]
+
+    def _public_etag(self) -> str:
+        return f'"{id(self):x}-{self._public_view()["version"]}"'
+
+    async def _send_public_view(self, c: WSClient) -> None:
+        view = self._public_view()
+        await self._send_client(c, view, self._public_view_frames())
+
+    async def _publish_public(self) -> None:
+        """Bump the state version if the public snapshot changed and push it: patches to delta clients, full state to the rest."""
+        snap = self._public_snapshot()
+        if snap is self._public_last:
+            return  # Cache hit: nothing tracked changed since the last publish
+        if self._public_last is None:
+            ops = None
+        else:
+            ops = json_diff(self._public_last, snap)
+            if not ops:
+                return
+        base = self._public_version
+        self._public_version += 1
+        self._public_last = snap
+
+        full = self._public_view()
+        if ops is None:
+            await self._fanout(list(self._clients), full, self._public_view_frames())
+            self._feed.publish(self._public_view_json())
+            return
+        patch = {"type": "PUBLIC_PATCH", "version": self._public_version, "base": base, "ops": ops}
+        patch_frames: Dict[str, Frame] = {}
+        await self._fanout([c for c in self._clients if c.delta], patch, patch_frames)
+        await self._fanout([c for c in self._clients if not c.delta], full, self._public_view_frames())
+        self._feed.publish(patch_frames.get("json") or _encode_json(patch))
 
     async def _sync_all(self) -> None:
-        await self._broadcast_public({"type": "PUBLIC_STATE", "data": self._public_snapshot()})
-        for c in list(self._clients):
-            if c.client_type == WSClientType.PLAYER and c.player_id:
-                await self._send_private(c.player_id, {"type": "PRIVATE_STATE", "data": self._private_snapshot(c.player_id)})
+        await self._publish_public()
+        shared: Dict[Tuple[Optional[Role], bool], Dict[str, Any]] = {}
+        for pid, conns in list(self._player_clients.items()):
+            full = [c for c in conns if not c.delta]
+            if full:
+                await self._fanout(full, {"type": "PRIVATE_STATE", "data": self._private_snapshot(pid, shared)})
+            for c in conns:
+                if c.delta:
+                    await self._send_private_view(c, self._private_snapshot(pid, shared, public=False))
+
+    async def _send_private_view(self, c: WSClient, data: Dict[str, Any], force: bool = False) -> None:
+        """PRIVATE_STATE for a delta client: private fields only, and only when they changed."""
+        if data == c.private_last and not force:
+            return
+        c.private_last = data
+        await self._send_client(c, {"type": "PRIVATE_STATE", "data": data})
 
     async def _narrate(self, line: str) -> None:
         self._log(line)
@@ -311,9 +939,31 @@ class Game:
                 return True
         return False
 
+    @contextlib.asynccontextmanager
+    async def _mutate(self) -> AsyncIterator[Outbox]:
+        """Hold the lock for in-memory changes only; what the block queues on the outbox is sent after release.
+
+        No socket write ever happens under the lock, so a slow client can't stall votes, actions or /api/ready.
+        """
+        outbox = Outbox()
+        async with self._lock:
+            yield outbox
+        await self._flush(outbox)
+
+    async def _flush(self, outbox: Outbox) -> None:
+        for kind, arg in outbox.items:
+            if kind == "narrate":
+                await self._narrate(arg)
+            elif kind == "public":
+                await self._broadcast_public(arg)
+            elif kind == "private":
+                await self._send_private(*arg)
+            else:
+                await self._sync_all()
+
     async def join(self, name: str) -> Dict[str, Any]:
         """Join the game. Returns dict with ok, player_id, or error."""
-        async with self._lock:
+        async with self._mutate() as out:
             # Clean and capitalize name
             clean_name = self._capitalize_name(name)
             if not clean_name:
@@ -325,21 +975,21 @@ class Game:
             
             pid = uuid.uuid4().hex[:8]
             self.players[pid] = Player(id=pid, name=clean_name)
-        
-        await self._narrate(f"{clean_name} a rejoint le village.")
-        await self._sync_all()
+            out.narrate(f"{clean_name} a rejoint le village.")
+            out.sync()
         return {"ok": True, "player_id": pid, "name": clean_name}
 
     async def reset(self) -> None:
-        async with self._lock:
+        async with self._mutate() as out:
             self.state = GameState()
             self.players = {}
+            self._player_rings = {}
             self._runner_task = None
-        await self._broadcast_public({"type": "RESET"})
+            out.public({"type": "RESET"})
 
     async def replay(self) -> None:
         """Reset the game state but keep the same players, redistribute roles."""
-        async with self._lock:
+        async with self._mutate() as out:
             if len(self.players) < 5:
                 raise ValueError("Need at least 5 players to replay")
             
@@ -352,10 +1002,9 @@ class Game:
             # Reset game state but keep players
             self.state = GameState()
             self._runner_task = None
-        
-        await self._narrate("🔄 Nouvelle partie avec les mêmes joueurs!")
-        await self._broadcast_public({"type": "REPLAY"})
-        await self._sync_all()
+            out.narrate("🔄 Nouvelle partie avec les mêmes joueurs!")
+            out.public({"type": "REPLAY"})
+            out.sync()
         
         # Auto-start the new game
         await self.start()
@@ -380,7 +1029,7 @@ class Game:
                 self.use_hunter = bool(roles_cfg.get("hunter", False))
 
     async def start(self) -> None:
-        async with self._lock:
+        async with self._mutate() as out:
             if self.state.started:
                 return
             if len(self.players) < 5:
@@ -388,74 +1037,108 @@ class Game:
             self.state.started = True
             self.state.phase = Phase.NIGHT
             self._assign_roles()
-
-        await self._narrate("La partie commence. Les rôles ont été distribués.")
-        await self._sync_all()
+            out.narrate("La partie commence. Les rôles ont été distribués.")
+            out.sync()
 
         if not self._runner_task or self._runner_task.done():
             self._runner_task = asyncio.create_task(self._run())
 
     def _assign_roles(self) -> None:
-        ids = list(self.players.keys())
-        random.shuffle(ids)
-        
-        player_count = len(ids)
-        wolf_count = get_werewolf_count(player_count)
-        
-        roles: List[Role] = []
-        for _ in range(wolf_count):
-            roles.append(Role.WEREWOLF)
-        
-        # Add special roles based on config
-        if self.use_seer:
-            roles.append(Role.SEER)
-        if self.use_witch:
-            roles.append(Role.WITCH)
-        if self.use_cupid:
-            roles.append(Role.CUPID)
-        
-        villager_count = player_count - len(roles)
-        roles += [Role.VILLAGER] * villager_count
-        
-        random.shuffle(roles)
+        self._apply(rules.deal(list(self.players), self.rng, seer=self.use_seer, witch=self.use_witch, cupid=self.use_cupid))
 
-        for pid, r in zip(ids, roles):
-            self.players[pid].role = r
+    async def _run(self) -> None:
+        ticker = asyncio.create_task(self._tick_loop()) if self.TICK_INTERVAL else None
+        try:
+            while True:
+                winner = self._check_winner()
+                if winner:
+                    await self._end_game(winner)
+                    return
 
-        for p in self.players.values():
-            p.witch_heal_used = False
-            p.witch_poison_used = False
-            p.lover_id = None
-            p.alive = True
+                await self._night()
+                winner = self._check_winner()
+                if winner:
+                    await self._end_game(winner)
+                    return
 
-    async def _run(self) -> None:
-        while True:
-            winner = self._check_winner()
-            if winner:
-                await self._end_game(winner)
-                return
+                await self._day_and_vote()
+                winner = self._check_winner()
+                if winner:
+                    await self._end_game(winner)
+                    return
+        finally:
+            if ticker:
+                ticker.cancel()
 
-            await self._night()
-            winner = self._check_winner()
-            if winner:
-                await self._end_game(winner)
-                return
+    async def _tick_loop(self) -> None:
+        """Periodically refresh seconds_left and push it; phase logic never waits on this."""
+        while True:
+            await asyncio.sleep(self.TICK_INTERVAL)
+            async with self._mutate() as out:
+                ends = self.state.timers.phase_ends_at
+                if ends is not None:
+                    self.state.timers.seconds_left = int(max(0, ends - time.time()))
+                status = self._phase_status()
+                if status:
+                    out.public(status)
+                out.sync()
+
+    def _phase_status(self) -> Optional[Dict[str, Any]]:
+        alive_ids = self._alive_ids()
+        if self.state.phase == Phase.DAY:
+            return {
+                "type": "TIMER",
+                "phase": Phase.DAY.value,
+                "label": "Discussion",
+                "remaining": self.state.timers.seconds_left,
+                "ready_count": len(self.state.ready_to_vote & set(alive_ids)),
+                "total_alive": len(alive_ids),
+            }
+        if self.state.phase == Phase.VOTE:
+            return {
+                "type": "VOTE_STATUS",
+                "received": len(self.state.vote_box.votes),
+                "total": len(alive_ids),
+                "seconds_left": int(max(0, self.state.vote_box.deadline - time.time())),
+            }
+        return None
 
-            await self._day_and_vote()
-            winner = self._check_winner()
-            if winner:
-                await self._end_game(winner)
-                return
+    def _set_deadline(self, deadline: float) -> None:
+        self.state.timers.phase_ends_at = deadline
+        self.state.timers.seconds_left = int(max(0, deadline - time.time()))
+
+    async def _wait_for_inputs(
+        self,
+        event: asyncio.Event,
+        deadline: float,
+        done: Callable[[], bool],
+        on_input: Optional[Callable[[], Any]] = None,
+    ) -> bool:
+        """Wait until done() holds (True) or the deadline passes (False), waking on every event.set().
+
+        The deadline is handed to the shared scheduler, which sets the same event when it expires.
+        """
+        timer = self.scheduler.call_at(deadline, event)
+        try:
+            while True:
+                async with self._lock:
+                    if done():
+                        return True
+                if time.time() >= deadline:
+                    return False
+                await event.wait()
+                event.clear()
+                if on_input and time.time() < deadline:
+                    await on_input()
+        finally:
+            self.scheduler.cancel(timer)
 
     async def _night(self) -> None:
-        async with self._lock:
+        async with self._mutate() as out:
             self.state.phase = Phase.NIGHT
-            self.state.night_count += 1
-            self.state.wolves_victim = None
-            self.state.witch_heal = False
-            self.state.witch_poison_target = None
-        await self._narrate(f"Nuit {self.state.night_count}. Le village s'endort.")
-        await self._sync_all()
+            self._apply(rules.begin_night(self._table()))
+            out.narrate(f"Nuit {self.state.night_count}. Le village s'endort.")
+            out.sync()
 
         # Only run cupid on first night if enabled
         if self.state.night_count == 1 and self.use_cupid:
@@ -474,11 +1157,11 @@ class Game:
         await self._resolve_night()
 
     async def _day_and_vote(self) -> None:
-        async with self._lock:
+        async with self._mutate() as out:
             self.state.phase = Phase.DAY
-            self.state.day_count += 1
+            self._apply(rules.begin_day(self._table()))
             self.state.ready_to_vote = set()  # Reset ready players
-        await self._narrate(f"Jour {self.state.day_count}. Discutez.")
+            out.narrate(f"Jour {self.state.day_count}. Discutez.")
         
         # Countdown with early exit if everyone is ready
         await self._countdown_with_ready_check(self.T_DISCUSS, phase=Phase.DAY, label="Discussion")
@@ -487,58 +1170,41 @@ class Game:
     async def _countdown_with_ready_check(self, secs: int, phase: Phase, label: str) -> None:
         """Countdown that can end early when all alive players are ready to vote."""
         end = time.time() + secs
-        while time.time() < end:
-            remaining = int(end - time.time())
-            async with self._lock:
-                self.state.timers.phase_ends_at = end
-                self.state.timers.seconds_left = remaining
-                
-                # Check if everyone is ready
-                alive_ids = self._alive_ids()
-                ready_count = len(self.state.ready_to_vote & set(alive_ids))
-                total_alive = len(alive_ids)
-                
-                if total_alive > 0 and ready_count >= total_alive:
-                    # Everyone is ready - skip remaining time
-                    await self._broadcast_public({"type": "ALL_READY", "message": "Tout le monde est prêt!"})
-                    return
-                    
-            await self._broadcast_public({
-                "type": "TIMER",
-                "phase": phase.value,
-                "label": label,
-                "remaining": remaining,
-                "ready_count": ready_count if 'ready_count' in dir() else 0,
-                "total_alive": total_alive if 'total_alive' in dir() else 0
-            })
-            await self._sync_all()
-            await asyncio.sleep(1)
+        async with self._mutate() as out:
+            self._set_deadline(end)
+            status = self._phase_status()
+            if status:
+                out.public(status)
+            out.sync()
+
+        def everyone_ready() -> bool:
+            alive_ids = self._alive_ids()
+            return len(alive_ids) > 0 and len(self.state.ready_to_vote & set(alive_ids)) >= len(alive_ids)
+
+        if await self._wait_for_inputs(self.state.ready_event, end, everyone_ready):
+            # Everyone is ready - skip remaining time
+            await self._broadcast_public({"type": "ALL_READY", "message": "Tout le monde est prêt!"})
 
     async def _vote_phase(self) -> None:
-        async with self._lock:
+        async with self._mutate() as out:
             self.state.phase = Phase.VOTE
             self.state.vote_box = VoteBox()
             self.state.vote_box.deadline = time.time() + self.T_VOTE
+            self._set_deadline(self.state.vote_box.deadline)
+            out.narrate(f"Le vote commence ({self.T_VOTE}s).")
+            out.public({"type": "VOTE_STARTED", "seconds": self.T_VOTE})
 
-        await self._narrate(f"Le vote commence ({self.T_VOTE}s).")
-        await self._broadcast_public({"type": "VOTE_STARTED", "seconds": self.T_VOTE})
-        await self._sync_all()
-
-        while True:
-            async with self._lock:
-                alive = self._alive_ids()
-                votes = dict(self.state.vote_box.votes)
-                remaining = int(max(0, self.state.vote_box.deadline - time.time()))
-                all_voted = len(votes) >= len(alive) and len(alive) > 0
-                self.state.timers.phase_ends_at = self.state.vote_box.deadline
-                self.state.timers.seconds_left = remaining
+        async def push_status() -> None:
+            async with self._mutate() as out:
+                out.public(self._phase_status())
+                out.sync()
 
-            await self._broadcast_public({"type": "VOTE_STATUS", "received": len(votes), "total": len(alive), "seconds_left": remaining})
-            await self._sync_all()
+        def all_voted() -> bool:
+            alive = self._alive_ids()
+            return len(alive) > 0 and len(self.state.vote_box.votes) >= len(alive)
 
-            if all_voted or remaining <= 0:
-                break
-            await asyncio.sleep(1)
+        await push_status()
+        await self._wait_for_inputs(self.state.vote_box.event, self.state.vote_box.deadline, all_voted, push_status)
 
         await self._narrate("Vote terminé. Décompte...")
         await self._resolve_vote()
@@ -556,22 +1222,17 @@ class Game:
             timeout=self.T_NIGHT_STEP,
         )
 
-        async with self._lock:
+        async with self._mutate() as out:
             data = self.state.pending.received.get(cupid.id) or {}
             if not isinstance(data, dict):
                 data = {}
-            lovers = data.get("targets") or []
-            lovers = [x for x in lovers if x in self.players and self.players[x].alive]
-            lovers = list(dict.fromkeys(lovers))
-            if len(lovers) == 2:
-                a, b = lovers
-                self.players[a].lover_id = b
-                self.players[b].lover_id = a
-                asyncio.create_task(self._send_private(a, {"type": "LOVER_ASSIGNED", "lover_id": b, "lover_name": self.players[b].name}))
-                asyncio.create_task(self._send_private(b, {"type": "LOVER_ASSIGNED", "lover_id": a, "lover_name": self.players[a].name}))
-
-        await self._narrate("Cupidon ferme les yeux.")
-        await self._sync_all()
+            table, events = rules.link_lovers(self._table(), data.get("targets") or [])
+            self._apply(table)
+            for ev in events:
+                out.private(ev.a, {"type": "LOVER_ASSIGNED", "lover_id": ev.b, "lover_name": self.players[ev.b].name})
+                out.private(ev.b, {"type": "LOVER_ASSIGNED", "lover_id": ev.a, "lover_name": self.players[ev.a].name})
+            out.narrate("Cupidon ferme les yeux.")
+            out.sync()
 
     async def _step_wolves(self) -> None:
         wolves = self._players_by_role(Role.WEREWOLF)
@@ -585,37 +1246,17 @@ class Game:
 
         await self._request_wolves_vote(actor_ids=actor_ids, timeout=self.T_NIGHT_STEP)
 
-        async with self._lock:
-            alive_wolves = [wid for wid in actor_ids if wid in self.players and self.players[wid].alive]
-            
-            # Collect valid votes
-            votes = []
-            for wid in alive_wolves:
+        async with self._mutate() as out:
+            votes = {}
+            for wid in actor_ids:
                 data = self.state.pending.received.get(wid)
-                t = data.get("target") if isinstance(data, dict) else None
-                if t in self.players and self.players[t].alive and self.players[t].role != Role.WEREWOLF:
-                    votes.append(t)
-
-            victim = None
-            if votes:
-                # Majority vote (or random among tied leaders)
-                tally = {}
-                for t in votes:
-                    tally[t] = tally.get(t, 0) + 1
-                maxv = max(tally.values())
-                leaders = [t for t, c in tally.items() if c == maxv]
-                victim = random.choice(leaders)
-            else:
-                # NO VOTES: Pick random victim (wolves MUST kill)
-                non_wolves = [p for p in self.players.values() if p.alive and p.role != Role.WEREWOLF]
-                if non_wolves:
-                    victim = random.choice(non_wolves).id
-                    await self._narrate("Les loups n'ont pas choisi... la faim décide pour eux!")
-
-            self.state.wolves_victim = victim
-
-        await self._narrate("Les Loups-Garous ferment les yeux.")
-        await self._sync_all()
+                votes[wid] = data.get("target") if isinstance(data, dict) else None
+            table, events = rules.wolves_choose(self._table(), votes, self.rng)
+            self._apply(table)
+            if any(ev.forced for ev in events):
+                out.narrate("Les loups n'ont pas choisi... la faim décide pour eux!")
+            out.narrate("Les Loups-Garous ferment les yeux.")
+            out.sync()
 
     async def _step_seer(self) -> None:
         seers = self._players_by_role(Role.SEER)
@@ -629,229 +1270,148 @@ class Game:
             payload={"action": "seer_pick_one"},
             timeout=self.T_NIGHT_STEP,
         )
-        async with self._lock:
+        async with self._mutate() as out:
             data = self.state.pending.received.get(seer.id) or {}
             target = data.get("target") if isinstance(data, dict) else None
-            if target in self.players and self.players[target].alive:
-                role_obj = self.players[target].role
-                role_key = role_obj.value if role_obj else None
-                role_fr = ROLE_FR.get(role_obj) if role_obj else None
-                await self._send_private(seer.id, {"type": "SEER_RESULT", "target_id": target, "target_name": self.players[target].name, "role": role_key, "role_fr": role_fr})
-        await self._narrate("La Voyante ferme les yeux.")
-        await self._sync_all()
+            _, events = rules.seer_peek(self._table(), seer.id, target)
+            for ev in events:
+                role_key = ev.role.value if ev.role else None
+                role_fr = ROLE_FR.get(ev.role) if ev.role else None
+                out.private(seer.id, {"type": "SEER_RESULT", "target_id": ev.target_id, "target_name": self.players[ev.target_id].name, "role": role_key, "role_fr": role_fr})
+            out.narrate("La Voyante ferme les yeux.")
+            out.sync()
 
     async def _step_witch(self) -> None:
         witches = self._players_by_role(Role.WITCH)
         if not witches:
             return
         witch = witches[0]
-        async with self._lock:
+        async with self._mutate() as out:
             victim = self.state.wolves_victim
-
-        # Send witch context BEFORE requesting action
-        if victim and victim in self.players:
-            await self._send_private(witch.id, {
-                "type": "WITCH_CONTEXT",
-                "wolves_victim_id": victim,
-                "wolves_victim_name": self.players[victim].name,
-                "heal_used": witch.witch_heal_used,
-                "poison_used": witch.witch_poison_used,
-            })
-
-        await self._narrate("La Sorcière, utilise tes potions si tu le souhaites.")
+            # Send witch context BEFORE requesting action
+            if victim and victim in self.players:
+                out.private(witch.id, {
+                    "type": "WITCH_CONTEXT",
+                    "wolves_victim_id": victim,
+                    "wolves_victim_name": self.players[victim].name,
+                    "heal_used": witch.witch_heal_used,
+                    "poison_used": witch.witch_poison_used,
+                })
+            out.narrate("La Sorcière, utilise tes potions si tu le souhaites.")
         await self._request_action(
             step="WITCH",
             actor_ids=[witch.id],
             payload={"action": "witch_decide"},
             timeout=self.T_NIGHT_STEP,
         )
-        async with self._lock:
+        async with self._mutate() as out:
             data = self.state.pending.received.get(witch.id) or {}
             if not isinstance(data, dict):
                 data = {}
-            heal = bool(data.get("heal"))
-            poison_target = data.get("poison_target")
-            if heal and not witch.witch_heal_used:
-                witch.witch_heal_used = True
-                self.state.witch_heal = True
-            if poison_target in self.players and self.players[poison_target].alive and not witch.witch_poison_used:
-                witch.witch_poison_used = True
-                self.state.witch_poison_target = poison_target
-
-        await self._narrate("La Sorcière ferme les yeux.")
-        await self._sync_all()
+            table, _ = rules.witch_decide(self._table(), witch.id, bool(data.get("heal")), data.get("poison_target"))
+            self._apply(table)
+            out.narrate("La Sorcière ferme les yeux.")
+            out.sync()
 
     async def _resolve_night(self) -> None:
-        async with self._lock:
-            victim = self.state.wolves_victim
-            deaths = set()
-
-            if victim and not self.state.witch_heal:
-                deaths.add(victim)
-
-            if self.state.witch_poison_target:
-                deaths.add(self.state.witch_poison_target)
-
-            deaths_final = set()
+        async with self._mutate() as out:
+            table, deaths = rules.resolve_night(self._table())
+            self._apply(table)
+            if not deaths:
+                out.narrate("L'aube se lève... personne n'est mort cette nuit!")
             for d in deaths:
-                if d in self.players and self.players[d].alive:
-                    deaths_final.add(d)
-
-            lover_deaths: Dict[str, str] = {}
-            
-            changed = True
-            while changed:
-                changed = False
-                for d in list(deaths_final):
-                    lover = self.players[d].lover_id if d in self.players else None
-                    if lover and lover in self.players and self.players[lover].alive and lover not in deaths_final:
-                        deaths_final.add(lover)
-                        lover_deaths[lover] = d
-                        changed = True
-
-            for pid in deaths_final:
-                self.players[pid].alive = False
-
-        if not deaths_final:
-            await self._narrate("L'aube se lève... personne n'est mort cette nuit!")
-        else:
-            primary_deaths = [pid for pid in deaths_final if pid not in lover_deaths]
-            for pid in primary_deaths:
-                p = self.players[pid]
-                role_fr = ROLE_FR.get(p.role) if p.role else "-"
-                await self._narrate(f"L'aube se lève... {p.name} est mort. ({role_fr})")
-            
-            for lover_pid, original_pid in lover_deaths.items():
-                p = self.players[lover_pid]
-                original_p = self.players[original_pid]
+                p = self.players[d.player_id]
                 role_fr = ROLE_FR.get(p.role) if p.role else "-"
-                await self._narrate(f"{p.name} meurt de chagrin, amoureux de {original_p.name}. ({role_fr})")
+                if d.cause == "grief":
+                    out.narrate(f"{p.name} meurt de chagrin, amoureux de {self.players[d.lover_of].name}. ({role_fr})")
+                else:
+                    out.narrate(f"L'aube se lève... {p.name} est mort. ({role_fr})")
+            out.sync()
 
-        await self._sync_all()
-        await asyncio.sleep(0.8)
+        await self.scheduler.sleep(0.8)
 
     async def _resolve_vote(self) -> None:
-        async with self._lock:
-            alive = self._alive_ids()
-            votes = dict(self.state.vote_box.votes)
-            tally = {}
-            for voter, target in votes.items():
-                if voter in alive and target in alive:
-                    tally[target] = tally.get(target, 0) + 1
-
-            eliminated = None
-            if tally:
-                max_votes = max(tally.values())
-                top = [pid for pid, c in tally.items() if c == max_votes]
-                eliminated = random.choice(top)
+        async with self._mutate() as out:
+            table, events = rules.resolve_vote(self._table(), dict(self.state.vote_box.votes), self.rng)
+            self._apply(table)
+            result = events[0]
+            eliminated = result.eliminated
+            safe_tally = [{"id": pid, "name": self.players[pid].name, "votes": cnt} for pid, cnt in result.tally]
+            if eliminated:
+                p = self.players[eliminated]
+                out.public({
+                    "type": "VOTE_RESULT",
+                    "tally": safe_tally,
+                    "eliminated": {"id": eliminated, "name": p.name, "role": p.role.value if p.role else None, "role_fr": ROLE_FR.get(p.role) if p.role else None},
+                })
+                role_fr = ROLE_FR.get(p.role) if p.role else "-"
+                out.narrate(f"Le village a décidé: {p.name} est éliminé. ({role_fr})")
             else:
-                # No votes at all - random elimination
-                if alive:
-                    eliminated = random.choice(alive)
-
-            if eliminated and eliminated in self.players:
-                self.players[eliminated].alive = False
-
-        safe_tally = [{"id": pid, "name": self.players[pid].name, "votes": cnt} for pid, cnt in sorted(tally.items(), key=lambda x: -x[1])]
-        if eliminated:
-            p = self.players[eliminated]
-            await self._broadcast_public({
-                "type": "VOTE_RESULT",
-                "tally": safe_tally,
-                "eliminated": {"id": eliminated, "name": p.name, "role": p.role.value if p.role else None, "role_fr": ROLE_FR.get(p.role) if p.role else None},
-            })
-            role_fr = ROLE_FR.get(p.role) if p.role else "-"
-            await self._narrate(f"Le village a décidé: {p.name} est éliminé. ({role_fr})")
-        else:
-            await self._broadcast_public({"type": "VOTE_RESULT", "tally": safe_tally, "eliminated": None})
-            await self._narrate("Personne n'a été éliminé.")
+                out.public({"type": "VOTE_RESULT", "tally": safe_tally, "eliminated": None})
+                out.narrate("Personne n'a été éliminé.")
+            out.sync()
 
-        await self._sync_all()
-        await asyncio.sleep(self.T_RESULT)
+        await self.scheduler.sleep(self.T_RESULT)
 
     def _check_winner(self) -> Optional[str]:
         if not self.state.started:
             return None
-        wolves = [p for p in self.players.values() if p.alive and p.role == Role.WEREWOLF]
-        non_wolves = [p for p in self.players.values() if p.alive and p.role != Role.WEREWOLF]
-        if len(self._alive_players()) == 0:
-            return "nobody"
-        if len(wolves) == 0:
-            return "villagers"
-        if len(wolves) >= len(non_wolves):
-            return "werewolves"
-        return None
+        return rules.winner(self._table())
 
     async def _end_game(self, winner: str) -> None:
-        async with self._lock:
+        async with self._mutate() as out:
             self.state.phase = Phase.GAME_OVER
             self.state.winner = winner
-        await self._narrate(f"Fin de partie! Victoire: {WINNER_FR.get(winner, winner)}.")
-        await self._broadcast_public({"type": "GAME_OVER", "winner": winner, "winner_fr": WINNER_FR.get(winner, winner)})
-        await self._sync_all()
+            out.narrate(f"Fin de partie! Victoire: {WINNER_FR.get(winner, winner)}.")
+            out.public({"type": "GAME_OVER", "winner": winner, "winner_fr": WINNER_FR.get(winner, winner)})
+            out.sync()
 
     async def _request_action(self, step: str, actor_ids: List[str], payload: Dict[str, Any], timeout: int) -> None:
-        async with self._lock:
-            self.state.pending = ActionInbox(step=step, deadline=time.time() + timeout)
-            self.state.pending.event.clear()
-
-        for aid in actor_ids:
-            if aid in self.players and self.players[aid].alive:
-                await self._send_private(aid, {"type": "ACTION_REQUEST", "step": step, "deadline": self.state.pending.deadline, "payload": payload})
-
-        while True:
-            async with self._lock:
-                received = dict(self.state.pending.received)
-                remaining = int(max(0, self.state.pending.deadline - time.time()))
-                alive_actors = [aid for aid in actor_ids if aid in self.players and self.players[aid].alive]
-                done = all(aid in received for aid in alive_actors) or remaining <= 0
-                self.state.timers.phase_ends_at = self.state.pending.deadline
-                self.state.timers.seconds_left = remaining
-
-            await self._sync_all()
-            if done:
-                break
-            await asyncio.sleep(1)
+        async with self._mutate() as out:
+            self.state.pending = pending = ActionInbox(step=step, deadline=time.time() + timeout)
+            pending.event.clear()
+            self._set_deadline(pending.deadline)
+            for aid in actor_ids:
+                if aid in self.players and self.players[aid].alive:
+                    out.private(aid, {"type": "ACTION_REQUEST", "step": step, "deadline": pending.deadline, "payload": payload})
+            out.sync()
+
+        def all_acted() -> bool:
+            alive_actors = [aid for aid in actor_ids if aid in self.players and self.players[aid].alive]
+            return all(aid in pending.received for aid in alive_actors)
+
+        await self._wait_for_inputs(pending.event, pending.deadline, all_acted, self._sync_all)
+        await self._sync_all()
 
     async def _request_wolves_vote(self, actor_ids: List[str], timeout: int) -> None:
-        async with self._lock:
-            self.state.pending = ActionInbox(step="WOLVES", deadline=time.time() + timeout)
-            self.state.pending.event.clear()
-
-        for aid in actor_ids:
-            if aid in self.players and self.players[aid].alive:
-                await self._send_private(aid, {
-                    "type": "ACTION_REQUEST",
-                    "step": "WOLVES",
-                    "deadline": self.state.pending.deadline,
-                    "payload": {"action": "wolf_vote_victim"},
-                })
-
-        announced_unanimity = False
-        while True:
-            async with self._lock:
-                remaining = int(max(0, self.state.pending.deadline - time.time()))
-                alive_actors = [aid for aid in actor_ids if aid in self.players and self.players[aid].alive]
-                targets = []
-                for wid in alive_actors:
-                    data = self.state.pending.received.get(wid)
-                    t = data.get("target") if isinstance(data, dict) else None
-                    if t in self.players and self.players[t].alive and self.players[t].role != Role.WEREWOLF:
-                        targets.append(t)
-
-                unanimous = (len(alive_actors) > 0 and len(targets) == len(alive_actors) and len(set(targets)) == 1)
-                self.state.timers.phase_ends_at = self.state.pending.deadline
-                self.state.timers.seconds_left = remaining
-
-            await self._sync_all()
-
-            if unanimous and not announced_unanimity:
-                announced_unanimity = True
-                await self._narrate("Unanimité des loups atteinte.")
+        async with self._mutate() as out:
+            self.state.pending = pending = ActionInbox(step="WOLVES", deadline=time.time() + timeout)
+            pending.event.clear()
+            self._set_deadline(pending.deadline)
+            for aid in actor_ids:
+                if aid in self.players and self.players[aid].alive:
+                    out.private(aid, {
+                        "type": "ACTION_REQUEST",
+                        "step": "WOLVES",
+                        "deadline": pending.deadline,
+                        "payload": {"action": "wolf_vote_victim"},
+                    })
+            out.sync()
+
+        def unanimous() -> bool:
+            alive_actors = [aid for aid in actor_ids if aid in self.players and self.players[aid].alive]
+            targets = []
+            for wid in alive_actors:
+                data = pending.received.get(wid)
+                t = data.get("target") if isinstance(data, dict) else None
+                if t in self.players and self.players[t].alive and self.players[t].role != Role.WEREWOLF:
+                    targets.append(t)
+            return len(alive_actors) > 0 and len(targets) == len(alive_actors) and len(set(targets)) == 1
 
-            if remaining <= 0 or unanimous:
-                break
-            await asyncio.sleep(1)
+        reached = await self._wait_for_inputs(pending.event, pending.deadline, unanimous, self._sync_all)
+        await self._sync_all()
+        if reached:
+            await self._narrate("Unanimité des loups atteinte.")
 
     async def submit_action(self, player_id: str, step: str, data: Dict[str, Any]) -> None:
         async with self._lock:
@@ -877,20 +1437,454 @@ class Game:
             self.state.vote_box.votes[voter_id] = target_id
             self.state.vote_box.event.set()
 
+    async def close(self) -> None:
+        """Tear the game down: stop its runner and heartbeat tasks and disconnect every client."""
+        self.closed = True
+        tasks = [t for t in (self._runner_task, self._heartbeat_task) if t and not t.done()]
+        for task in tasks:
+            task.cancel()
+        for c in list(self._clients):
+            self._drop_client(c)
+        # Wake spectator streams so they end now rather than at their next keepalive
+        self._feed.changed.set()
+        self._feed.changed = asyncio.Event()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def mark_ready(self, player_id: str) -> Dict[str, Any]:
+        """Mark a player as ready to vote during discussion. Returns dict with ok and counts, or error."""
+        async with self._mutate() as out:
+            if self.state.phase != Phase.DAY:
+                return {"ok": False, "error": "Not in discussion phase"}
+            if player_id not in self.players:
+                return {"ok": False, "error": "Player not found"}
+            if not self.players[player_id].alive:
+                return {"ok": False, "error": "Player is dead"}
+
+            self.state.ready_to_vote.add(player_id)
+            self.state.ready_event.set()
+            ready_count = len(self.state.ready_to_vote & set(self._alive_ids()))
+            total_alive = len(self._alive_ids())
+            out.public({
+                "type": "PLAYER_READY",
+                "player_id": player_id,
+                "ready_count": ready_count,
+                "total_alive": total_alive
+            })
+
+        return {"ok": True, "ready_count": ready_count, "total_alive": total_alive}
+
+    async def handle_rpc(self, player_id: Optional[str], data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run an ACTION, VOTE or READY sent over /ws; returns the result the caller acks with.
+
+        The player is the one the socket connected as, never an id taken from the message.
+        """
+        if not player_id:
+            return {"ok": False, "error": "Not a player connection"}
+        kind = data.get("type")
+        if kind == "ACTION":
+            step = data.get("step")
+            payload = data.get("data") or {}
+            if not step:
+                return {"ok": False, "error": "Missing step"}
+            await self.submit_action(player_id, step, payload if isinstance(payload, dict) else {})
+            return {"ok": True}
+        if kind == "VOTE":
+            target_id = data.get("target_id")
+            if not target_id:
+                return {"ok": False, "error": "Missing target_id"}
+            await self.cast_vote(player_id, target_id)
+            return {"ok": True}
+        if kind == "READY":
+            return await self.mark_ready(player_id)
+        return {"ok": False, "error": f"Unknown message type: {kind}"}
+
     async def _countdown(self, seconds: int, phase: Phase, label: str) -> None:
         end = time.time() + seconds
         while True:
             remaining = int(max(0, end - time.time()))
-            async with self._lock:
+            async with self._mutate() as out:
                 if self.state.phase != phase:
                     return
                 self.state.timers.phase_ends_at = end
                 self.state.timers.seconds_left = remaining
-            await self._broadcast_public({"type": "COUNTDOWN", "label": label, "seconds_left": remaining})
-            await self._sync_all()
+                out.public({"type": "COUNTDOWN", "label": label, "seconds_left": remaining})
+                out.sync()
             if remaining <= 0:
                 break
-            await asyncio.sleep(1)
+            await self.scheduler.sleep(min(1.0, end - time.time()))
+
+
+class BotSocket:
+    """Stands in for a bot's WebSocket: frames the writer would send are decoded and handed to the bot."""
+
+    def __init__(self, bot: "Bot") -> None:
+        self.bot = bot
+
+    async def send_text(self, frame: str) -> None:
+        self.bot.receive(json.loads(frame))
+
+    async def send_bytes(self, frame: bytes) -> None:
+        self.bot.receive(decode_frame(frame, self.bot.client.codec))
+
+    async def close(self) -> None:
+        self.bot.stop()
+
+
+class Bot:
+    """In-process player: plays like player.js with ?bot=1, with no browser and no network socket.
+
+    It joins like a phone, is registered as an ordinary player connection (so broadcasts reach it
+    through the same outbox and writer as real clients), follows the public view through
+    PUBLIC_STATE/PUBLIC_PATCH like game.js, decides from that, PRIVATE_STATE and ACTION_REQUEST,
+    and answers through handle_rpc like a /ws RPC.
+    """
+
+    THINK = (0.45, 1.4)  # Seconds before answering, the range player.js waits
+
+    def __init__(self, game: Game, player_id: str, rng: Optional[random.Random] = None,
+                 think: Optional[Tuple[float, float]] = None, ready: bool = False) -> None:
+        self.game = game
+        self.player_id = player_id
+        self.rng = rng or random.Random()
+        self.think = self.THINK if think is None else think
+        self.ready = ready  # Also press "ready to vote" in discussion; player.js bots never do
+        self.client = WSClient(websocket=BotSocket(self), client_type=WSClientType.PLAYER, player_id=player_id, delta=True)
+        self.public: Dict[str, Any] = {}  # Public view, kept current from patches
+        self.version = 0
+        self.private: Dict[str, Any] = {}  # Last PRIVATE_STATE
+        self.state: Dict[str, Any] = {}  # Both merged, as the phone sees the table
+        self.stats: Counter[str] = Counter()
+        self._done: Set[str] = set()  # Keys of votes and actions already answered
+        self._tasks: Set[asyncio.Task] = set()
+
+    @classmethod
+    async def join(cls, game: Game, name: str, **kw: Any) -> Optional["Bot"]:
+        """Join the game under name and connect; None if the name is taken."""
+        result = await game.join(name)
+        if not result.get("ok"):
+            return None
+        bot = cls(game, result["player_id"], **kw)
+        await bot.attach()
+        return bot
+
+    async def attach(self) -> None:
+        self.game._register_client(self.client)
+        await self.game._send_public_view(self.client)
+        await self.game._send_private_view(self.client, self.game._private_snapshot(self.player_id, public=False), force=True)
+
+    def stop(self) -> None:
+        """Disconnect and drop any answer still waiting to be sent."""
+        if self.client in self.game._clients:
+            self.game._unregister_client(self.client)
+        for task in self._tasks:
+            task.cancel()
+
+    def receive(self, msg: Dict[str, Any]) -> None:
+        kind = msg.get("type")
+        self.stats[kind] += 1
+        if kind in ("PUBLIC_STATE", "PUBLIC_PATCH", "PRIVATE_STATE"):
+            if kind == "PUBLIC_STATE":
+                self.public, self.version = msg.get("data") or {}, msg.get("version", 0)
+            elif kind == "PUBLIC_PATCH":
+                if msg.get("base") != self.version:
+                    self._spawn(self.game._send_public_view(self.client))  # Missed a version: RESYNC
+                    return
+                self.public, self.version = json_patch(self.public, msg["ops"]), msg["version"]
+            else:
+                self.private = msg.get("data") or {}
+            self.state = {**self.public, **self.private}
+            self._on_state()
+        elif kind == "ACTION_REQUEST":
+            self._act(msg.get("step"), msg.get("deadline"))
+        elif kind == "HEARTBEAT":
+            self.client.last_seen = time.time()  # The HEARTBEAT_ACK a phone would send back
+        elif kind == "RESET":
+            self.stop()  # Its player is gone; a phone would be sent back to the join screen
+
+    def _on_state(self) -> None:
+        state, me = self.state, self.state.get("me") or {}
+        if not me.get("alive"):
+            return
+        if state.get("phase") == Phase.VOTE:
+            key = f"VOTE:{(state.get('timers') or {}).get('phase_ends_at')}"
+            targets = [p["id"] for p in state.get("alive", ()) if p["id"] != self.player_id]
+            if targets and self._once(key):
+                self._send({"type": "VOTE", "target_id": self.rng.choice(targets)})
+        elif state.get("phase") == Phase.DAY and self.ready and self._once(f"READY:{state.get('day_count')}"):
+            self._send({"type": "READY"})
+        if state.get("pending_step"):
+            self._act(state["pending_step"], state.get("pending_deadline"))
+
+    def _act(self, step: Optional[str], deadline: Any) -> None:
+        """Answer a night step meant for this player's role, once per step and deadline."""
+        state, me = self.state, self.state.get("me") or {}
+        if not me.get("alive") or state.get("phase") != Phase.NIGHT:
+            return
+        alive = [p["id"] for p in state.get("alive", ())]
+        targets = [pid for pid in alive if pid != self.player_id]
+        role = me.get("role")
+        if f"{step}:{deadline}" in self._done:
+            return
+        if step in ("WOLVES", "SEER") and role == ("werewolf" if step == "WOLVES" else "seer") and targets:
+            data: Dict[str, Any] = {"target": self.rng.choice(targets)}
+        elif step == "WITCH" and role == "witch":
+            heal = not me.get("witch_heal_used") and self.rng.random() < 0.5
+            poison = self.rng.choice(targets) if targets and not me.get("witch_poison_used") and self.rng.random() < 0.35 else None
+            data = {"heal": heal, "poison_target": poison}
+        elif step == "CUPID" and role == "cupid" and len(alive) >= 2:
+            data = {"targets": self.rng.sample(alive, 2)}
+        else:
+            return
+        self._done.add(f"{step}:{deadline}")
+        self._send({"type": "ACTION", "step": step, "data": data})
+
+    def _once(self, key: str) -> bool:
+        if key in self._done:
+            return False
+        self._done.add(key)
+        return True
+
+    def _send(self, rpc: Dict[str, Any]) -> None:
+        self._spawn(self._answer(rpc))
+
+    def _spawn(self, coro: Any) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _answer(self, rpc: Dict[str, Any]) -> None:
+        delay = self.rng.uniform(*self.think)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        self.client.last_seen = time.time()  # Inbound frame, as on /ws
+        result = await self.game.handle_rpc(self.player_id, rpc)
+        self.stats[f"{rpc['type']}_{'ok' if result.get('ok') else 'failed'}"] += 1
+
+
+MAX_BOTS_PER_REQUEST = 50  # Most bots one /api/bots call may add
+
+
+async def add_bots(game: Game, count: int, **kw: Any) -> List[Bot]:
+    """Join `count` bots named "Bot 1", "Bot 2", ... (skipping names in use); kw goes to Bot."""
+    bots: List[Bot] = []
+    n = 0
+    while len(bots) < count:
+        n += 1
+        if game._is_name_taken(f"Bot {n}"):
+            continue
+        bot = await Bot.join(game, f"Bot {n}", **kw)
+        if bot:
+            bots.append(bot)
+    return bots
+
+
+class GameRegistry:
+    """Rooms by code, each an independent Game with its own lock and runner task.
+
+    The default room is the original single game, so unscoped routes keep working.
+    """
+
+    DEFAULT_ROOM = "MAIN"
+    CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ"  # No I or O: easy to read off a TV
+    CODE_LENGTH = 4
+    MAX_CODE_LENGTH = 16  # Custom codes: ASCII letters and digits only, they name the hibernation file
+
+    def __init__(self, default: Optional[Game] = None, max_rooms: int = 1000,
+                 owns: Callable[[str], bool] = lambda code: True,
+                 hibernate_dir: Optional[Path] = None) -> None:
+        self.rooms: Dict[str, Game] = {self.DEFAULT_ROOM: default or Game()}
+        self.max_rooms = max_rooms
+        self.owns = owns  # Generated codes are picked so this process's shard owns them
+        # Rooms in LOBBY or GAME_OVER with no client for this many seconds are written
+        # to hibernate_dir and evicted, then restored on the next lookup. None disables it.
+        self.HIBERNATE_AFTER: Optional[float] = 300.0
+        self.SWEEP_INTERVAL = 30.0
+        self.hibernate_dir = hibernate_dir or Path(tempfile.gettempdir()) / "loupgarou-rooms"
+        self.stats: Counter[str] = Counter()
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def _room_file(self, code: str) -> Path:
+        return self.hibernate_dir / f"{code}.json"
+
+    def get(self, code: str) -> Optional[Game]:
+        code = code.strip().upper()
+        game = self.rooms.get(code)
+        if game is None and code.isalnum() and self._room_file(code).exists():
+            game = self._rehydrate(code)
+        if game is not None:
+            self._ensure_sweeper()
+        return game
+
+    def _rehydrate(self, code: str) -> Game:
+        path = self._room_file(code)
+        game = self.rooms[code] = Game.restore(json.loads(path.read_text(encoding="utf-8")))
+        path.unlink()
+        self.stats["rehydrated"] += 1
+        return game
+
+    async def hibernate(self, code: str) -> None:
+        """Write a room to disk and evict it; the next get() brings it back."""
+        game = self.rooms.pop(code)
+        self.hibernate_dir.mkdir(parents=True, exist_ok=True)
+        self._room_file(code).write_text(json.dumps(game.dump(), ensure_ascii=False), encoding="utf-8")
+        self.stats["hibernated"] += 1
+        await game.close()
+
+    async def sweep(self) -> None:
+        """Hibernate every idle room in LOBBY or GAME_OVER (the default room stays resident)."""
+        if self.HIBERNATE_AFTER is None:
+            return
+        cutoff = time.time() - self.HIBERNATE_AFTER
+        for code, game in list(self.rooms.items()):
+            if (code != self.DEFAULT_ROOM and not game._clients and game.last_active <= cutoff
+                    and game.state.phase in (Phase.LOBBY, Phase.GAME_OVER)):
+                await self.hibernate(code)
+
+    async def _sweep_loop(self) -> None:
+        while self.HIBERNATE_AFTER is not None:
+            await asyncio.sleep(self.SWEEP_INTERVAL)
+            await self.sweep()
+
+    def _ensure_sweeper(self) -> None:
+        if self.HIBERNATE_AFTER is None or (self._sweeper and not self._sweeper.done()):
+            return
+        try:
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_loop())
+        except RuntimeError:
+            pass  # No loop yet (e.g. setup code); started on the first lookup from a request
+
+    def create(self, code: Optional[str] = None) -> Tuple[str, Game]:
+        if len(self.rooms) >= self.max_rooms:
+            raise ValueError("Trop de salles ouvertes.")
+        if code:
+            code = code.strip().upper()
+            if not (code.isascii() and code.isalnum() and len(code) <= self.MAX_CODE_LENGTH):
+                raise ValueError("Code de salle invalide.")
+            if code in self.rooms or self._room_file(code).exists():
+                raise ValueError("Ce code de salle est déjà pris.")
+        else:
+            code = ""
+            while not code or code in self.rooms or not self.owns(code) or self._room_file(code).exists():
+                code = "".join(random.choice(self.CODE_ALPHABET) for _ in range(self.CODE_LENGTH))
+        game = self.rooms[code] = Game()
+        self._ensure_sweeper()
+        return code, game
+
+    def list(self) -> List[Dict[str, Any]]:
+        rooms = [
+            {"room": code, "phase": g.state.phase, "players": len(g.players), "clients": len(g._clients),
+             "bytes": g.memory_bytes()}
+            for code, g in self.rooms.items()
+        ]
+        if self.hibernate_dir.exists():
+            rooms += [{"room": f.stem, "hibernated": True} for f in sorted(self.hibernate_dir.glob("*.json"))]
+        return rooms
+
+    async def close(self, code: str) -> None:
+        code = code.strip().upper()
+        if code == self.DEFAULT_ROOM:
+            raise ValueError("La salle par défaut ne peut pas être fermée.")
+        game = self.rooms.pop(code, None)
+        if game is None:
+            if not self._room_file(code).exists():
+                raise ValueError("Salle introuvable.")
+            self._room_file(code).unlink()
+            return
+        await game.close()
+
+
+def _ring_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class ShardRing:
+    """Consistent hash of room codes onto worker shards.
+
+    Virtual nodes spread rooms evenly, and changing the shard count only moves about 1/N of them.
+    """
+
+    def __init__(self, count: int = 1, index: int = 0, replicas: int = 64) -> None:
+        self.count = max(1, count)
+        self.index = index
+        points = sorted((_ring_hash(f"shard-{i}-{r}"), i) for i in range(self.count) for r in range(replicas))
+        self._keys = [k for k, _ in points]
+        self._owners = [i for _, i in points]
+
+    def owner(self, room: str) -> int:
+        if self.count == 1:
+            return 0
+        i = bisect.bisect(self._keys, _ring_hash(room.strip().upper())) % len(self._keys)
+        return self._owners[i]
+
+    def is_local(self, room: str) -> bool:
+        return self.owner(room) == self.index
+
+
+# Sharding across worker processes, set by scripts/run_shards.py. Unset means a single
+# shard: every room is local and nothing is forwarded.
+SHARDS = ShardRing(int(os.environ.get("LG_SHARDS", "1")), int(os.environ.get("LG_SHARD", "0")))
+SHARD_SOCKET = os.environ.get("LG_SHARD_SOCKET", "/tmp/loupgarou-shard-{}.sock")
+FORWARDED_HEADER = "x-lg-forwarded"
+_shard_clients: Dict[int, Any] = {}
+
+
+def _shard_client(shard: int):
+    """Pooled HTTP client talking to a sibling shard over its Unix socket."""
+    client = _shard_clients.get(shard)
+    if client is None:
+        if httpx is None:
+            raise RuntimeError("httpx is required to forward requests between shards")
+        transport = httpx.AsyncHTTPTransport(uds=SHARD_SOCKET.format(shard))
+        client = _shard_clients[shard] = httpx.AsyncClient(transport=transport, base_url="http://shard", timeout=None)
+    return client
+
+
+async def _forward_http(request: Request, shard: int) -> Response:
+    """Replay an HTTP request on the shard owning its room and stream the answer back."""
+    client = _shard_client(shard)
+    headers = [(k, v) for k, v in request.headers.items() if k.lower() not in ("host", "content-length")]
+    upstream = await client.send(client.build_request(
+        request.method, request.url.path, params=request.query_params,
+        headers=headers + [(FORWARDED_HEADER, str(SHARDS.index))], content=await request.body(),
+    ), stream=True)
+    passthrough = {k: v for k, v in upstream.headers.items() if k.lower() not in ("transfer-encoding", "connection")}
+    return StreamingResponse(upstream.aiter_raw(), status_code=upstream.status_code, headers=passthrough,
+                             background=BackgroundTask(upstream.aclose))
+
+
+async def _forward_ws(ws: WebSocket, shard: int) -> None:
+    """Pipe an accepted /ws connection to the shard owning its room, frame for frame."""
+    if unix_connect is None:
+        raise RuntimeError("websockets is required to forward /ws between shards")
+    uri = f"ws://shard{ws.url.path}?{ws.url.query}"
+    async with unix_connect(SHARD_SOCKET.format(shard), uri) as upstream:
+        async def downstream() -> None:
+            async for frame in upstream:
+                if isinstance(frame, bytes):
+                    await ws.send_bytes(frame)
+                else:
+                    await ws.send_text(frame)
+
+        async def upstream_pump() -> None:
+            while True:
+                message = await ws.receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                await upstream.send(message["text"] if message.get("text") is not None else message.get("bytes") or b"")
+
+        tasks = [asyncio.create_task(downstream()), asyncio.create_task(upstream_pump())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+    try:
+        await ws.close()
+    except Exception:
+        pass
+
+
+_ROOM_PATH = re.compile(r"^/api/rooms/([^/]+)")
 
 
 app = FastAPI(title="Loup-Garou MVP")
@@ -902,6 +1896,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+
+async def shard_router(request: Request, call_next):
+    """Send room-scoped /api requests to the shard that owns the room."""
+    path = request.url.path
+    if path.startswith("/api/") and FORWARDED_HEADER not in request.headers:
+        match = _ROOM_PATH.match(path)
+        if match or path not in ("/api/rooms", "/api/server-info", "/api/metrics"):
+            room = match.group(1) if match else request.query_params.get("room") or GameRegistry.DEFAULT_ROOM
+            if not SHARDS.is_local(room):
+                return await _forward_http(request, SHARDS.owner(room))
+    return await call_next(request)
+
+
+if SHARDS.count > 1:
+    app.middleware("http")(shard_router)
+
 BASE_DIR = Path(__file__).resolve().parent
 WEB_DIR = BASE_DIR / "web"
 if WEB_DIR.exists():
@@ -909,7 +1920,58 @@ if WEB_DIR.exists():
     app.mount("/player", StaticFiles(directory=str(WEB_DIR / "player"), html=True), name="player")
     app.mount("/static", StaticFiles(directory=str(WEB_DIR / "static")), name="static")
 
+# Wolf counts per (players, deck) tuned by scripts/tune_balance.py. LG_BALANCE names the table;
+# otherwise balance.json next to this file is used if present, else WEREWOLF_COUNT_RANGES alone.
+BALANCE_FILE = Path(os.environ.get("LG_BALANCE") or BASE_DIR / "balance.json")
+if os.environ.get("LG_BALANCE") or BALANCE_FILE.exists():
+    rules.load_balance(BALANCE_FILE)
+
 GAME = Game()
+ROOMS = GameRegistry(GAME, owns=SHARDS.is_local)
+
+
+def room_game(room: str = GameRegistry.DEFAULT_ROOM) -> Game:
+    """Dependency resolving the room from the /api/rooms/{room}/... path or a ?room= query."""
+    game = ROOMS.get(room)
+    if game is None:
+        raise HTTPException(status_code=404, detail="Room not found")
+    return game
+
+
+@app.get("/api/rooms")
+async def api_rooms(request: Request):
+    rooms = ROOMS.list()
+    if SHARDS.count > 1 and FORWARDED_HEADER not in request.headers:
+        rooms = [r for r in rooms if SHARDS.is_local(r["room"])]
+        others = [i for i in range(SHARDS.count) if i != SHARDS.index]
+        replies = await asyncio.gather(*(
+            _shard_client(i).get("/api/rooms", headers={FORWARDED_HEADER: str(SHARDS.index)}) for i in others
+        ), return_exceptions=True)
+        for shard, reply in zip(others, replies):
+            if not isinstance(reply, BaseException):
+                rooms += [r for r in reply.json()["rooms"] if SHARDS.owner(r["room"]) == shard]
+    return {"ok": True, "rooms": rooms}
+
+
+@app.post("/api/rooms")
+async def api_create_room(request: Request, payload: Optional[Dict[str, Any]] = None):
+    code = (payload or {}).get("room")
+    if code and not SHARDS.is_local(code) and FORWARDED_HEADER not in request.headers:
+        return await _forward_http(request, SHARDS.owner(code))
+    try:
+        code, _ = ROOMS.create((payload or {}).get("room"))
+        return {"ok": True, "room": code}
+    except ValueError as e:
+        return {"ok": False, "error": str(e)}
+
+
+@app.delete("/api/rooms/{room}")
+async def api_close_room(room: str):
+    try:
+        await ROOMS.close(room)
+        return {"ok": True}
+    except ValueError as e:
+        return {"ok": False, "error": str(e)}
 
 
 @app.get("/")
@@ -918,40 +1980,62 @@ async def root():
 
 
 @app.get("/api/health")
-async def health():
-    return {"ok": True, "phase": GAME.state.phase}
+@app.get("/api/rooms/{room}/health")
+async def health(game: Game = Depends(room_game)):
+    return {"ok": True, "phase": game.state.phase}
 
 
 @app.post("/api/join")
-async def api_join(payload: Dict[str, Any]):
+@app.post("/api/rooms/{room}/join")
+async def api_join(payload: Dict[str, Any], game: Game = Depends(room_game)):
     name = (payload.get("name") or "").strip() or "Joueur"
-    result = await GAME.join(name)
+    result = await game.join(name)
     return result
 
 
+@app.post("/api/bots")
+@app.post("/api/rooms/{room}/bots")
+async def api_bots(payload: Dict[str, Any], game: Game = Depends(room_game)):
+    """Fill empty seats with in-process bot players before the game starts."""
+    try:
+        count = int(payload.get("count", 1))
+    except (TypeError, ValueError):
+        return {"ok": False, "error": "Invalid count"}
+    if not 1 <= count <= MAX_BOTS_PER_REQUEST:
+        return {"ok": False, "error": f"count must be between 1 and {MAX_BOTS_PER_REQUEST}"}
+    if game.state.started:
+        return {"ok": False, "error": "Game already started"}
+    bots = await add_bots(game, count)
+    return {"ok": True, "player_ids": [b.player_id for b in bots]}
+
+
 @app.post("/api/start")
-async def api_start():
+@app.post("/api/rooms/{room}/start")
+async def api_start(game: Game = Depends(room_game)):
     try:
-        await GAME.start()
+        await game.start()
         return {"ok": True}
     except ValueError as e:
         return {"ok": False, "error": str(e)}
 
 
 @app.post("/api/reset")
-async def api_reset():
-    await GAME.reset()
+@app.post("/api/rooms/{room}/reset")
+async def api_reset(game: Game = Depends(room_game)):
+    await game.reset()
     return {"ok": True}
 
 
 @app.post("/api/config")
-async def api_config(payload: Dict[str, Any]):
-    await GAME.configure(payload)
+@app.post("/api/rooms/{room}/config")
+async def api_config(payload: Dict[str, Any], game: Game = Depends(room_game)):
+    await game.configure(payload)
     return {"ok": True}
 
 
 @app.post("/api/action")
-async def api_action(payload: Dict[str, Any]):
+@app.post("/api/rooms/{room}/action")
+async def api_action(payload: Dict[str, Any], game: Game = Depends(room_game)):
     player_id = payload.get("player_id")
     step = payload.get("step")
     data = payload.get("data") or {}
@@ -959,30 +2043,42 @@ async def api_action(payload: Dict[str, Any]):
         data = {}
     if not player_id or not step:
         return {"ok": False, "error": "Missing player_id or step"}
-    await GAME.submit_action(player_id, step, data)
+    await game.submit_action(player_id, step, data)
     return {"ok": True}
 
 
 @app.post("/api/vote")
-async def api_vote(payload: Dict[str, Any]):
+@app.post("/api/rooms/{room}/vote")
+async def api_vote(payload: Dict[str, Any], game: Game = Depends(room_game)):
     voter_id = payload.get("voter_id")
     target_id = payload.get("target_id")
     if not voter_id or not target_id:
         return {"ok": False, "error": "Missing voter_id or target_id"}
-    await GAME.cast_vote(voter_id, target_id)
+    await game.cast_vote(voter_id, target_id)
     return {"ok": True}
 
 
 @app.post("/api/replay")
-async def api_replay():
+@app.post("/api/rooms/{room}/replay")
+async def api_replay(game: Game = Depends(room_game)):
     """Replay with same players but new randomly distributed roles."""
     try:
-        await GAME.replay()
+        await game.replay()
         return {"ok": True}
     except ValueError as e:
         return {"ok": False, "error": str(e)}
 
 
+@app.get("/api/metrics")
+async def api_metrics():
+    """Process-wide health: deadline scheduler lag and room registry counters (this shard only)."""
+    return {
+        "ok": True,
+        "scheduler": SCHEDULER.metrics(),
+        "rooms": {"resident": len(ROOMS.rooms), **ROOMS.stats},
+    }
+
+
 @app.get("/api/server-info")
 async def api_server_info():
     """Return server info including local IP address."""
@@ -993,32 +2089,73 @@ async def api_server_info():
 
 
 @app.post("/api/ready")
-async def api_ready(payload: Dict[str, Any]):
+@app.post("/api/rooms/{room}/ready")
+async def api_ready(payload: Dict[str, Any], game: Game = Depends(room_game)):
     """Mark a player as ready to vote during discussion phase."""
     player_id = payload.get("player_id")
     if not player_id:
         return {"ok": False, "error": "Missing player_id"}
     
-    async with GAME._lock:
-        if GAME.state.phase != Phase.DAY:
-            return {"ok": False, "error": "Not in discussion phase"}
-        if player_id not in GAME.players:
-            return {"ok": False, "error": "Player not found"}
-        if not GAME.players[player_id].alive:
-            return {"ok": False, "error": "Player is dead"}
-        
-        GAME.state.ready_to_vote.add(player_id)
-        ready_count = len(GAME.state.ready_to_vote & set(GAME._alive_ids()))
-        total_alive = len(GAME._alive_ids())
-    
-    await GAME._broadcast_public({
-        "type": "PLAYER_READY",
-        "player_id": player_id,
-        "ready_count": ready_count,
-        "total_alive": total_alive
-    })
-    
-    return {"ok": True, "ready_count": ready_count, "total_alive": total_alive}
+    return await game.mark_ready(player_id)
+
+
+async def _spectator_stream(game: Game, last_id: Optional[int]):
+    """SSE body: the missed backlog (or HELLO and a full PUBLIC_STATE), then the shared feed until the room closes."""
+    feed = game._feed
+    backlog = feed.after(last_id) if last_id is not None else None
+    if backlog is None:
+        hello = {"type": "HELLO", "client": "spectator", "server_time": time.time(), "seq": game._seq}
+        yield f"data: {_encode_json(hello)}\n\nid: {feed.last_id}\ndata: {game._public_view_json()}\n\n".encode("utf-8")
+    elif backlog:
+        yield backlog
+    last_id = feed.last_id
+    while not game.closed:  # A closed room's stream ends; EventSource reconnects and finds the room again
+        if feed.last_id == last_id:
+            try:
+                async with asyncio.timeout(game.STREAM_KEEPALIVE):
+                    await feed.changed.wait()
+            except TimeoutError:
+                yield b": keepalive\n\n"
+            continue
+        chunk = feed.after(last_id)
+        if chunk is None:
+            return  # Fell behind the buffer; EventSource reconnects and starts from full state
+        last_id = feed.last_id
+        yield chunk
+
+
+@app.get("/api/stream")
+@app.get("/api/rooms/{room}/stream")
+async def api_stream(request: Request, game: Game = Depends(room_game)):
+    """Read-only Server-Sent Events feed of public messages for the TV and spectator screens."""
+    last = request.headers.get("last-event-id", "")
+    return StreamingResponse(
+        _spectator_stream(game, int(last) if last.isdigit() else None),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/state")
+@app.get("/api/rooms/{room}/state")
+async def api_state(request: Request, wait: float = 25.0, game: Game = Depends(room_game)):
+    """Current PUBLIC_STATE with an ETag. With If-None-Match, long-polls up to `wait` seconds for a newer one."""
+    etag = request.headers.get("if-none-match")
+    deadline = time.time() + min(max(wait, 0.0), 60.0)
+    while etag == game._public_etag():
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return Response(status_code=304, headers={"ETag": etag})
+        try:
+            async with asyncio.timeout(remaining):
+                await game._feed.changed.wait()
+        except TimeoutError:
+            pass
+    return Response(
+        game._public_view_json(),
+        media_type="application/json",
+        headers={"ETag": game._public_etag(), "Cache-Control": "no-cache"},
+    )
 
 
 @app.websocket("/ws")
@@ -1028,30 +2165,67 @@ async def websocket_endpoint(ws: WebSocket):
     client = qp.get("client", "tv")
     player_id = qp.get("player_id")
 
-    if client not in ("tv", "player"):
+    room = qp.get("room") or GameRegistry.DEFAULT_ROOM
+    if not SHARDS.is_local(room):
+        await _forward_ws(ws, SHARDS.owner(room))
+        return
+    game = ROOMS.get(room)
+    if client not in ("tv", "player") or game is None:
         await ws.close()
         return
 
     ctype = WSClientType.TV if client == "tv" else WSClientType.PLAYER
-    client_obj = WSClient(websocket=ws, client_type=ctype, player_id=player_id if ctype == WSClientType.PLAYER else None)
-    GAME._clients.add(client_obj)
-
-    await GAME._send(ws, {"type": "HELLO", "client": client, "player_id": player_id})
-    await GAME._send(ws, {"type": "PUBLIC_STATE", "data": GAME._public_snapshot()})
+    client_obj = WSClient(
+        websocket=ws,
+        client_type=ctype,
+        player_id=player_id if ctype == WSClientType.PLAYER else None,
+        delta=qp.get("delta") == "1",
+        codec=qp.get("codec") if qp.get("codec") in CODECS else DEFAULT_CODEC,
+        batch=qp.get("batch") == "1",
+    )
+    game._register_client(client_obj)
+
+    since = qp.get("since", "")
+    missed = game._missed_messages(client_obj.player_id, int(since)) if since.isdigit() else None
+
+    await game._send_client(client_obj, {
+        "type": "HELLO",
+        "client": client,
+        "player_id": player_id,
+        "server_time": time.time(),
+        "codec": client_obj.codec,
+        "seq": game._seq,
+        "resumed": missed is not None,
+    })
+    for msg in missed or ():
+        await game._send_client(client_obj, msg)
+    await game._send_public_view(client_obj)
     if ctype == WSClientType.PLAYER and player_id:
-        await GAME._send(ws, {"type": "PRIVATE_STATE", "data": GAME._private_snapshot(player_id)})
+        if client_obj.delta:
+            await game._send_private_view(client_obj, game._private_snapshot(player_id, public=False), force=True)
+        else:
+            await game._send_client(client_obj, {"type": "PRIVATE_STATE", "data": game._private_snapshot(player_id)})
 
     try:
         while True:
-            msg = await ws.receive_text()
+            message = await ws.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
+            client_obj.last_seen = time.time()
             try:
-                data = json.loads(msg)
+                data = decode_frame(message.get("text") or message.get("bytes") or b"", client_obj.codec)
             except Exception:
                 data = {"type": "PING"}
             if data.get("type") == "PING":
-                await GAME._send(ws, {"type": "PONG"})
+                # Echo the client's send time so it can estimate RTT and its clock offset
+                await game._send_client(client_obj, {"type": "PONG", "t0": data.get("t0"), "server_time": time.time()})
+            elif data.get("type") == "RESYNC":
+                await game._send_public_view(client_obj)
+            elif data.get("type") in RPC_TYPES:
+                result = await game.handle_rpc(client_obj.player_id, data)
+                await game._send_client(client_obj, {"type": "ACK", "id": data.get("id"), **result})
     except Exception:
-        GAME._clients.discard(client_obj)
+        game._unregister_client(client_obj)
         try:
             await ws.close()
         except Exception:
@@ -0,0 +1,201 @@
+"""Headless Monte Carlo games over the rules engine, spread across a process pool.
+
+A game here is the real deal (rules.deal, the same one Game._assign_roles uses) followed by
+nights and days resolved by rules.*, with bots choosing every input. No asyncio, no clock:
+a game takes well under a millisecond, and each chunk of games gets its own seed so a run is
+reproducible for a given --seed and chunking.
+"""
+from __future__ import annotations
+
+import itertools
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import rules
+from rules import Role, Table
+
+# (use_seer, use_witch, use_cupid)
+RoleConfig = Tuple[bool, bool, bool]
+ALL_CONFIGS: List[RoleConfig] = list(itertools.product((True, False), repeat=3))
+DEFAULT_CONFIG: RoleConfig = (True, True, True)
+MAX_DAYS = 50  # Safety net; a game always ends well before this
+
+
+class RandomPolicy:
+    """Uniformly random valid choices: nobody uses what they know beyond their own team."""
+
+    def __init__(self, rng: random.Random) -> None:
+        self.rng = rng
+
+    def cupid(self, table: Table, cupid_id: str) -> List[str]:
+        return self.rng.sample([s.id for s in table.alive()], 2)
+
+    def wolves(self, table: Table) -> Dict[str, str]:
+        prey = [s.id for s in table.alive() if s.role != Role.WEREWOLF]
+        return {w.id: self.rng.choice(prey) for w in table.by_role(Role.WEREWOLF)} if prey else {}
+
+    def seer(self, table: Table, seer_id: str) -> Optional[str]:
+        others = [s.id for s in table.alive() if s.id != seer_id]
+        return self.rng.choice(others) if others else None
+
+    def saw(self, seen: rules.SeerSaw) -> None:
+        pass
+
+    def witch(self, table: Table, witch_id: str) -> Tuple[bool, Optional[str]]:
+        heal = table.wolves_victim is not None and self.rng.random() < 0.5
+        others = [s.id for s in table.alive() if s.id != witch_id]
+        poison = self.rng.choice(others) if others and self.rng.random() < 0.2 else None
+        return heal, poison
+
+    def day(self, table: Table) -> Dict[str, str]:
+        votes = {}
+        alive = [s.id for s in table.alive()]
+        for pid in alive:
+            others = [t for t in alive if t != pid]
+            if others:
+                votes[pid] = self.rng.choice(others)
+        return votes
+
+
+class InformedPolicy(RandomPolicy):
+    """Roles play their part: wolves agree on one prey and never vote each other out,
+    the seer accuses the first wolf found and the village follows, the witch saves the
+    first victim and poisons a known wolf."""
+
+    def __init__(self, rng: random.Random) -> None:
+        super().__init__(rng)
+        self.seen: Set[str] = set()
+        self.known_wolves: List[str] = []
+
+    def _accused(self, table: Table) -> Optional[str]:
+        return next((w for w in self.known_wolves if table.is_alive(w)), None)
+
+    def wolves(self, table: Table) -> Dict[str, str]:
+        prey = [s.id for s in table.alive() if s.role != Role.WEREWOLF]
+        if not prey:
+            return {}
+        target = self.rng.choice(prey)
+        return {w.id: target for w in table.by_role(Role.WEREWOLF)}
+
+    def seer(self, table: Table, seer_id: str) -> Optional[str]:
+        unseen = [s.id for s in table.alive() if s.id != seer_id and s.id not in self.seen]
+        return self.rng.choice(unseen) if unseen else None
+
+    def saw(self, seen: rules.SeerSaw) -> None:
+        self.seen.add(seen.target_id)
+        if seen.role == Role.WEREWOLF:
+            self.known_wolves.append(seen.target_id)
+
+    def witch(self, table: Table, witch_id: str) -> Tuple[bool, Optional[str]]:
+        return table.wolves_victim is not None, self._accused(table)
+
+    def day(self, table: Table) -> Dict[str, str]:
+        accused = self._accused(table)
+        if accused is None:
+            return super().day(table)
+        votes = super().day(table)
+        for s in table.alive():
+            if s.role != Role.WEREWOLF and s.id != accused:
+                votes[s.id] = accused
+        return votes
+
+
+POLICIES = {"random": RandomPolicy, "informed": InformedPolicy}
+
+
+@dataclass(frozen=True)
+class GameResult:
+    winner: str
+    nights: int
+    days: int
+
+
+def play_game(player_count: int, config: RoleConfig, rng: random.Random, policy: str = "random") -> GameResult:
+    """One complete game: deal, then alternate nights and days until rules.winner() decides."""
+    seer_on, witch_on, cupid_on = config
+    bots = POLICIES[policy](rng)
+    table = rules.deal([f"p{i}" for i in range(player_count)], rng, seer=seer_on, witch=witch_on, cupid=cupid_on)
+    won = rules.winner(table)
+    while won is None and table.day_count < MAX_DAYS:
+        table = rules.begin_night(table)
+        if table.night_count == 1:
+            for cupid in table.by_role(Role.CUPID):
+                table, _ = rules.link_lovers(table, bots.cupid(table, cupid.id))
+        table, _ = rules.wolves_choose(table, bots.wolves(table), rng)
+        for seer in table.by_role(Role.SEER):
+            _, events = rules.seer_peek(table, seer.id, bots.seer(table, seer.id))
+            for ev in events:
+                bots.saw(ev)
+        for witch in table.by_role(Role.WITCH):
+            table, _ = rules.witch_decide(table, witch.id, *bots.witch(table, witch.id))
+        table, _ = rules.resolve_night(table)
+        won = rules.winner(table)
+        if won:
+            break
+        table = rules.begin_day(table)
+        table, _ = rules.resolve_vote(table, bots.day(table), rng)
+        won = rules.winner(table)
+    return GameResult(won or "nobody", table.night_count, table.day_count)
+
+
+# Per (players, config): games, wins by side, total nights
+Tally = Dict[Tuple[int, RoleConfig], Counter]
+
+
+def run_chunk(games: int, player_counts: Sequence[int], configs: Sequence[RoleConfig], seed: str, policy: str = "random") -> Tally:
+    """Play `games` games for every (player count, config) pair from one seed; runs in a worker process."""
+    rng = random.Random(seed)
+    tally: Tally = {}
+    for n in player_counts:
+        for config in configs:
+            c = tally[(n, config)] = Counter()
+            for _ in range(games):
+                result = play_game(n, config, rng, policy)
+                c["games"] += 1
+                c[result.winner] += 1
+                c["nights"] += result.nights
+    return tally
+
+
+def merge(into: Tally, part: Tally) -> Tally:
+    for key, c in part.items():
+        into.setdefault(key, Counter()).update(c)
+    return into
+
+
+def simulate(games: int, player_counts: Sequence[int], configs: Sequence[RoleConfig] = (DEFAULT_CONFIG,),
+             seed: int = 0, policy: str = "random", workers: Optional[int] = None, chunk: int = 2000) -> Tally:
+    """`games` games per (player count, config), split into chunks of at most `chunk` across `workers` processes.
+
+    Chunk i is seeded with "<seed>:<i>", so the totals depend only on seed and chunk size, not on scheduling.
+    """
+    tally: Tally = {}
+    if games <= 0:
+        return tally  # Nothing to map, and a negative count would still leave a remainder chunk
+    sizes = [chunk] * (games // chunk) + ([games % chunk] if games % chunk else [])
+    jobs = [(size, list(player_counts), list(configs), f"{seed}:{i}", policy) for i, size in enumerate(sizes)]
+    if workers == 1:
+        for job in jobs:
+            merge(tally, run_chunk(*job))
+        return tally
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for part in pool.map(run_chunk, *zip(*jobs)):
+            merge(tally, part)
+    return tally
+
+
+def win_rates(tally: Tally) -> Iterable[Dict[str, object]]:
+    """One row per (players, config), sorted, with win rates as fractions."""
+    for (n, (seer_on, witch_on, cupid_on)), c in sorted(tally.items(), key=lambda kv: (kv[0][0], [not x for x in kv[0][1]])):
+        games = c["games"] or 1
+        yield {
+            "players": n, "use_seer": seer_on, "use_witch": witch_on, "use_cupid": cupid_on,
+            "games": c["games"],
+            "villagers": c["villagers"] / games,
+            "werewolves": c["werewolves"] / games,
+            "nobody": c["nobody"] / games,
+            "avg_nights": c["nights"] / games,
+        }
@@ -12,7 +12,7 @@ from httpx import AsyncClient, ASGITransport
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from server import Game, Role, Phase, Player, app, GAME
+from server import Game, Role, Phase, Player, WSClient, WSClientType, app, GAME, decode_frame
 
 
 @pytest.fixture
@@ -41,6 +41,63 @@ async def add_players(game: Game, count: int, names: List[str] | None = None) ->
     return player_ids
 
 
+class FakeWebSocket:
+    """Minimal stand-in for a Starlette WebSocket that records outgoing frames."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False) -> None:
+        self.delay = delay
+        self.fail = fail
+        self.sent: List[Any] = []
+        self.closed = False
+
+    async def send_text(self, data: str) -> None:
+        await self._deliver(data)
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self._deliver(data)
+
+    async def _deliver(self, data: Any) -> None:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("socket is gone")
+        self.sent.append(data)
+
+    async def close(self) -> None:
+        self.closed = True
+
+    def messages(self, codec: str = "json") -> List[Dict[str, Any]]:
+        return [decode_frame(frame, codec) for frame in self.sent]
+
+
+def attach_client(game: Game, ws: FakeWebSocket, player_id: str | None = None) -> WSClient:
+    """Register a fake socket on the game as a TV (no player_id) or player client."""
+    ctype = WSClientType.PLAYER if player_id else WSClientType.TV
+    client = WSClient(websocket=ws, client_type=ctype, player_id=player_id)
+    game._register_client(client)
+    return client
+
+
+async def make_game(count: int = 5) -> Game:
+    """A started game with count players and dealt roles, before any phase has run."""
+    game = Game()
+    for i in range(count):
+        await game.join(f"Player{i + 1}")
+    game.state.started = True
+    game._assign_roles()
+    return game
+
+
+async def drain(game: Game, timeout: float = 1.0) -> None:
+    """Let the per-connection writer tasks flush their outboxes."""
+    loop = asyncio.get_running_loop()
+    end = loop.time() + timeout
+    while loop.time() < end:
+        if all(not c.outbox and not c.wakeup.is_set() for c in game._clients):
+            return
+        await asyncio.sleep(0.001)
+
+
 def count_roles(game: Game) -> Dict[Role, int]:
     """Count the number of each role assigned in the game."""
     counts: Dict[Role, int] = {}
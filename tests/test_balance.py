@@ -0,0 +1,122 @@
+"""Tests for the balance tuner and the tuned wolf-count table."""
+from __future__ import annotations
+
+import json
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import balance  # noqa: E402
+import rules  # noqa: E402
+from rules import Role  # noqa: E402
+
+
+@pytest.fixture
+def clean_balance():
+    """Leave rules.BALANCE empty for the rest of the suite."""
+    yield
+    rules.BALANCE.clear()
+
+
+class TestEstimate:
+    """Win-rate estimates and their confidence intervals."""
+
+    def test_wilson_interval(self):
+        """The interval should contain the rate, shrink with games and stay within [0, 1]."""
+        z = balance.z_score(0.95)
+        assert z == pytest.approx(1.96, abs=0.01)
+
+        small, large = balance.Estimate(50, 100).interval(z), balance.Estimate(5000, 10000).interval(z)
+        assert small[0] < 0.5 < small[1]
+        assert large[1] - large[0] < small[1] - small[0]
+        assert balance.Estimate(0, 20).interval(z)[0] == pytest.approx(0.0)
+        assert balance.Estimate(20, 20).interval(z)[1] == pytest.approx(1.0)
+        assert balance.Estimate().interval(z) == (0.0, 1.0)
+
+    def test_distance_to_target(self):
+        """Best case is zero when the interval covers the target; worst case is the far edge."""
+        z = balance.z_score(0.95)
+        near = balance.Estimate(490, 1000)
+        lo, hi = near.interval(z)
+        assert near.distance(0.5, z) == (0.0, pytest.approx(max(0.5 - lo, hi - 0.5)))
+        best, worst = balance.Estimate(100, 1000).distance(0.5, z)
+        assert 0.3 < best < worst < 0.5
+
+
+class TestTuner:
+    """Searching wolf counts with caching and early stopping."""
+
+    def test_wolf_options(self):
+        """Wolves stay a minority and leave room for the special roles."""
+        assert balance.wolf_options(8, frozenset()) == [1, 2, 3]
+        assert balance.wolf_options(5, frozenset(rules.SPECIAL_ROLES)) == [1, 2]
+        assert balance.wolf_options(4, frozenset(rules.SPECIAL_ROLES)) == [1]
+
+    def test_picks_closest_and_stops_early(self):
+        """The chosen count should be closest to target, and hopeless counts played least."""
+        cache = balance.Cache()
+        deck = frozenset()
+        wolves, estimates = balance.tune_deck(12, deck, cache, target=0.5, precision=0.02, round_games=2000, max_games=20000)
+
+        assert wolves == min(estimates, key=lambda w: abs(estimates[w].rate - 0.5))
+        assert estimates[5].games < estimates[wolves].games  # Wolves win nearly every 12-player game with 5
+        assert all(e.games <= 20000 for e in estimates.values())
+
+    def test_cache_resumes(self, tmp_path):
+        """A second run over the same cache plays no new games and gives the same answer."""
+        path = tmp_path / "cache.json"
+        first = balance.tune_deck(6, frozenset({Role.SEER}), balance.Cache(path), round_games=1000, max_games=4000)
+        played = json.loads(path.read_text())
+
+        again = balance.tune_deck(6, frozenset({Role.SEER}), balance.Cache(path), round_games=1000, max_games=4000)
+
+        assert again == first
+        assert json.loads(path.read_text()) == played
+        assert all(key.startswith("informed|6|seer|") for key in played)
+
+
+class TestBalanceTable:
+    """The table written by the tuner and read by the server."""
+
+    def test_tuned_table_overrides_ranges(self, tmp_path, clean_balance):
+        """get_werewolf_count should use the tuned entry for that deck and fall back otherwise."""
+        table = balance.tune([8], [frozenset(), frozenset(rules.SPECIAL_ROLES)], round_games=2000, max_games=4000)
+        assert set(table["counts"]["8"]) == {"none", "seer+witch+cupid"}
+        assert table["recommended"]["8"] in table["counts"]["8"]
+        table["counts"]["8"]["none"]["wolves"] = 3
+        path = tmp_path / "balance.json"
+        path.write_text(json.dumps(table))
+
+        assert rules.load_balance(path) == 2
+        assert rules.get_werewolf_count(8, []) == 3
+        assert rules.get_werewolf_count(8) == 2  # No deck given: the ranges
+        assert rules.get_werewolf_count(9, []) == 2
+        dealt = rules.deal([f"p{i}" for i in range(8)], random.Random(0), seer=False, witch=False, cupid=False)
+        assert len(dealt.by_role(Role.WEREWOLF)) == 3
+
+    def test_rejects_bad_wolf_count(self, tmp_path, clean_balance):
+        """A table giving the wolves the whole village should not load."""
+        path = tmp_path / "balance.json"
+        path.write_text(json.dumps({"counts": {"6": {"seer": {"wolves": 6}}}}))
+
+        with pytest.raises(ValueError):
+            rules.load_balance(path)
+        assert rules.BALANCE == {}
+
+    def test_rejects_deck_that_does_not_fit(self, tmp_path, clean_balance):
+        """Wolves plus special roles beyond the seat count should not load, or the deal would drop roles."""
+        path = tmp_path / "balance.json"
+        path.write_text(json.dumps({"counts": {"5": {"seer+witch+cupid": {"wolves": 3}}}}))
+
+        with pytest.raises(ValueError):
+            rules.load_balance(path)
+        assert rules.BALANCE == {}
+
+    def test_deck_keys_round_trip(self):
+        """Deck names should be stable and parse back to the same roles."""
+        for deck in balance.ALL_DECKS:
+            assert rules.parse_deck(rules.deck_key(deck)) == deck
+        assert rules.deck_key([Role.CUPID, Role.SEER]) == "seer+cupid"
+        assert rules.deck_key([]) == "none"
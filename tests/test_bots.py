@@ -0,0 +1,174 @@
+"""Tests for in-process bot players."""
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+from httpx import AsyncClient
+
+from server import GAME, Bot, Game, Phase, add_bots
+
+
+def fast_game(seed: int = 0) -> Game:
+    game = Game(seed=seed)
+    game.T_NIGHT_STEP = game.T_DISCUSS = game.T_VOTE = 0.1
+    game.T_RESULT = 0
+    return game
+
+
+class TestBotGames:
+    """Bots should carry a whole game on their own."""
+
+    @pytest.mark.asyncio
+    async def test_bots_play_to_game_over(self):
+        """A table of bots should answer night steps and votes until someone wins."""
+        game = fast_game()
+        bots = await add_bots(game, 8, think=(0.0, 0.02), rng=random.Random(1))
+        assert [game.players[b.player_id].name for b in bots] == [f"Bot {i}" for i in range(1, 9)]
+
+        await game.start()
+        await asyncio.wait_for(game._runner_task, 20)
+
+        assert game.state.phase == Phase.GAME_OVER
+        assert sum(b.stats["ACTION_ok"] for b in bots) > 0
+        assert sum(b.stats["VOTE_ok"] for b in bots) > 0
+        assert all(b.stats["PRIVATE_STATE"] > 0 for b in bots)
+        await game.close()
+        assert not game._clients
+
+    @pytest.mark.asyncio
+    async def test_bots_survive_heartbeat_reaper(self):
+        """Bots answer heartbeats, so a game outlasting the miss window keeps every bot connected."""
+        game = fast_game()
+        game.HEARTBEAT_INTERVAL = 0.05
+        game.HEARTBEAT_MISSES = 2
+        bots = await add_bots(game, 6, think=(0.0, 0.02), rng=random.Random(2))
+        started = asyncio.get_running_loop().time()
+
+        await game.start()
+        await asyncio.wait_for(game._runner_task, 20)
+
+        assert asyncio.get_running_loop().time() - started > 4 * game.HEARTBEAT_INTERVAL * game.HEARTBEAT_MISSES
+        assert game.state.phase == Phase.GAME_OVER
+        assert game.stats["heartbeat_reaped"] == 0
+        assert {c.player_id for c in game._clients} == {b.player_id for b in bots}
+        assert all(b.stats["HEARTBEAT"] > 0 for b in bots)
+        await game.close()
+
+    @pytest.mark.asyncio
+    async def test_reset_ends_bot_writers(self):
+        """A bot stopping on RESET from inside its own writer should still let that writer finish."""
+        game = fast_game()
+        bots = await add_bots(game, 4, think=(0.0, 0.0))
+        writers = [b.client.writer for b in bots]
+
+        await game.reset()
+        await asyncio.wait_for(asyncio.gather(*writers), 1.0)
+
+        assert all(b.stats["RESET"] == 1 for b in bots)
+        assert not game._clients
+        await game.close()
+
+    @pytest.mark.asyncio
+    async def test_bots_fill_around_humans(self):
+        """Bot names skip ones already taken, and a human can still play alongside them."""
+        game = fast_game()
+        await game.join("Bot 2")
+        bots = await add_bots(game, 3, think=(0.0, 0.0))
+
+        assert sorted(game.players[b.player_id].name for b in bots) == ["Bot 1", "Bot 3", "Bot 4"]
+        assert len(game.players) == 4
+        await game.close()
+
+
+class TestBotChoices:
+    """Bots pick like player.js: valid targets, once per request."""
+
+    def make_bot(self, role: str, **me) -> Bot:
+        game = Game()
+        bot = Bot(game, "b", rng=random.Random(0), think=(0.0, 0.0))
+        bot.state = {
+            "phase": "NIGHT",
+            "alive": [{"id": "a"}, {"id": "b"}, {"id": "c"}],
+            "me": {"id": "b", "alive": True, "role": role, **me},
+        }
+        bot.sent = []
+        bot._send = bot.sent.append
+        return bot
+
+    def test_answers_each_request_once(self):
+        """A repeated ACTION_REQUEST for the same deadline should not be answered twice."""
+        bot = self.make_bot("seer")
+        bot.receive({"type": "ACTION_REQUEST", "step": "SEER", "deadline": 5})
+        bot.receive({"type": "ACTION_REQUEST", "step": "SEER", "deadline": 5})
+        bot.receive({"type": "ACTION_REQUEST", "step": "WOLVES", "deadline": 5})
+
+        assert len(bot.sent) == 1
+        assert bot.sent[0]["data"]["target"] in ("a", "c")
+
+    def test_witch_skips_used_potions(self):
+        """A witch with both potions spent should neither heal nor poison."""
+        bot = self.make_bot("witch", witch_heal_used=True, witch_poison_used=True)
+        bot.receive({"type": "ACTION_REQUEST", "step": "WITCH", "deadline": 1})
+
+        assert bot.sent == [{"type": "ACTION", "step": "WITCH", "data": {"heal": False, "poison_target": None}}]
+
+    def test_votes_once_per_vote_phase(self):
+        """Each vote phase (keyed by its end time) gets one ballot, never for the bot itself."""
+        bot = self.make_bot("villager")
+        state = {**bot.state, "phase": "VOTE", "timers": {"phase_ends_at": 10}}
+        for ends in (10, 10, 20):
+            bot.receive({"type": "PRIVATE_STATE", "data": {**state, "timers": {"phase_ends_at": ends}}})
+
+        assert [m["type"] for m in bot.sent] == ["VOTE", "VOTE"]
+        assert all(m["target_id"] != "b" for m in bot.sent)
+
+    def test_dead_bot_stays_quiet(self):
+        """A dead bot should not act or vote."""
+        bot = self.make_bot("werewolf")
+        bot.state["me"]["alive"] = False
+        bot.receive({"type": "ACTION_REQUEST", "step": "WOLVES", "deadline": 1})
+        bot.receive({"type": "PRIVATE_STATE", "data": {**bot.state, "phase": "VOTE"}})
+
+        assert bot.sent == []
+
+
+class TestBotsEndpoint:
+    """POST /api/bots fills the lobby."""
+
+    @pytest.mark.asyncio
+    async def test_adds_bots_to_lobby(self, client: AsyncClient):
+        """Bots should join the room, and be refused once the game has started."""
+        response = await client.post("/api/bots", json={"count": 5})
+        data = response.json()
+        assert data["ok"] is True
+        assert len(data["player_ids"]) == 5
+        assert set(data["player_ids"]) == set(GAME.players)
+        assert all(c.player_id in GAME.players for c in GAME._clients)
+
+        GAME.state.started = True
+        response = await client.post("/api/bots", json={"count": 1})
+        assert response.json()["ok"] is False
+
+    @pytest.mark.asyncio
+    async def test_rejects_bad_count(self, client: AsyncClient):
+        """Counts outside 1..MAX_BOTS_PER_REQUEST should be refused without adding anyone."""
+        for count in (0, 500, "many"):
+            response = await client.post("/api/bots", json={"count": count})
+            assert response.json()["ok"] is False
+        assert GAME.players == {}
+
+    @pytest.mark.asyncio
+    async def test_reset_disconnects_bots(self, client: AsyncClient):
+        """Resetting the room should detach its bots along with their players."""
+        await client.post("/api/bots", json={"count": 3})
+        assert len(GAME._clients) == 3
+
+        await client.post("/api/reset")
+        for _ in range(20):
+            await asyncio.sleep(0)
+
+        assert not GAME._clients
+        assert GAME.players == {}
+
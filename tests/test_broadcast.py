@@ -0,0 +1,367 @@
+"""Tests for WebSocket fan-out."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from server import CODECS, Game, app, decode_frame
+from conftest import FakeWebSocket, attach_client, drain
+
+
+class TestBroadcastFanout:
+    """Test encode-once concurrent broadcast."""
+
+    @pytest.mark.asyncio
+    async def test_all_clients_receive_same_frame(self):
+        """Every client should receive the exact same encoded frame."""
+        game = Game()
+        sockets = [FakeWebSocket() for _ in range(5)]
+        for ws in sockets:
+            attach_client(game, ws)
+
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "Bonsoir"})
+        await drain(game)
+
+        frames = [ws.sent[0] for ws in sockets]
+        assert all(f is frames[0] for f in frames)
+        assert sockets[0].messages()[0]["line"] == "Bonsoir"
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_serialize_fanout(self):
+        """Sends should run concurrently, so total time is bounded by the slowest client."""
+        game = Game()
+        for _ in range(10):
+            attach_client(game, FakeWebSocket(delay=0.05))
+
+        start = time.perf_counter()
+        await game._broadcast_public({"type": "PING"})
+        await drain(game)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.25
+
+    @pytest.mark.asyncio
+    async def test_timed_out_client_is_reaped(self):
+        """A client slower than SEND_TIMEOUT should be removed in the same pass."""
+        game = Game()
+        game.SEND_TIMEOUT = 0.05
+        fast = FakeWebSocket()
+        slow = FakeWebSocket(delay=1.0)
+        attach_client(game, fast)
+        slow_client = attach_client(game, slow)
+
+        await game._broadcast_public({"type": "PING"})
+        await asyncio.sleep(0.1)
+
+        assert slow_client not in game._clients
+        assert len(fast.sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_failing_client_is_reaped(self):
+        """A client whose send raises should be removed."""
+        game = Game()
+        broken = attach_client(game, FakeWebSocket(fail=True))
+        ok = attach_client(game, FakeWebSocket())
+
+        await game._broadcast_public({"type": "PING"})
+        await drain(game)
+
+        assert broken not in game._clients
+        assert ok in game._clients
+
+    @pytest.mark.asyncio
+    async def test_private_send_targets_only_player(self):
+        """Private messages should only reach the sockets of that player."""
+        game = Game()
+        mine = FakeWebSocket()
+        other = FakeWebSocket()
+        tv = FakeWebSocket()
+        attach_client(game, mine, player_id="p1")
+        attach_client(game, other, player_id="p2")
+        attach_client(game, tv)
+
+        await game._send_private("p1", {"type": "SEER_RESULT"})
+        await drain(game)
+
+        assert len(mine.sent) == 1
+        assert other.sent == []
+        assert tv.sent == []
+
+
+class TestConnectionRegistry:
+    """Test the player_id -> connections index."""
+
+    @pytest.mark.asyncio
+    async def test_register_indexes_player_sockets(self):
+        """Player sockets should be indexed by player_id, TV sockets should not."""
+        game = Game()
+        a1 = attach_client(game, FakeWebSocket(), player_id="p1")
+        a2 = attach_client(game, FakeWebSocket(), player_id="p1")
+        attach_client(game, FakeWebSocket())
+
+        assert game._player_clients == {"p1": {a1, a2}}
+
+    @pytest.mark.asyncio
+    async def test_unregister_removes_empty_entry(self):
+        """Dropping the last socket of a player should remove the index entry."""
+        game = Game()
+        c = attach_client(game, FakeWebSocket(), player_id="p1")
+
+        game._unregister_client(c)
+
+        assert "p1" not in game._player_clients
+        assert c not in game._clients
+
+    @pytest.mark.asyncio
+    async def test_reaped_client_leaves_index(self):
+        """A socket reaped during a private send should leave the index too."""
+        game = Game()
+        attach_client(game, FakeWebSocket(fail=True), player_id="p1")
+
+        await game._send_private("p1", {"type": "LOVER_ASSIGNED"})
+        await drain(game)
+
+        assert "p1" not in game._player_clients
+
+    @pytest.mark.asyncio
+    async def test_sync_all_sends_one_private_state_per_socket(self):
+        """A player with two sockets should get exactly one PRIVATE_STATE on each."""
+        game = Game()
+        pid = (await game.join("Alice"))["player_id"]
+        s1, s2 = FakeWebSocket(), FakeWebSocket()
+        attach_client(game, s1, player_id=pid)
+        attach_client(game, s2, player_id=pid)
+        game.state.timers.seconds_left = 10
+
+        await game._sync_all()
+        await drain(game)
+
+        for ws in (s1, s2):
+            types = [m["type"] for m in ws.messages()]
+            assert types.count("PRIVATE_STATE") == 1
+            assert types.count("PUBLIC_STATE") == 1
+
+
+class TestOutboundQueues:
+    """Test per-connection outboxes and slow-consumer eviction."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_does_not_wait_for_slow_socket(self):
+        """Queuing a broadcast should return immediately even if a socket is stalled."""
+        game = Game()
+        attach_client(game, FakeWebSocket(delay=5.0))
+
+        start = time.perf_counter()
+        for _ in range(5):
+            await game._broadcast_public({"type": "NARRATOR_LINE", "line": "..."})
+
+        assert time.perf_counter() - start < 0.05
+
+    @pytest.mark.asyncio
+    async def test_state_messages_coalesce(self):
+        """Only the latest queued PUBLIC_STATE should be kept."""
+        game = Game()
+        client = attach_client(game, FakeWebSocket())
+
+        await game._broadcast_public({"type": "PUBLIC_STATE", "data": 1})
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "x"})
+        await game._broadcast_public({"type": "PUBLIC_STATE", "data": 2})
+
+        assert [k for k, _ in client.outbox] == ["NARRATOR_LINE", "PUBLIC_STATE"]
+        await drain(game)
+        assert [m.get("data") for m in client.websocket.messages() if m["type"] == "PUBLIC_STATE"] == [2]
+
+    @pytest.mark.asyncio
+    async def test_full_snapshot_supersedes_patches(self):
+        """A queued PUBLIC_STATE should replace pending PUBLIC_PATCH frames."""
+        game = Game()
+        client = attach_client(game, FakeWebSocket())
+
+        await game._broadcast_public({"type": "PUBLIC_PATCH", "ops": []})
+        await game._broadcast_public({"type": "PUBLIC_STATE", "data": 1})
+
+        assert [k for k, _ in client.outbox] == ["PUBLIC_STATE"]
+
+    @pytest.mark.asyncio
+    async def test_slow_consumer_is_evicted(self):
+        """A client whose queue stays full past the threshold should be disconnected."""
+        game = Game()
+        game.OUTBOX_LIMIT = 3
+        game.SLOW_CONSUMER_TIMEOUT = 0.05
+        ws = FakeWebSocket(delay=5.0)
+        client = attach_client(game, ws)
+
+        for i in range(3):
+            await game._broadcast_public({"type": "NARRATOR_LINE", "line": str(i)})
+        for i in range(5):
+            await game._broadcast_public({"type": "TIMER", "seconds_left": i})
+        assert client in game._clients
+        assert game.stats["frames_dropped"] == 5
+        await asyncio.sleep(0.1)
+        await game._broadcast_public({"type": "TIMER", "seconds_left": 0})
+
+        assert client not in game._clients
+        assert game.stats["slow_evicted"] == 1
+        await asyncio.sleep(0.01)
+        assert ws.closed
+
+    @pytest.mark.asyncio
+    async def test_event_that_cannot_be_queued_evicts(self):
+        """An event frame never goes missing on a live connection: a full outbox evicts instead."""
+        game = Game()
+        game.OUTBOX_LIMIT = 3
+        client = attach_client(game, FakeWebSocket(delay=5.0), player_id="p1")
+
+        for i in range(3):
+            await game._broadcast_public({"type": "NARRATOR_LINE", "line": str(i)})
+        assert client in game._clients
+        await game._send_private("p1", {"type": "SEER_RESULT", "target_id": "p2"})
+
+        assert client not in game._clients
+        assert game.stats["slow_evicted"] == 1
+        assert game.stats["frames_dropped"] == 0
+
+
+class TestCodecs:
+    """Test the negotiable wire format."""
+
+    @pytest.mark.asyncio
+    async def test_json_is_default_text(self):
+        """Clients without a codec should get JSON text frames."""
+        game = Game()
+        ws = FakeWebSocket()
+        attach_client(game, ws)
+
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "Élodie"})
+        await drain(game)
+
+        assert isinstance(ws.sent[0], str)
+        assert ws.messages()[0]["line"] == "Élodie"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("codec", sorted(CODECS))
+    async def test_codecs_roundtrip_snapshot(self, codec):
+        """Every codec should carry the same public snapshot."""
+        game = Game()
+        await game.join("Alice")
+        ws = FakeWebSocket()
+        attach_client(game, ws).codec = codec
+
+        await game._broadcast_public(game._public_view())
+        await drain(game)
+
+        msg = ws.messages(codec)[0]
+        assert msg["data"]["alive"][0]["name"] == "Alice"
+        assert msg["data"]["phase"] == "LOBBY"
+        assert isinstance(ws.sent[0], bytes) == (codec != "json")
+
+    @pytest.mark.asyncio
+    async def test_encoded_once_per_codec(self):
+        """Clients sharing a codec should share the encoded frame."""
+        game = Game()
+        a, b = FakeWebSocket(), FakeWebSocket()
+        text = FakeWebSocket()
+        attach_client(game, a).codec = "json-binary"
+        attach_client(game, b).codec = "json-binary"
+        attach_client(game, text)
+
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "x"})
+        await drain(game)
+
+        assert a.sent[0] is b.sent[0]
+        assert isinstance(text.sent[0], str)
+
+    def test_ws_codec_negotiation(self):
+        """/ws?codec= should select the codec and fall back to JSON when unknown."""
+        with TestClient(app) as tc:
+            with tc.websocket_connect("/ws?client=tv&codec=json-binary") as ws:
+                hello = decode_frame(ws.receive_bytes(), "json-binary")
+                assert hello["codec"] == "json-binary"
+            with tc.websocket_connect("/ws?client=tv&codec=nope") as ws:
+                assert ws.receive_json()["codec"] == "json"
+
+
+class TestBatching:
+    """Test per-turn coalescing of queued messages into one BATCH frame."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("codec", sorted(CODECS))
+    async def test_one_frame_per_turn(self, codec):
+        """Messages queued in the same turn should reach a batch client as one frame."""
+        game = Game()
+        ws = FakeWebSocket()
+        client = attach_client(game, ws)
+        client.codec, client.batch = codec, True
+
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "a"})
+        await game._broadcast_public({"type": "VOTE_STATUS", "votes": 1})
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "b"})
+        await drain(game)
+
+        assert len(ws.sent) == 1
+        batch = ws.messages(codec)[0]
+        assert batch["type"] == "BATCH"
+        assert [m["type"] for m in batch["messages"]] == ["NARRATOR_LINE", "VOTE_STATUS", "NARRATOR_LINE"]
+        assert game.stats["frames_batched"] == 2
+
+    @pytest.mark.asyncio
+    async def test_single_message_not_wrapped(self):
+        """A lone message should go out as is."""
+        game = Game()
+        ws = FakeWebSocket()
+        attach_client(game, ws).batch = True
+
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "a"})
+        await drain(game)
+
+        assert len(ws.sent) == 1
+        assert ws.messages()[0]["type"] == "NARRATOR_LINE"
+
+    @pytest.mark.asyncio
+    async def test_non_batch_clients_unchanged(self):
+        """Clients that did not opt in should keep one frame per message."""
+        game = Game()
+        ws = FakeWebSocket()
+        attach_client(game, ws)
+
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "a"})
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "b"})
+        await drain(game)
+
+        assert [m["line"] for m in ws.messages()] == ["a", "b"]
+
+
+class TestHeartbeat:
+    """Test server-initiated heartbeats and reaping of silent connections."""
+
+    @pytest.mark.asyncio
+    async def test_silent_client_is_reaped(self):
+        """A client that stops answering should be closed and removed."""
+        game = Game()
+        game.HEARTBEAT_INTERVAL = 0.05
+        game.HEARTBEAT_MISSES = 2
+        ghost, live = FakeWebSocket(), FakeWebSocket()
+        attach_client(game, ghost)
+        live_client = attach_client(game, live)
+
+        for _ in range(6):
+            await asyncio.sleep(0.05)
+            live_client.last_seen = time.time()
+
+        assert [c.websocket for c in game._clients] == [live]
+        assert ghost.closed
+        assert game.stats["heartbeat_reaped"] == 1
+        assert any(m["type"] == "HEARTBEAT" for m in live.messages())
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_task_stops_without_clients(self):
+        """The heartbeat loop should end once the last client is gone."""
+        game = Game()
+        game.HEARTBEAT_INTERVAL = 0.02
+        client = attach_client(game, FakeWebSocket())
+        game._unregister_client(client)
+
+        await asyncio.wait_for(game._heartbeat_task, 1.0)
+        assert game._heartbeat_task.done()
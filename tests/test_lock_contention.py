@@ -0,0 +1,97 @@
+"""Tests that Game._lock is never held while messages are sent."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from server import Game, Role, Phase
+from conftest import FakeWebSocket, attach_client, make_game
+
+
+def spy_on_sends(game: Game) -> list:
+    """Record whether the lock was held each time a message was fanned out."""
+    held = []
+    fanout = game._fanout
+
+    async def spy(clients, msg, frames=None):
+        held.append((msg.get("type"), game._lock.locked()))
+        await fanout(clients, msg, frames)
+
+    game._fanout = spy
+    return held
+
+
+class TestNoSendUnderLock:
+    """Night steps queue their messages and send them after releasing the lock."""
+
+    @pytest.mark.asyncio
+    async def test_seer_result_sent_after_release(self):
+        """The seer's private result should go out with the lock free."""
+        game = await make_game()
+        game.state.phase = Phase.NIGHT
+        game.T_NIGHT_STEP = 5
+        seer = [p for p in game.players.values() if p.role == Role.SEER][0]
+        target = next(pid for pid in game.players if pid != seer.id)
+        ws = FakeWebSocket()
+        attach_client(game, ws, seer.id)
+        held = spy_on_sends(game)
+
+        task = asyncio.create_task(game._step_seer())
+        while game.state.pending.step != "SEER":
+            await asyncio.sleep(0)
+        await game.submit_action(seer.id, "SEER", {"target": target})
+        await asyncio.wait_for(task, 1.0)
+        await asyncio.sleep(0.01)
+
+        assert ("SEER_RESULT", False) in held
+        assert not any(locked for _, locked in held)
+        assert any(m["type"] == "SEER_RESULT" for m in ws.messages())
+
+    @pytest.mark.asyncio
+    async def test_wolves_fallback_narrated_after_release(self):
+        """When wolves don't vote, the forced-victim narration should not be sent under the lock."""
+        game = await make_game()
+        game.state.phase = Phase.NIGHT
+        game.T_NIGHT_STEP = 0.01
+        attach_client(game, FakeWebSocket())
+        held = spy_on_sends(game)
+
+        await asyncio.wait_for(game._step_wolves(), 1.0)
+
+        assert game.state.wolves_victim is not None
+        assert any(t == "NARRATOR_LINE" for t, _ in held)
+        assert not any(locked for _, locked in held)
+
+
+class TestSlowClientContention:
+    """A client that is slow to read must not delay other players' inputs."""
+
+    @pytest.mark.asyncio
+    async def test_votes_accepted_quickly_with_slow_socket(self):
+        """Every vote should be accepted promptly while a socket takes 0.5s per frame."""
+        game = await make_game(8)
+        game.T_VOTE = 5
+        game.T_RESULT = 0.01
+        slow = FakeWebSocket(delay=0.5)
+        attach_client(game, slow)
+        for pid in game.players:
+            attach_client(game, FakeWebSocket(), pid)
+
+        task = asyncio.create_task(game._vote_phase())
+        while game.state.phase != Phase.VOTE:
+            await asyncio.sleep(0)
+        target = next(iter(game.players))
+        latencies = []
+        for pid in game.players:
+            started = time.perf_counter()
+            await game.cast_vote(pid, target)
+            latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0)
+
+        await asyncio.wait_for(task, 1.0)
+
+        assert max(latencies) < 0.05
+        assert len(game.state.vote_box.votes) == 8
+        assert len(slow.sent) < 3  # Still draining: the vote never waited on it
+        await game.close()
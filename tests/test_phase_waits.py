@@ -0,0 +1,120 @@
+"""Tests for event-driven phase waits."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from server import Game, Role, Phase, app
+from conftest import FakeWebSocket, attach_client, make_game
+
+
+async def wait_for_phase(game: Game, phase: Phase) -> None:
+    while game.state.phase != phase:
+        await asyncio.sleep(0)
+
+
+class TestNightStepWakeup:
+    """Night steps should end as soon as the last actor submits."""
+
+    @pytest.mark.asyncio
+    async def test_action_request_wakes_on_submission(self):
+        """A single-actor step should finish right after the submission, not at the deadline."""
+        game = await make_game()
+        game.state.phase = Phase.NIGHT
+        seer = [p for p in game.players.values() if p.role == Role.SEER][0]
+        target = next(pid for pid in game.players if pid != seer.id)
+
+        task = asyncio.create_task(game._request_action("SEER", [seer.id], {}, timeout=30))
+        while game.state.pending.step != "SEER":
+            await asyncio.sleep(0)
+        start = time.perf_counter()
+        await game.submit_action(seer.id, "SEER", {"target": target})
+        await asyncio.wait_for(task, 1.0)
+
+        assert time.perf_counter() - start < 0.2
+
+    @pytest.mark.asyncio
+    async def test_action_request_ends_at_deadline(self):
+        """Without submissions the step should end at its deadline."""
+        game = await make_game()
+        seer = [p for p in game.players.values() if p.role == Role.SEER][0]
+
+        start = time.perf_counter()
+        await asyncio.wait_for(game._request_action("SEER", [seer.id], {}, timeout=0.1), 1.0)
+
+        assert 0.05 < time.perf_counter() - start < 0.5
+
+
+class TestVoteWakeup:
+    """The vote should close as soon as everyone voted."""
+
+    @pytest.mark.asyncio
+    async def test_vote_phase_closes_on_last_vote(self):
+        """The vote phase should resolve right after the last vote."""
+        game = await make_game()
+        game.T_VOTE = 30
+        game.T_RESULT = 0
+        ids = list(game.players)
+
+        task = asyncio.create_task(game._vote_phase())
+        await wait_for_phase(game, Phase.VOTE)
+        while game.state.vote_box.deadline == 0.0:
+            await asyncio.sleep(0)
+        for voter in ids:
+            await game.cast_vote(voter, ids[0] if voter != ids[0] else ids[1])
+        await asyncio.wait_for(task, 1.0)
+
+        assert not game.players[ids[0]].alive
+
+
+class TestDiscussionWakeup:
+    """Discussion should end as soon as everyone is ready."""
+
+    @pytest.mark.asyncio
+    async def test_ready_ends_discussion(self):
+        """Marking all players ready should end the countdown immediately."""
+        game = await make_game()
+        game.state.phase = Phase.DAY
+
+        task = asyncio.create_task(game._countdown_with_ready_check(30, Phase.DAY, "Discussion"))
+        await asyncio.sleep(0)
+        game.state.ready_to_vote.update(game.players)
+        game.state.ready_event.set()
+        await asyncio.wait_for(task, 1.0)
+
+
+class TestClockSync:
+    """Countdowns are rendered client-side; the server only pushes real changes."""
+
+    @pytest.mark.asyncio
+    async def test_no_per_second_traffic_while_waiting(self):
+        """An idle night step should not push anything until it ends."""
+        game = await make_game()
+        seer = [p for p in game.players.values() if p.role == Role.SEER][0]
+        ws = FakeWebSocket()
+        attach_client(game, ws, player_id=seer.id)
+
+        task = asyncio.create_task(game._request_action("SEER", [seer.id], {}, timeout=1.3))
+        await asyncio.sleep(0.1)
+        ws.sent.clear()
+        await asyncio.sleep(1.0)
+
+        assert ws.sent == []
+        await task
+
+    def test_pong_echoes_client_time(self):
+        """PONG should echo t0 and carry the server clock."""
+        with TestClient(app) as tc:
+            with tc.websocket_connect("/ws?client=tv") as ws:
+                hello = ws.receive_json()
+                assert "server_time" in hello
+                ws.receive_json()  # PUBLIC_STATE
+                before = time.time()
+                ws.send_json({"type": "PING", "t0": 123.5})
+                pong = ws.receive_json()
+
+        assert pong["type"] == "PONG"
+        assert pong["t0"] == 123.5
+        assert pong["server_time"] >= before - 1
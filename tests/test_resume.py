@@ -0,0 +1,95 @@
+"""Tests for sequence numbers and ?since= resume."""
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+from server import Game, ReplayRing, app
+from conftest import FakeWebSocket, attach_client, drain
+
+
+class TestReplayRing:
+    """Test the bounded replay buffer."""
+
+    def test_after_returns_newer_entries(self):
+        """Entries newer than the given seq should be returned in order."""
+        ring = ReplayRing(limit=4)
+        for seq in (2, 5, 7):
+            ring.add(seq, {"seq": seq})
+
+        assert [s for s, _ in ring.after(4)] == [5, 7]
+
+    def test_eviction_makes_gap_unrecoverable(self):
+        """Asking for messages older than what was evicted should return None."""
+        ring = ReplayRing(limit=2)
+        for seq in (1, 2, 3):
+            ring.add(seq, {"seq": seq})
+
+        assert ring.after(0) is None
+        assert [s for s, _ in ring.after(1)] == [2, 3]
+
+
+class TestResume:
+    """Test what a reconnecting client gets back."""
+
+    @pytest.mark.asyncio
+    async def test_messages_are_stamped(self):
+        """Event messages should carry increasing seq numbers."""
+        game = Game()
+        ws = FakeWebSocket()
+        attach_client(game, ws)
+
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "a"})
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "b"})
+        await drain(game)
+
+        assert [m["seq"] for m in ws.messages()] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_private_message_kept_while_disconnected(self):
+        """A SEER_RESULT sent while the phone is away should be replayed on resume."""
+        game = Game()
+        pid = (await game.join("Alice"))["player_id"]
+        other = (await game.join("Bob"))["player_id"]
+        since = game._seq
+
+        await game._send_private(pid, {"type": "SEER_RESULT", "target_id": other})
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "Le jour se lève."})
+        await game._send_private(other, {"type": "SEER_RESULT", "target_id": pid})
+
+        missed = game._missed_messages(pid, since)
+        assert [m["type"] for m in missed] == ["SEER_RESULT", "NARRATOR_LINE"]
+        assert missed[0]["target_id"] == other
+
+    @pytest.mark.asyncio
+    async def test_only_latest_coalesced_message_replayed(self):
+        """Stale status messages should be collapsed to the newest copy."""
+        game = Game()
+        await game._broadcast_public({"type": "VOTE_STATUS", "votes": 1})
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "x"})
+        await game._broadcast_public({"type": "VOTE_STATUS", "votes": 2})
+
+        missed = game._missed_messages(None, 0)
+        assert [(m["type"], m.get("votes")) for m in missed] == [("NARRATOR_LINE", None), ("VOTE_STATUS", 2)]
+
+    @pytest.mark.asyncio
+    async def test_unrecoverable_resume(self):
+        """Gaps past the ring, or a seq from before a restart, should fall back to full state."""
+        game = Game()
+        game._public_ring = ReplayRing(limit=2)
+        for i in range(3):
+            await game._broadcast_public({"type": "NARRATOR_LINE", "line": str(i)})
+
+        assert game._missed_messages(None, 0) is None
+        assert game._missed_messages(None, 99) is None
+        assert len(game._missed_messages(None, 1)) == 2
+
+    def test_hello_reports_resume(self):
+        """HELLO should carry the current seq and whether the resume succeeded."""
+        with TestClient(app) as tc:
+            with tc.websocket_connect("/ws?client=tv") as ws:
+                hello = ws.receive_json()
+            with tc.websocket_connect(f"/ws?client=tv&since={hello['seq'] + 1000}") as ws:
+                stale = ws.receive_json()
+
+        assert hello["resumed"] is False and isinstance(hello["seq"], int)
+        assert stale["resumed"] is False
@@ -0,0 +1,259 @@
+"""Tests for the multi-room GameRegistry."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from server import GAME, ROOMS, Game, GameRegistry, Phase, ShardRing, app
+from conftest import FakeWebSocket, attach_client
+
+
+class TestGameRegistry:
+    """Test room creation, lookup and teardown."""
+
+    def test_default_room_is_given_game(self):
+        """The default room should be the game passed in."""
+        game = Game()
+        registry = GameRegistry(game)
+
+        assert registry.get("main") is game
+        assert registry.get(GameRegistry.DEFAULT_ROOM) is game
+
+    def test_create_generates_unique_codes(self):
+        """Generated codes should be unique and case-insensitive on lookup."""
+        registry = GameRegistry()
+        codes = {registry.create()[0] for _ in range(50)}
+
+        assert len(codes) == 50
+        code = next(iter(codes))
+        assert registry.get(code.lower()) is registry.rooms[code]
+
+    def test_create_rejects_taken_code_and_limit(self):
+        """Taken codes and a full registry should raise ValueError."""
+        registry = GameRegistry(max_rooms=2)
+        registry.create("ABCD")
+
+        with pytest.raises(ValueError):
+            registry.create("abcd")
+        registry.rooms.pop("ABCD")
+        registry.create()
+        with pytest.raises(ValueError):
+            registry.create()
+
+    @pytest.mark.asyncio
+    async def test_create_rejects_unsafe_codes(self, tmp_path):
+        """Custom codes must be short ASCII alphanumerics so they can't escape the hibernate dir."""
+        registry = GameRegistry(hibernate_dir=tmp_path / "rooms")
+        registry.HIBERNATE_AFTER = 0.0
+
+        for code in ("../escape", "a/b", "x" * 17, "ÉTÉ", "AB CD"):
+            with pytest.raises(ValueError):
+                registry.create(code)
+        assert set(registry.rooms) == {GameRegistry.DEFAULT_ROOM}
+
+        registry.create(" room42 ")
+        await registry.sweep()
+        assert [f.name for f in tmp_path.rglob("*.json")] == ["ROOM42.json"]
+        assert (tmp_path / "rooms" / "ROOM42.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_close_stops_room(self):
+        """Closing a room should cancel its runner and disconnect its clients."""
+        registry = GameRegistry()
+        code, game = registry.create()
+        for i in range(5):
+            await game.join(f"P{i}")
+        ws = FakeWebSocket()
+        attach_client(game, ws)
+        await game.start()
+
+        await registry.close(code)
+        await asyncio.sleep(0)
+
+        assert registry.get(code) is None
+        assert game._runner_task.cancelled()
+        assert not game._clients
+        assert ws.closed
+
+    @pytest.mark.asyncio
+    async def test_default_room_cannot_be_closed(self):
+        """Tearing down the default room should be refused."""
+        registry = GameRegistry()
+
+        with pytest.raises(ValueError):
+            await registry.close("main")
+
+    @pytest.mark.asyncio
+    async def test_rooms_are_isolated(self):
+        """Players and phases of one room should not leak into another."""
+        registry = GameRegistry()
+        _, a = registry.create()
+        _, b = registry.create()
+        for i in range(5):
+            await a.join(f"P{i}")
+        await a.start()
+
+        assert b.players == {}
+        assert b.state.phase == Phase.LOBBY
+        assert a._lock is not b._lock
+        await a.close()
+
+
+class TestHibernation:
+    """Test idle rooms being written to disk and restored on demand."""
+
+    @pytest.mark.asyncio
+    async def test_idle_lobby_roundtrip(self, tmp_path):
+        """An idle lobby should leave memory and come back intact on the next lookup."""
+        registry = GameRegistry(hibernate_dir=tmp_path)
+        registry.HIBERNATE_AFTER = 0.0
+        code, game = registry.create()
+        alice = (await game.join("Alice"))["player_id"]
+        game.T_VOTE = 40
+
+        await registry.sweep()
+
+        assert code not in registry.rooms
+        assert (tmp_path / f"{code}.json").exists()
+        assert {"room": code, "hibernated": True} in registry.list()
+
+        restored = registry.get(code.lower())
+        assert restored is not game
+        assert restored.players[alice].name == "Alice"
+        assert restored.T_VOTE == 40
+        assert not (tmp_path / f"{code}.json").exists()
+        assert registry.stats == {"hibernated": 1, "rehydrated": 1}
+
+    @pytest.mark.asyncio
+    async def test_game_over_keeps_roles_potions_and_lovers(self, tmp_path):
+        """Finished games should restore roles, witch potions, lovers and the winner."""
+        registry = GameRegistry(hibernate_dir=tmp_path)
+        registry.HIBERNATE_AFTER = 0.0
+        code, game = registry.create()
+        ids = [(await game.join(f"P{i}"))["player_id"] for i in range(5)]
+        game._assign_roles()
+        a, b = ids[0], ids[1]
+        game.players[a].lover_id, game.players[b].lover_id = b, a
+        game.players[a].witch_poison_used = True
+        game.players[b].alive = False
+        game.state.phase = Phase.GAME_OVER
+        game.state.winner = "villagers"
+        game.state.narrator.append("Fin.")
+        roles = {pid: p.role for pid, p in game.players.items()}
+
+        await registry.sweep()
+        restored = registry.get(code)
+
+        assert {pid: p.role for pid, p in restored.players.items()} == roles
+        assert restored.players[a].lover_id == b and restored.players[b].lover_id == a
+        assert restored.players[a].witch_poison_used is True
+        assert restored.players[b].alive is False
+        assert restored.state.phase == Phase.GAME_OVER
+        assert restored.state.winner == "villagers"
+        assert restored.state.narrator[-1] == "Fin."
+
+    @pytest.mark.asyncio
+    async def test_resume_from_before_hibernation_resyncs(self, tmp_path):
+        """A ?since= older than the hibernation can't be replayed and should ask for a full resync."""
+        registry = GameRegistry(hibernate_dir=tmp_path)
+        registry.HIBERNATE_AFTER = 0.0
+        code, game = registry.create()
+        alice = (await game.join("Alice"))["player_id"]
+        since = game._seq
+        for name in ("Bob", "Carol"):
+            await game.join(name)
+        await game._send_private(alice, {"type": "SEER_RESULT", "target_id": alice})
+        seq = game._seq
+
+        await registry.sweep()
+        restored = registry.get(code)
+
+        assert restored._seq == seq
+        assert restored._missed_messages(alice, since) is None
+        assert restored._missed_messages(None, since) is None
+        assert restored._missed_messages(alice, seq) == []
+
+    @pytest.mark.asyncio
+    async def test_busy_rooms_stay_resident(self, tmp_path):
+        """Rooms with clients, running games and the default room should not hibernate."""
+        registry = GameRegistry(hibernate_dir=tmp_path)
+        registry.HIBERNATE_AFTER = 0.0
+        connected, game = registry.create()
+        attach_client(game, FakeWebSocket())
+        running, other = registry.create()
+        other.state.phase = Phase.NIGHT
+
+        await registry.sweep()
+
+        assert set(registry.rooms) == {GameRegistry.DEFAULT_ROOM, connected, running}
+        await game.close()
+
+    @pytest.mark.asyncio
+    async def test_memory_is_measurable(self):
+        """A room's measured size should grow with its players."""
+        game = Game()
+        empty = game.memory_bytes()
+        for i in range(20):
+            await game.join(f"P{i}")
+
+        assert game.memory_bytes() > empty > 0
+
+
+class TestShardRing:
+    """Test consistent hashing of rooms onto shards."""
+
+    def test_single_shard_owns_everything(self):
+        """Without sharding every room should be local."""
+        ring = ShardRing()
+
+        assert ring.owner("ABCD") == 0
+        assert ring.is_local("anything")
+
+    def test_rooms_spread_and_are_case_insensitive(self):
+        """Rooms should spread over all shards and map the same whatever the case."""
+        ring = ShardRing(4)
+        codes = [f"R{i:03d}" for i in range(400)]
+        owners = [ring.owner(c) for c in codes]
+
+        assert set(owners) == {0, 1, 2, 3}
+        assert min(owners.count(i) for i in range(4)) > 40
+        assert ring.owner("abcd") == ring.owner("ABCD")
+
+    def test_adding_a_shard_moves_few_rooms(self):
+        """Growing from 4 to 5 shards should move only a fraction of rooms."""
+        before, after = ShardRing(4), ShardRing(5)
+        codes = [f"R{i:03d}" for i in range(1000)]
+        moved = sum(before.owner(c) != after.owner(c) for c in codes)
+
+        assert moved < 400
+
+    def test_registry_generates_local_codes(self):
+        """Generated room codes should belong to the creating shard."""
+        ring = ShardRing(3, index=1)
+        registry = GameRegistry(owns=ring.is_local)
+
+        assert all(ring.owner(registry.create()[0]) == 1 for _ in range(20))
+
+
+class TestRoomRoutes:
+    """Test room-scoped HTTP and WebSocket routes."""
+
+    def test_scoped_routes(self):
+        """/api/rooms/{room}/... and ?room= should both target the room."""
+        with TestClient(app) as tc:
+            code = tc.post("/api/rooms").json()["room"]
+            tc.post(f"/api/rooms/{code}/join", json={"name": "Alice"})
+            tc.post(f"/api/join?room={code}", json={"name": "Bob"})
+
+            listed = {r["room"]: r for r in tc.get("/api/rooms").json()["rooms"]}
+            assert listed[code]["players"] == 2
+            assert all(p.name not in ("Alice", "Bob") for p in GAME.players.values())
+
+            with tc.websocket_connect(f"/ws?client=tv&room={code}") as ws:
+                ws.receive_json()  # HELLO
+                assert len(ws.receive_json()["data"]["alive"]) == 2
+
+            assert tc.delete(f"/api/rooms/{code}").json() == {"ok": True}
+            assert tc.get(f"/api/rooms/{code}/health").status_code == 404
+            assert ROOMS.get(code) is None
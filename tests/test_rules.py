@@ -0,0 +1,143 @@
+"""Tests for the pure rules engine."""
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+
+import pytest
+import rules
+from rules import Died, Role, Seat, Table, VictimChosen
+from server import Game, Player
+
+
+def table_of(*roles: Role, **state) -> Table:
+    return Table(seats=tuple(Seat(id=f"p{i}", role=r) for i, r in enumerate(roles)), **state)
+
+
+def play(seed: int, players: int = 8) -> tuple:
+    """Run a whole game with random inputs, no asyncio; returns (winner, nights, days)."""
+    rng = random.Random(seed)
+    table = rules.deal([f"p{i}" for i in range(players)], rng)
+    while rules.winner(table) is None:
+        table = rules.begin_night(table)
+        ids = [s.id for s in table.alive()]
+        table, _ = rules.wolves_choose(table, {w.id: rng.choice(ids) for w in table.by_role(Role.WEREWOLF)}, rng)
+        for witch in table.by_role(Role.WITCH):
+            table, _ = rules.witch_decide(table, witch.id, rng.random() < 0.3, rng.choice(ids + [None] * 4))
+        table, _ = rules.resolve_night(table)
+        if rules.winner(table):
+            break
+        table = rules.begin_day(table)
+        ids = [s.id for s in table.alive()]
+        table, _ = rules.resolve_vote(table, {pid: rng.choice(ids) for pid in ids}, rng)
+    return rules.winner(table), table.night_count, table.day_count
+
+
+class TestDeal:
+    """Dealing roles from a seeded RNG."""
+
+    def test_same_seed_same_roles(self):
+        """The same seed should deal the same roles to the same seats."""
+        ids = [f"p{i}" for i in range(9)]
+        assert rules.deal(ids, random.Random(7)) == rules.deal(ids, random.Random(7))
+
+    def test_role_counts(self):
+        """A deal should hold the wolf count for the table size and each enabled special once."""
+        table = rules.deal([f"p{i}" for i in range(8)], random.Random(1), cupid=False)
+        roles = [s.role for s in table.seats]
+
+        assert roles.count(Role.WEREWOLF) == 2
+        assert roles.count(Role.SEER) == roles.count(Role.WITCH) == 1
+        assert Role.CUPID not in roles
+        assert [s.id for s in table.seats] == [f"p{i}" for i in range(8)]
+
+
+class TestNight:
+    """Night steps return a new table plus what happened."""
+
+    def test_wolves_majority(self):
+        """The target with most valid wolf votes should be the victim."""
+        table = table_of(Role.WEREWOLF, Role.WEREWOLF, Role.VILLAGER, Role.SEER, Role.WITCH)
+
+        table, events = rules.wolves_choose(table, {"p0": "p3", "p1": "p3"}, random.Random(0))
+
+        assert table.wolves_victim == "p3"
+        assert events == [VictimChosen("p3", forced=False)]
+
+    def test_wolves_forced_kill(self):
+        """With no valid vote the wolves should still kill a random non-wolf."""
+        table = table_of(Role.WEREWOLF, Role.VILLAGER, Role.VILLAGER)
+
+        table, events = rules.wolves_choose(table, {"p0": "p0"}, random.Random(0))
+
+        assert table.wolves_victim in ("p1", "p2")
+        assert events[0].forced
+
+    def test_heal_saves_victim(self):
+        """A healed victim should survive the night."""
+        table = table_of(Role.WEREWOLF, Role.VILLAGER, Role.WITCH, wolves_victim="p1")
+        table, _ = rules.witch_decide(table, "p2", True, None)
+
+        table, deaths = rules.resolve_night(table)
+
+        assert deaths == []
+        assert table.seat("p1").alive
+        assert table.seat("p2").witch_heal_used
+
+    def test_lover_dies_of_grief(self):
+        """The lover of a night victim should die of grief right after."""
+        table, _ = rules.link_lovers(table_of(Role.WEREWOLF, Role.VILLAGER, Role.SEER), ["p1", "p2"])
+        table = replace(rules.begin_night(table), wolves_victim="p1")
+
+        table, deaths = rules.resolve_night(table)
+
+        assert deaths == [Died("p1", Role.VILLAGER, "night"), Died("p2", Role.SEER, "grief", lover_of="p1")]
+        assert rules.winner(table) == "werewolves"
+
+    def test_input_table_unchanged(self):
+        """Steps should never mutate the table they were given."""
+        table = table_of(Role.WEREWOLF, Role.VILLAGER, Role.WITCH, wolves_victim="p1")
+
+        rules.resolve_night(table)
+
+        assert table.seat("p1").alive
+
+
+class TestVoteAndWinner:
+    """Day vote and win conditions."""
+
+    def test_vote_eliminates_most_voted(self):
+        """The most voted living player should be eliminated, ranked first in the tally."""
+        table = table_of(Role.WEREWOLF, Role.VILLAGER, Role.VILLAGER, Role.SEER)
+
+        table, events = rules.resolve_vote(table, {"p1": "p0", "p2": "p0", "p0": "p1"}, random.Random(0))
+
+        assert events[0].eliminated == "p0"
+        assert events[0].tally == (("p0", 2), ("p1", 1))
+        assert rules.winner(table) == "villagers"
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_whole_game_replays_from_seed(self, seed):
+        """A seed and the same inputs should replay the same game, entirely without asyncio."""
+        first = play(seed)
+
+        assert first == play(seed)
+        assert first[0] in ("villagers", "werewolves", "nobody")
+
+
+class TestGameAdapter:
+    """Game delegates rules to the engine."""
+
+    @pytest.mark.asyncio
+    async def test_seeded_game_deals_reproducibly(self):
+        """Two games with the same seed and players should deal identical roles."""
+        deals = []
+        for _ in range(2):
+            game = Game(seed=42)
+            for i in range(8):
+                game.players[f"p{i}"] = Player(id=f"p{i}", name=f"P{i}")
+            game._assign_roles()
+            deals.append({pid: p.role for pid, p in game.players.items()})
+
+        assert deals[0] == deals[1]
+        assert game._table().seat("p0").role == deals[0]["p0"]
@@ -0,0 +1,107 @@
+"""Tests for the shared deadline scheduler."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from server import DeadlineScheduler, Game
+
+
+class TestDeadlineScheduler:
+    """Test the heap-based scheduler on its own."""
+
+    @pytest.mark.asyncio
+    async def test_events_fire_in_deadline_order(self):
+        """Events should be set in deadline order, whatever the registration order."""
+        sched = DeadlineScheduler()
+        fired = []
+        events = {name: asyncio.Event() for name in "abc"}
+        now = time.time()
+        for name, delay in (("c", 0.06), ("a", 0.02), ("b", 0.04)):
+            sched.call_at(now + delay, events[name])
+
+        async def watch(name):
+            await events[name].wait()
+            fired.append(name)
+
+        await asyncio.gather(*(watch(n) for n in events))
+
+        assert fired == ["a", "b", "c"]
+        assert sched.fired == 3
+
+    @pytest.mark.asyncio
+    async def test_cancelled_entry_never_fires(self):
+        """A cancelled deadline should not set its event."""
+        sched = DeadlineScheduler()
+        event = asyncio.Event()
+        sched.cancel(sched.call_at(time.time() + 0.02, event))
+
+        await sched.sleep(0.05)
+
+        assert not event.is_set()
+        assert sched.metrics()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lag_metrics(self):
+        """Each fired deadline should record its lag."""
+        sched = DeadlineScheduler()
+        await asyncio.gather(*(sched.sleep(0.01 * i) for i in range(5)))
+
+        metrics = sched.metrics()
+        assert metrics["fired"] == 5
+        assert 0 <= metrics["lag_ms"]["p50"] <= metrics["lag_ms"]["max"] < 100
+
+    @pytest.mark.asyncio
+    async def test_one_task_for_many_rooms(self):
+        """Many rooms waiting on deadlines should share the scheduler's single task."""
+        sched = DeadlineScheduler()
+        games = [Game() for _ in range(50)]
+        for game in games:
+            game.scheduler = sched
+        deadline = time.time() + 0.05
+
+        before = len(asyncio.all_tasks())
+        waits = [asyncio.create_task(g._wait_for_inputs(asyncio.Event(), deadline, lambda: False)) for g in games]
+        await asyncio.sleep(0)
+        assert len(asyncio.all_tasks()) == before + len(games) + 1
+
+        assert await asyncio.gather(*waits) == [False] * 50
+        assert sched.metrics()["pending"] == 0
+
+    def test_survives_a_new_event_loop(self):
+        """Deadlines should keep firing when the scheduler is reused from a later event loop."""
+        sched = DeadlineScheduler()
+
+        async def nap():
+            await asyncio.wait_for(sched.sleep(0.01), 1.0)
+
+        asyncio.run(nap())
+        asyncio.run(nap())
+        loop = asyncio.new_event_loop()  # Closed without a shutdown, as per-test loops are
+        loop.run_until_complete(nap())
+        loop.close()
+        asyncio.run(nap())
+
+        assert sched.fired == 4
+
+
+class TestPhaseDeadlines:
+    """Phase waits should end on input or on the scheduler's deadline."""
+
+    @pytest.mark.asyncio
+    async def test_vote_deadline_fires_via_scheduler(self):
+        """A vote with no ballots should end when its deadline passes."""
+        game = Game()
+        for i in range(5):
+            await game.join(f"P{i}")
+        game._assign_roles()
+        game.state.started = True
+        game.T_VOTE = 0.05
+        game.T_RESULT = 0.01
+        fired = game.scheduler.fired
+
+        await asyncio.wait_for(game._vote_phase(), 1.0)
+
+        assert game.state.vote_box.votes == {}
+        assert game.scheduler.fired > fired
@@ -0,0 +1,49 @@
+"""Tests for the headless game simulator."""
+from __future__ import annotations
+
+import random
+
+import pytest
+import sim
+
+
+class TestPlayGame:
+    """Single headless games."""
+
+    @pytest.mark.parametrize("policy", sorted(sim.POLICIES))
+    @pytest.mark.parametrize("config", sim.ALL_CONFIGS)
+    def test_game_ends_with_a_winner(self, config, policy):
+        """Every role configuration and policy should reach a decided game."""
+        rng = random.Random(3)
+        for n in (5, 9, 16):
+            result = sim.play_game(n, config, rng, policy)
+            assert result.winner in ("villagers", "werewolves", "nobody")
+            assert 1 <= result.nights <= sim.MAX_DAYS + 1
+
+
+class TestSimulate:
+    """Chunked runs across processes."""
+
+    def test_pool_matches_serial_run(self):
+        """Totals should depend only on the seed and chunk size, not on the worker count."""
+        serial = sim.simulate(60, [6, 8], seed=5, workers=1, chunk=25)
+        pooled = sim.simulate(60, [6, 8], seed=5, workers=2, chunk=25)
+
+        assert serial == pooled
+        assert serial[(6, sim.DEFAULT_CONFIG)]["games"] == 60
+
+    def test_no_games_gives_empty_tally(self):
+        """Zero or negative game counts should return an empty tally, with or without a pool."""
+        for workers in (1, 2):
+            assert sim.simulate(0, [6], workers=workers) == {}
+            assert sim.simulate(-5, [6], workers=workers) == {}
+
+    def test_win_rates_rows(self):
+        """Each row should cover one player count and config, with rates summing to one."""
+        tally = sim.simulate(40, [7], sim.ALL_CONFIGS[:2], seed=1, workers=1)
+
+        rows = list(sim.win_rates(tally))
+
+        assert [(r["players"], r["use_cupid"]) for r in rows] == [(7, True), (7, False)]
+        for r in rows:
+            assert r["villagers"] + r["werewolves"] + r["nobody"] == pytest.approx(1.0)
@@ -0,0 +1,61 @@
+"""Tests for the NumPy batch simulator."""
+from __future__ import annotations
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import sim  # noqa: E402
+import sim_batch  # noqa: E402
+
+
+class TestBallots:
+    """Vectorized random votes."""
+
+    def test_votes_are_eligible_and_never_for_self(self):
+        """Every voter should cast exactly one vote, for an eligible seat other than their own."""
+        rng = np.random.default_rng(0)
+        voters = rng.random((500, 9)) < 0.7
+        targets = voters.copy()
+        targets[:, 0] = False
+
+        votes = sim_batch.random_ballots(voters, targets, rng)
+
+        assert not (votes[~targets] > 0).any()
+        options = targets.sum(axis=1, keepdims=True) - targets
+        assert (votes.sum(axis=1) == (voters & (options > 0)).sum(axis=1)).all()
+        solo = np.eye(9, dtype=bool)[[3] * 500]
+        assert (sim_batch.random_ballots(solo, solo, rng) == 0).all()
+
+    def test_deal_matches_rules_role_counts(self):
+        """Each dealt game should hold the role multiset rules.deal uses."""
+        roles = sim_batch.deal(100, 8, (True, False, True), np.random.default_rng(1))
+
+        assert ((roles == sim_batch.WEREWOLF).sum(axis=1) == 2).all()
+        assert ((roles == sim_batch.SEER).sum(axis=1) == 1).all()
+        assert not (roles == sim_batch.WITCH).any()
+
+
+class TestEquivalence:
+    """Batch results should agree statistically with the scalar rules."""
+
+    @pytest.mark.parametrize("policy", sorted(sim.POLICIES))
+    @pytest.mark.parametrize("config", [sim.DEFAULT_CONFIG, (False, False, False), (True, True, False)])
+    def test_win_rate_matches_scalar(self, config, policy):
+        """Village win rate and game length should be within a few standard errors of sim.play_game."""
+        scalar = next(sim.win_rates(sim.simulate(1500, [7], [config], seed=2, policy=policy, workers=1)))
+        batch = next(sim.win_rates(sim_batch.simulate(30000, [7], [config], seed=2, policy=policy)))
+
+        p = scalar["villagers"]
+        se = math.sqrt(p * (1 - p) / 1500 + p * (1 - p) / 30000)
+        assert abs(batch["villagers"] - p) < 4 * se
+        assert batch["avg_nights"] == pytest.approx(scalar["avg_nights"], abs=0.1)
+
+    def test_same_seed_same_tally(self):
+        """A seed should reproduce the batch tally exactly."""
+        first = sim_batch.simulate(2000, [6, 9], sim.ALL_CONFIGS[:2], seed=4)
+
+        assert first == sim_batch.simulate(2000, [6, 9], sim.ALL_CONFIGS[:2], seed=4)
+        assert first[(9, sim.ALL_CONFIGS[1])]["games"] == 2000
@@ -0,0 +1,114 @@
+"""Tests for the read-only spectator feed (/api/stream, /api/state)."""
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from server import Game, SpectatorFeed, _spectator_stream, app
+
+
+def events(chunk: bytes) -> list:
+    """Decode the data lines of an SSE chunk."""
+    return [json.loads(line[6:]) for line in chunk.decode().splitlines() if line.startswith("data: ")]
+
+
+class TestSpectatorFeed:
+    """Test the shared pre-encoded buffer."""
+
+    def test_after_returns_newer_events(self):
+        """Events after an id should come back as one SSE chunk."""
+        feed = SpectatorFeed()
+        feed.publish('{"n":1}')
+        feed.publish('{"n":2}')
+
+        assert feed.after(1) == b'id: 2\ndata: {"n":2}\n\n'
+        assert feed.after(2) == b""
+
+    def test_dropped_events_are_detected(self):
+        """Asking for events older than the buffer should return None."""
+        feed = SpectatorFeed(limit=2)
+        for n in range(4):
+            feed.publish(str(n))
+
+        assert feed.after(0) is None
+        assert feed.after(5) is None
+        assert feed.after(2) is not None
+
+
+class TestSpectatorStream:
+    """Test the SSE body generator."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_stream_then_live_events(self):
+        """A new reader should get HELLO and full state, then public messages as they happen."""
+        game = Game()
+        await game.join("Alice")
+        stream = _spectator_stream(game, None)
+
+        first = events(await anext(stream))
+        assert [m["type"] for m in first] == ["HELLO", "PUBLIC_STATE"]
+
+        nxt = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "Bonsoir."})
+        assert events(await nxt)[0]["line"] == "Bonsoir."
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_resume_from_last_event_id(self):
+        """A reconnect with Last-Event-ID should get only the missed events."""
+        game = Game()
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "a"})
+        seen = game._feed.last_id
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "b"})
+        stream = _spectator_stream(game, seen)
+
+        assert [m["line"] for m in events(await anext(stream))] == ["b"]
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_readers_share_encoded_bytes(self):
+        """All readers should be served the very same buffered bytes."""
+        game = Game()
+        seen = game._feed.last_id
+        await game._broadcast_public({"type": "NARRATOR_LINE", "line": "x"})
+        a, b = _spectator_stream(game, seen), _spectator_stream(game, seen)
+
+        assert await anext(a) == await anext(b)
+        await a.aclose()
+        await b.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stream_ends_when_room_closes(self):
+        """A stream waiting on a room that is closed (or hibernated) should end instead of keeping alive."""
+        game = Game()
+        game.STREAM_KEEPALIVE = 0.01
+        stream = _spectator_stream(game, None)
+        await anext(stream)
+        assert await anext(stream) == b": keepalive\n\n"
+
+        game.STREAM_KEEPALIVE = 60.0
+        nxt = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        await game.close()
+
+        with pytest.raises(StopAsyncIteration):
+            await asyncio.wait_for(nxt, 1.0)
+
+
+class TestStateLongPoll:
+    """Test the ETag long-poll fallback."""
+
+    def test_etag_and_not_modified(self):
+        """A matching If-None-Match should get 304 once the wait runs out."""
+        with TestClient(app) as tc:
+            first = tc.get("/api/state")
+            assert first.status_code == 200
+            assert first.json()["type"] == "PUBLIC_STATE"
+            etag = first.headers["etag"]
+
+            again = tc.get("/api/state?wait=0", headers={"If-None-Match": etag})
+            assert again.status_code == 304
+            assert again.headers["etag"] == etag
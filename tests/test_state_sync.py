@@ -0,0 +1,251 @@
+"""Tests for versioned PUBLIC_STATE synchronisation."""
+from __future__ import annotations
+
+import copy
+
+import pytest
+from server import Game, Phase, Role, json_diff, json_patch
+from conftest import FakeWebSocket, attach_client, drain, kill_player
+
+
+class TestJsonDiff:
+    """Test the JSON-patch style diff helpers."""
+
+    def test_no_change_gives_no_ops(self):
+        """Identical documents should produce no ops."""
+        doc = {"a": 1, "b": {"c": [1, 2]}}
+        assert json_diff(doc, copy.deepcopy(doc)) == []
+
+    def test_nested_scalar_change_is_small(self):
+        """Changing one nested value should produce a single replace op."""
+        old = {"phase": "DAY", "timers": {"seconds_left": 10, "phase_ends_at": 5.0}}
+        new = {"phase": "DAY", "timers": {"seconds_left": 9, "phase_ends_at": 5.0}}
+        assert json_diff(old, new) == [{"op": "replace", "path": "/timers/seconds_left", "value": 9}]
+
+    def test_patch_roundtrip(self):
+        """Applying the diff to the old document should yield the new one."""
+        old = {"a": 1, "gone": True, "list": [1, 2], "sub": {"x": None}}
+        new = {"a": 2, "list": [1, 2, 3], "sub": {"x": "y", "z/~": 0}, "added": {"k": 1}}
+        ops = json_diff(old, new)
+        assert json_patch(copy.deepcopy(old), ops) == new
+
+
+class TestPublicVersioning:
+    """Test the monotonically increasing public state version."""
+
+    @pytest.mark.asyncio
+    async def test_version_only_bumps_on_change(self):
+        """Syncing twice without a state change should not bump the version."""
+        game = Game()
+        await game.join("Alice")
+        v1 = game._public_version
+
+        await game._sync_all()
+
+        assert game._public_version == v1
+
+    @pytest.mark.asyncio
+    async def test_delta_client_gets_patch(self):
+        """Delta clients should get PUBLIC_PATCH, others full PUBLIC_STATE."""
+        game = Game()
+        await game.join("Alice")
+        delta_ws, full_ws = FakeWebSocket(), FakeWebSocket()
+        attach_client(game, delta_ws).delta = True
+        attach_client(game, full_ws)
+        view = game._public_view()
+
+        game.state.timers.seconds_left = 42
+        await game._sync_all()
+        await drain(game)
+
+        patch = [m for m in delta_ws.messages() if m["type"].startswith("PUBLIC")][-1]
+        full = [m for m in full_ws.messages() if m["type"].startswith("PUBLIC")][-1]
+        assert patch["type"] == "PUBLIC_PATCH"
+        assert patch["base"] == view["version"]
+        assert patch["version"] == view["version"] + 1
+        assert patch["ops"] == [{"op": "replace", "path": "/timers/seconds_left", "value": 42}]
+        assert full["type"] == "PUBLIC_STATE"
+        assert full["version"] == patch["version"]
+
+    @pytest.mark.asyncio
+    async def test_delta_phone_tick_is_patch_only(self):
+        """A timer-only tick should send a delta phone the patch and no PRIVATE_STATE."""
+        game = Game()
+        for i in range(12):
+            await game.join(f"P{i}")
+        game._assign_roles()
+        phones = {}
+        for pid in game.players:
+            ws = phones[pid] = FakeWebSocket()
+            attach_client(game, ws, player_id=pid).delta = True
+        await game._sync_all()
+        await drain(game)
+        first = {pid: ws.messages() for pid, ws in phones.items()}
+        for ws in phones.values():
+            ws.sent.clear()
+
+        game.state.timers.seconds_left = 7
+        await game._sync_all()
+        await drain(game)
+
+        for pid, ws in phones.items():
+            private = [m["data"] for m in first[pid] if m["type"] == "PRIVATE_STATE"]
+            assert len(private) == 1
+            assert private[0]["me"]["id"] == pid
+            assert not {"alive", "dead", "phase", "timers"} & set(private[0])
+            assert [m["type"] for m in ws.messages()] == ["PUBLIC_PATCH"]
+            assert len(ws.sent[0]) < 150
+
+    @pytest.mark.asyncio
+    async def test_delta_phone_gets_private_changes(self):
+        """A change in the player's own fields should still reach a delta phone."""
+        game = Game()
+        pid = (await game.join("Alice"))["player_id"]
+        ws = FakeWebSocket()
+        attach_client(game, ws, player_id=pid).delta = True
+        await game._sync_all()
+        await drain(game)
+        ws.sent.clear()
+
+        game.players[pid].role = Role.SEER
+        await game._sync_all()
+        await drain(game)
+
+        private = [m["data"] for m in ws.messages() if m["type"] == "PRIVATE_STATE"]
+        assert [p["me"]["role"] for p in private] == ["seer"]
+
+    @pytest.mark.asyncio
+    async def test_patch_rebuilds_full_snapshot(self):
+        """A client applying the patch chain should match the server snapshot."""
+        game = Game()
+        ws = FakeWebSocket()
+        attach_client(game, ws).delta = True
+        await game.join("Alice")
+        doc = copy.deepcopy(game._public_view())["data"]
+        await drain(game)
+        ws.sent.clear()
+
+        await game.join("Bob")
+        await game.join("Chloe")
+        await drain(game)
+
+        for msg in ws.messages():
+            if msg["type"] == "PUBLIC_PATCH":
+                doc = json_patch(doc, msg["ops"])
+        assert [p["name"] for p in doc["alive"]] == ["Alice", "Bob", "Chloe"]
+
+
+class TestSnapshotCache:
+    """Test memoized public snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_calls_share_snapshot(self):
+        """Without a state change the cached snapshot should be returned."""
+        game = Game()
+        await game.join("Alice")
+        hits = game.stats["snapshot_hits"]
+
+        assert game._public_snapshot() is game._public_snapshot()
+        assert game.stats["snapshot_hits"] == hits + 2
+
+    @pytest.mark.asyncio
+    async def test_mutations_invalidate(self):
+        """Joins, deaths, phase and timer changes should all rebuild the snapshot."""
+        game = Game()
+        pid = (await game.join("Alice"))["player_id"]
+        snap = game._public_snapshot()
+
+        await game.join("Bob")
+        assert len(game._public_snapshot()["alive"]) == 2
+
+        kill_player(game, pid)
+        assert [p["name"] for p in game._public_snapshot()["dead"]] == ["Alice"]
+
+        game.state.phase = Phase.DAY
+        assert game._public_snapshot()["phase"] == Phase.DAY
+
+        game.state.timers.phase_ends_at = 123.0
+        assert game._public_snapshot()["timers"]["phase_ends_at"] == 123.0
+        assert snap["phase"] == Phase.LOBBY and len(snap["alive"]) == 1
+
+    @pytest.mark.asyncio
+    async def test_other_rooms_keep_cache(self):
+        """Changes in another game should not invalidate this game's snapshot."""
+        a, b = Game(), Game()
+        await a.join("Alice")
+        await b.join("Bob")
+        snap = a._public_snapshot()
+
+        b.state.timers.seconds_left = 3
+        b.state.phase = Phase.DAY
+        next(iter(b.players.values())).alive = False
+
+        assert a._public_snapshot() is snap
+        a.state.timers.seconds_left = 3
+        assert a._public_snapshot() is not snap
+
+    @pytest.mark.asyncio
+    async def test_private_view_does_not_leak_into_cache(self):
+        """Per-player sections should be added to a copy, never to the shared snapshot."""
+        game = Game()
+        pid = (await game.join("Alice"))["player_id"]
+
+        private = game._private_snapshot(pid)
+
+        assert private["me"]["id"] == pid
+        assert "me" not in game._public_snapshot()
+
+    @pytest.mark.asyncio
+    async def test_publish_skips_unchanged_state(self):
+        """Publishing twice without a change should not diff or bump the version."""
+        game = Game()
+        pid = (await game.join("Alice"))["player_id"]
+        ws = FakeWebSocket()
+        attach_client(game, ws)
+
+        kill_player(game, pid)
+        await game._publish_public()
+        version = game._public_version
+        await game._publish_public()
+        await drain(game)
+
+        assert game._public_version == version
+        assert len(ws.messages()) == 1
+
+
+class TestPrivateVisibility:
+    """Test private views built once per visibility class."""
+
+    @pytest.mark.asyncio
+    async def test_one_shared_section_per_class(self):
+        """A sync should build the shared section once per (role, alive) pair, not per player."""
+        game = Game()
+        ids = [(await game.join(f"P{i}"))["player_id"] for i in range(10)]
+        game._assign_roles()
+        for pid in ids:
+            attach_client(game, FakeWebSocket(), player_id=pid)
+        built = []
+        original = game._shared_private
+        game._shared_private = lambda role, alive: built.append((role, alive)) or original(role, alive)
+
+        await game._sync_all()
+
+        classes = {(p.role, p.alive) for p in game.players.values()}
+        assert sorted(built, key=str) == sorted(classes, key=str)
+        assert len(built) < len(ids)
+
+    @pytest.mark.asyncio
+    async def test_per_player_fields_stay_separate(self):
+        """Players sharing a class should still get their own me block."""
+        game = Game()
+        ids = [(await game.join(f"P{i}"))["player_id"] for i in range(10)]
+        game._assign_roles()
+        wolves = [p.id for p in game.players.values() if p.role == Role.WEREWOLF]
+        shared: dict = {}
+
+        views = [game._private_snapshot(pid, shared) for pid in wolves]
+
+        assert [v["me"]["id"] for v in views] == wolves
+        assert views[0]["wolves_team"] is views[1]["wolves_team"]
+        villager = next(p.id for p in game.players.values() if p.role == Role.VILLAGER)
+        assert "wolves_team" not in game._private_snapshot(villager, shared)
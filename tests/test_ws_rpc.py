@@ -0,0 +1,76 @@
+"""Tests for in-band WebSocket commands (ACTION, VOTE, READY)."""
+from __future__ import annotations
+
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from server import Phase, app
+from conftest import make_game
+
+
+class TestHandleRpc:
+    """Test Game.handle_rpc dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_vote_uses_connection_identity(self):
+        """A VOTE should count for the socket's player, whatever the message claims."""
+        game = await make_game()
+        voter, target, other = list(game.players)[:3]
+        game.state.phase = Phase.VOTE
+        game.state.vote_box.deadline = time.time() + 5
+
+        result = await game.handle_rpc(voter, {"type": "VOTE", "id": 1, "target_id": target, "voter_id": other})
+
+        assert result == {"ok": True}
+        assert game.state.vote_box.votes == {voter: target}
+
+    @pytest.mark.asyncio
+    async def test_action_reaches_inbox(self):
+        """An ACTION should land in the pending inbox like the HTTP route."""
+        game = await make_game()
+        pid = list(game.players)[0]
+        game.state.pending.step = "SEER"
+        game.state.pending.deadline = time.time() + 5
+
+        await game.handle_rpc(pid, {"type": "ACTION", "step": "SEER", "data": {"target": "x"}})
+
+        assert game.state.pending.received[pid] == {"target": "x"}
+        assert game.state.pending.event.is_set()
+
+    @pytest.mark.asyncio
+    async def test_ready_returns_counts(self):
+        """READY should return the same counts as /api/ready."""
+        game = await make_game()
+        pid = list(game.players)[0]
+        game.state.phase = Phase.DAY
+
+        result = await game.handle_rpc(pid, {"type": "READY"})
+
+        assert result == {"ok": True, "ready_count": 1, "total_alive": 5}
+        assert game.state.ready_event.is_set()
+
+    @pytest.mark.asyncio
+    async def test_rejections(self):
+        """Non-player sockets, missing fields and unknown types should be refused."""
+        game = await make_game()
+        pid = list(game.players)[0]
+
+        assert (await game.handle_rpc(None, {"type": "READY"}))["ok"] is False
+        assert (await game.handle_rpc(pid, {"type": "VOTE"}))["error"] == "Missing target_id"
+        assert (await game.handle_rpc(pid, {"type": "READY"}))["error"] == "Not in discussion phase"
+
+
+class TestWsAck:
+    """Test the ACK round trip over /ws."""
+
+    def test_ack_echoes_request_id(self):
+        """Every command should be answered with an ACK carrying its id."""
+        with TestClient(app) as tc:
+            with tc.websocket_connect("/ws?client=tv") as ws:
+                ws.receive_json()  # HELLO
+                ws.receive_json()  # PUBLIC_STATE
+                ws.send_json({"type": "READY", "id": 42})
+                ack = ws.receive_json()
+
+        assert ack == {"type": "ACK", "id": 42, "ok": False, "error": "Not a player connection"}
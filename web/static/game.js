@@ -206,6 +206,51 @@ function init() {
   let ws = null;
   let currentScreen = null;
   
+  // Last applied PUBLIC_STATE (kept so PUBLIC_PATCH deltas can be applied on top)
+  let publicVersion = 0;
+  let publicData = null;
+
+  // Server clock offset (seconds), estimated from PING/PONG; countdowns are rendered locally from phase_ends_at
+  let clockOffset = 0;
+  let bestRtt = Infinity;
+  let pingTimer = null;
+  
+  function serverNow() {
+    return Date.now() / 1000 + clockOffset;
+  }
+  
+  function sendPing() {
+    if (ws && ws.readyState === WebSocket.OPEN) {
+      ws.send(JSON.stringify({ type: 'PING', t0: Date.now() / 1000 }));
+    }
+  }
+  
+  function handlePong(msg) {
+    if (msg.t0 == null || msg.server_time == null) return;
+    const t1 = Date.now() / 1000;
+    const rtt = t1 - msg.t0;
+    // Keep the sample with the smallest round trip: it has the tightest error bound
+    if (rtt <= bestRtt) {
+      bestRtt = rtt;
+      clockOffset = msg.server_time - (msg.t0 + t1) / 2;
+    }
+  }
+  
+  function startClockSync() {
+    bestRtt = Infinity;
+    sendPing();
+    setTimeout(sendPing, 500);
+    setTimeout(sendPing, 1500);
+    clearInterval(pingTimer);
+    pingTimer = setInterval(sendPing, 30000);
+  }
+  
+  function secondsLeft() {
+    const end = state.timers?.phase_ends_at;
+    if (end == null) return null;
+    return Math.max(0, Math.floor(end - serverNow()));
+  }
+  
   // FX (optional)
   const fx = window.LGFX?.init($('fxCanvas'), { mode: 'night' });
   
@@ -315,13 +360,17 @@ function init() {
   }
   
   // ============ WEBSOCKET ============
+  // Highest seq seen; sent back as ?since= so a reconnect replays only what was missed
+  let lastSeq = 0;
+
   function connectWebSocket() {
     if (!config.playerId) {
       console.log('[LG] No player ID, skipping WS connect');
       return;
     }
     
-    const url = WS_URL + '/ws?client=player&player_id=' + encodeURIComponent(config.playerId);
+    const url = WS_URL + '/ws?client=player&delta=1&batch=1&player_id=' + encodeURIComponent(config.playerId)
+      + (lastSeq ? '&since=' + lastSeq : '');
     console.log('[LG] Connecting WebSocket:', url);
     
     ws = new WebSocket(url);
@@ -329,11 +378,13 @@ function init() {
     ws.onopen = () => {
       console.log('[LG] WebSocket connected');
       setConnected(true);
+      startClockSync();
     };
     
     ws.onclose = () => {
       console.log('[LG] WebSocket closed, reconnecting...');
       setConnected(false);
+      clearInterval(pingTimer);
       setTimeout(connectWebSocket, 1500);
     };
     
@@ -345,19 +396,99 @@ function init() {
     ws.onmessage = (event) => {
       try {
         const msg = JSON.parse(event.data);
-        handleMessage(msg);
+        // BATCH carries every message the server queued for us in one tick
+        for (const m of (msg.type === 'BATCH' ? msg.messages : [msg])) {
+          if (m.type === 'HELLO') lastSeq = m.seq ?? lastSeq;
+          else if (m.seq > lastSeq) lastSeq = m.seq;
+          handleMessage(m);
+        }
       } catch (e) {
         console.error('[LG] Failed to parse message:', e);
       }
     };
   }
   
+  // Apply JSON-patch style ops (replace/add/remove) from the server
+  function applyPatch(doc, ops) {
+    for (const op of ops) {
+      const parts = op.path.split('/').slice(1).map(p => p.replace(/~1/g, '/').replace(/~0/g, '~'));
+      if (parts.length === 0) { doc = op.value; continue; }
+      let parent = doc;
+      for (const part of parts.slice(0, -1)) parent = parent[part];
+      const key = parts[parts.length - 1];
+      if (op.op === 'remove') delete parent[key];
+      else parent[key] = op.value;
+    }
+    return doc;
+  }
+  
+  // ============ RPC ============
+  // Actions, votes and ready go over the open socket and are acked by id; HTTP is the fallback
+  let rpcSeq = 0;
+  const rpcPending = new Map();
+
+  function rpc(type, payload, path, body) {
+    if (ws && ws.readyState === WebSocket.OPEN) {
+      const id = ++rpcSeq;
+      return new Promise((resolve, reject) => {
+        const timer = setTimeout(() => {
+          rpcPending.delete(id);
+          reject(new Error(type + ' not acknowledged'));
+        }, 5000);
+        rpcPending.set(id, (ack) => { clearTimeout(timer); resolve(ack); });
+        ws.send(JSON.stringify({ ...payload, type: type, id: id }));
+      });
+    }
+    return fetch(API_URL + path, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(body)
+    }).then(res => res.json());
+  }
+
   // ============ MESSAGE HANDLING ============
   function handleMessage(msg) {
     console.log('[LG] Message:', msg.type, msg);
     
     switch (msg.type) {
+      case 'HELLO':
+        // First rough estimate until a PONG comes back
+        if (bestRtt === Infinity && msg.server_time) clockOffset = msg.server_time - Date.now() / 1000;
+        break;
+        
+      case 'PONG':
+        handlePong(msg);
+        break;
+        
+      case 'HEARTBEAT':
+        // Any reply keeps the server from reaping this socket as half-open
+        if (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify({ type: 'HEARTBEAT_ACK' }));
+        break;
+        
+      case 'ACK': {
+        const resolve = rpcPending.get(msg.id);
+        if (resolve) {
+          rpcPending.delete(msg.id);
+          resolve(msg);
+        }
+        break;
+      }
+        
+      case 'PUBLIC_PATCH':
+        if (!publicData || msg.base !== publicVersion) {
+          // Missed a version: ask for a full snapshot
+          console.log('[LG] Version gap, resync:', publicVersion, '->', msg.base);
+          if (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify({ type: 'RESYNC' }));
+          break;
+        }
+        publicData = applyPatch(publicData, msg.ops);
+        publicVersion = msg.version;
+        handleMessage({ type: 'PUBLIC_STATE', version: msg.version, data: publicData });
+        break;
+        
       case 'PUBLIC_STATE':
+        publicData = msg.data;
+        publicVersion = msg.version || 0;
         state.phase = msg.data.phase;
         state.alive = msg.data.alive || [];
         state.dead = msg.data.dead || [];
@@ -518,9 +649,9 @@ function init() {
   }
   
   function updateTimers() {
-    // Update various timer displays
-    if (state.timers?.seconds_left != null) {
-      const secs = state.timers.seconds_left;
+    // Update various timer displays (counted down locally from phase_ends_at)
+    const secs = secondsLeft();
+    if (secs != null) {
       
       // Day timer
       const dayTimer = $('dayTimer');
@@ -928,12 +1059,8 @@ function init() {
   async function submitAction(step, data) {
     console.log('[LG] Submitting action:', step, data);
     try {
-      const res = await fetch(API_URL + '/api/action', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ player_id: config.playerId, step: step, data: data })
-      });
-      const result = await res.json();
+      const result = await rpc('ACTION', { step: step, data: data },
+        '/api/action', { player_id: config.playerId, step: step, data: data });
       console.log('[LG] Action result:', result);
     } catch (e) {
       console.error('[LG] Action failed:', e);
@@ -1036,12 +1163,8 @@ function init() {
     }
     
     try {
-      const res = await fetch(API_URL + '/api/vote', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ voter_id: config.playerId, target_id: selectedVoteTarget })
-      });
-      const data = await res.json();
+      const data = await rpc('VOTE', { target_id: selectedVoteTarget },
+        '/api/vote', { voter_id: config.playerId, target_id: selectedVoteTarget });
       console.log('[LG] Vote result:', data);
       
       if (data.ok) {
@@ -1095,12 +1218,7 @@ function init() {
           readyBtn.textContent = 'Envoi...';
           
           try {
-            const res = await fetch(API_URL + '/api/ready', {
-              method: 'POST',
-              headers: { 'Content-Type': 'application/json' },
-              body: JSON.stringify({ player_id: config.playerId })
-            });
-            const data = await res.json();
+            const data = await rpc('READY', {}, '/api/ready', { player_id: config.playerId });
             
             if (data.ok) {
               readyToVote = true;
@@ -1428,5 +1546,8 @@ function init() {
     }
   }
   
+  // Local countdown rendering
+  setInterval(updateTimers, 250);
+  
   console.log('[LG] === INITIALIZATION COMPLETE ===');
 }
\ No newline at end of file
@@ -204,12 +204,7 @@
 
     await bot.sleep(bot.rand(450, 1200));
     try{
-      const r = await fetch(`${API_ORIGIN}/api/vote`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ voter_id: playerId, target_id: t.id })
-      });
-      const j = await r.json();
+      const j = await rpc('VOTE', { target_id: t.id }, '/api/vote', { voter_id: playerId, target_id: t.id });
       if (j.ok) {
         voteStatus.textContent = 'Vote envoyé (bot).';
         fx?.burst({ kind: 'spark', count: 14 });
@@ -255,12 +250,7 @@
 
     await bot.sleep(bot.rand(500, 1400));
     try{
-      const r = await fetch(`${API_ORIGIN}/api/action`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ player_id: playerId, ...payload })
-      });
-      const j = await r.json();
+      const j = await rpc('ACTION', payload, '/api/action', { player_id: playerId, ...payload });
       if (j.ok) fx?.burst({ kind: 'magic', count: 16 });
     }catch{}
   }
@@ -279,8 +269,8 @@
     }
     $('phase').textContent = phase;
 
-    const secs = state.timers?.seconds_left;
-    $('timer').textContent = (secs === null || secs === undefined) ? '—' : `${secs}s`;
+    phaseEndsAt = state.timers?.phase_ends_at ?? null;
+    renderTimer();
     setNightMode(phase === 'NIGHT');
 
     if (phase !== 'NIGHT') { window.__pendingStep = null; window.__pendingDeadline = null; window.__witchCtx = null; }
@@ -410,12 +400,7 @@
     try{
       sfx?.click?.();
       voteStatus.textContent = 'Vote en cours…';
-      const r = await fetch(`${API_ORIGIN}/api/vote`, {
-        method:'POST',
-        headers:{'Content-Type':'application/json'},
-        body: JSON.stringify({ voter_id: playerId, target_id: target })
-      });
-      const j = await r.json();
+      const j = await rpc('VOTE', { target_id: target }, '/api/vote', { voter_id: playerId, target_id: target });
       if (!j.ok) throw new Error(j.error || 'vote failed');
       voteStatus.textContent = 'Vote envoyé.';
       sfx?.confirm?.();
@@ -718,12 +703,7 @@
     if (!payload) return;
     try{
       sfx?.click?.();
-      const r = await fetch(`${API_ORIGIN}/api/action`, {
-        method:'POST',
-        headers:{'Content-Type':'application/json'},
-        body: JSON.stringify({ player_id: playerId, ...payload })
-      });
-      const j = await r.json();
+      const j = await rpc('ACTION', payload, '/api/action', { player_id: playerId, ...payload });
       if (!j.ok) throw new Error(j.error || 'action failed');
       sfx?.confirm?.();
       fx?.burst({ kind:'magic', count: 22 });
@@ -736,65 +716,130 @@
 
   // --- WebSocket
   let ws;
+  // Highest seq seen; sent back as ?since= so a reconnect replays only what was missed
+  let lastSeq = 0;
+
+  // Actions and votes go over the open socket and are acked by id; HTTP is the fallback
+  let rpcSeq = 0;
+  const rpcPending = new Map();
+  function rpc(type, payload, path, body){
+    if (ws && ws.readyState === WebSocket.OPEN){
+      const id = ++rpcSeq;
+      return new Promise((resolve, reject) => {
+        const timer = setTimeout(() => { rpcPending.delete(id); reject(new Error(`${type} not acknowledged`)); }, 5000);
+        rpcPending.set(id, (ack) => { clearTimeout(timer); resolve(ack); });
+        ws.send(JSON.stringify({ ...payload, type, id }));
+      });
+    }
+    return fetch(`${API_ORIGIN}${path}`, {
+      method:'POST',
+      headers:{'Content-Type':'application/json'},
+      body: JSON.stringify(body)
+    }).then(r => r.json());
+  }
+
+  // Countdown rendered locally from phase_ends_at; clock offset estimated from PING/PONG
+  let clockOffset = 0;
+  let bestRtt = Infinity;
+  let phaseEndsAt = null;
+  function sendPing(){
+    if (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify({ type: 'PING', t0: Date.now() / 1000 }));
+  }
+  function onClockMessage(msg){
+    if (msg.type === 'HELLO' && bestRtt === Infinity && msg.server_time){
+      clockOffset = msg.server_time - Date.now() / 1000;
+    } else if (msg.type === 'PONG' && msg.t0 != null && msg.server_time != null){
+      const t1 = Date.now() / 1000;
+      if (t1 - msg.t0 <= bestRtt){
+        bestRtt = t1 - msg.t0;
+        clockOffset = msg.server_time - (msg.t0 + t1) / 2;
+      }
+    }
+  }
+  function renderTimer(){
+    const secs = phaseEndsAt == null ? null : Math.max(0, Math.floor(phaseEndsAt - (Date.now() / 1000 + clockOffset)));
+    $('timer').textContent = secs === null ? '—' : `${secs}s`;
+  }
+  setInterval(renderTimer, 250);
+  setInterval(sendPing, 30000);
   function connect(){
     if (!playerId){ showJoinIfNeeded(); return; }
-    const url = `${WS_ORIGIN}/ws?client=player&player_id=${encodeURIComponent(playerId)}`;
+    const url = `${WS_ORIGIN}/ws?client=player&batch=1&player_id=${encodeURIComponent(playerId)}` + (lastSeq ? `&since=${lastSeq}` : '');
     ws = new WebSocket(url);
 
-    ws.onopen = () => { setDot(true); fx?.burst({ kind:'magic', count: 18 }); };
+    ws.onopen = () => { setDot(true); fx?.burst({ kind:'magic', count: 18 }); bestRtt = Infinity; sendPing(); setTimeout(sendPing, 1000); };
     ws.onclose = () => { setDot(false); setTimeout(connect, 700); };
     ws.onerror = () => { setDot(false); };
 
     ws.onmessage = (ev) => {
       let msg;
       try{ msg = JSON.parse(ev.data); }catch{ return; }
+      for (const m of (msg.type === 'BATCH' ? msg.messages : [msg])){
+        if (m.type === 'HELLO') lastSeq = m.seq ?? lastSeq;
+        else if (m.seq > lastSeq) lastSeq = m.seq;
+        handleMessage(m);
+      }
+    };
+  }
+
+  function handleMessage(msg){
+    onClockMessage(msg);
+    if (msg.type === 'HEARTBEAT'){
+      // Any reply keeps the server from reaping this socket as half-open
+      if (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify({ type: 'HEARTBEAT_ACK' }));
+      return;
+    }
+    if (msg.type === 'ACK'){
+      const resolve = rpcPending.get(msg.id);
+      if (resolve){ rpcPending.delete(msg.id); resolve(msg); }
+      return;
+    }
 
-      if (msg.type === 'PUBLIC_STATE'){
-        applyPublic(msg.data);
-      } else if (msg.type === 'PRIVATE_STATE'){
-        applyPrivate(msg.data);
-      } else if (msg.type === 'NARRATOR_LINE'){
-        appendLog(msg.line);
-      } else if (msg.type === 'SEER_RESULT'){
-        const targetName = msg.target_name || '—';
-        const roleKey = msg.role || null;
-        const roleFr = msg.role_fr || LG.roleLabel(roleKey);
-        const files = LG.cardForRole(roleKey);
-        openModal('La Voyante — Révélation', `
-          <div class="reveal-hero">
-            <div class="muted">${LG.escapeHtml(targetName)} est :</div>
-            <div style="font-size:22px;font-weight:950;margin-top:8px;">${LG.escapeHtml(roleFr)}</div>
-            <div style="margin-top:12px;display:grid;place-items:center;">
-              <div class="reveal-card is-flipped" style="width:min(320px,92%);height:min(320px,92vw);">
-                <div class="reveal-face"><img class="roleImg" src="${LG.CARD_BASE}${LG.VERSO.fallback}" alt="verso" /></div>
-                <div class="reveal-face face-front">
-                  <img id="seerRoleImg" class="roleImg" alt="role" />
-                </div>
+    if (msg.type === 'PUBLIC_STATE'){
+      applyPublic(msg.data);
+    } else if (msg.type === 'PRIVATE_STATE'){
+      applyPrivate(msg.data);
+    } else if (msg.type === 'NARRATOR_LINE'){
+      appendLog(msg.line);
+    } else if (msg.type === 'SEER_RESULT'){
+      const targetName = msg.target_name || '—';
+      const roleKey = msg.role || null;
+      const roleFr = msg.role_fr || LG.roleLabel(roleKey);
+      const files = LG.cardForRole(roleKey);
+      openModal('La Voyante — Révélation', `
+        <div class="reveal-hero">
+          <div class="muted">${LG.escapeHtml(targetName)} est :</div>
+          <div style="font-size:22px;font-weight:950;margin-top:8px;">${LG.escapeHtml(roleFr)}</div>
+          <div style="margin-top:12px;display:grid;place-items:center;">
+            <div class="reveal-card is-flipped" style="width:min(320px,92%);height:min(320px,92vw);">
+              <div class="reveal-face"><img class="roleImg" src="${LG.CARD_BASE}${LG.VERSO.fallback}" alt="verso" /></div>
+              <div class="reveal-face face-front">
+                <img id="seerRoleImg" class="roleImg" alt="role" />
               </div>
             </div>
           </div>
-        `);
-        // set image after insertion
-        setTimeout(() => {
-          const img = document.getElementById('seerRoleImg');
-          if (img) LG.setImgWithFallback(img, files.primary, files.fallback);
-        }, 0);
-      } else if (msg.type === 'ACTION_REQUEST') {
-        window.__pendingStep = msg.step || null;
-        window.__pendingDeadline = msg.deadline || null;
-        // force refresh of action UI if we already have private state
-        if (lastPrivate) updateActionUI(lastPrivate);
-        botMaybeAction(window.__pendingStep, window.__pendingDeadline);
-      } else if (msg.type === 'WITCH_CONTEXT') {
-        window.__witchCtx = { wolves_victim_id: msg.wolves_victim_id, wolves_victim_name: msg.wolves_victim_name };
-        if (lastPrivate) updateActionUI(lastPrivate);
-            } else if (msg.type === 'GAME_OVER'){
-        const w = msg.winner_fr || msg.winner || '—';
-        openModal('Fin de partie', `<div class="reveal-hero"><div style="font-size:22px;font-weight:950;">Victoire : ${LG.escapeHtml(w)}</div></div>`);
-      } else if (msg.type === 'RESET'){
-        logEl.textContent = '';
-        voteStatus.textContent = '';
-      }
-    };
+        </div>
+      `);
+      // set image after insertion
+      setTimeout(() => {
+        const img = document.getElementById('seerRoleImg');
+        if (img) LG.setImgWithFallback(img, files.primary, files.fallback);
+      }, 0);
+    } else if (msg.type === 'ACTION_REQUEST') {
+      window.__pendingStep = msg.step || null;
+      window.__pendingDeadline = msg.deadline || null;
+      // force refresh of action UI if we already have private state
+      if (lastPrivate) updateActionUI(lastPrivate);
+      botMaybeAction(window.__pendingStep, window.__pendingDeadline);
+    } else if (msg.type === 'WITCH_CONTEXT') {
+      window.__witchCtx = { wolves_victim_id: msg.wolves_victim_id, wolves_victim_name: msg.wolves_victim_name };
+      if (lastPrivate) updateActionUI(lastPrivate);
+          } else if (msg.type === 'GAME_OVER'){
+      const w = msg.winner_fr || msg.winner || '—';
+      openModal('Fin de partie', `<div class="reveal-hero"><div style="font-size:22px;font-weight:950;">Victoire : ${LG.escapeHtml(w)}</div></div>`);
+    } else if (msg.type === 'RESET'){
+      logEl.textContent = '';
+      voteStatus.textContent = '';
+    }
   }
 })();
\ No newline at end of file
@@ -514,6 +514,51 @@ function init() {
   };
   
   let ws = null;
+  
+  // Last applied PUBLIC_STATE (kept so PUBLIC_PATCH deltas can be applied on top)
+  let publicVersion = 0;
+  let publicData = null;
+
+  // Server clock offset (seconds), estimated from PING/PONG; countdowns are rendered locally from phase_ends_at
+  let clockOffset = 0;
+  let bestRtt = Infinity;
+  let pingTimer = null;
+  
+  function serverNow() {
+    return Date.now() / 1000 + clockOffset;
+  }
+  
+  function sendPing() {
+    if (ws && ws.readyState === WebSocket.OPEN) {
+      ws.send(JSON.stringify({ type: 'PING', t0: Date.now() / 1000 }));
+    }
+  }
+  
+  function handlePong(msg) {
+    if (msg.t0 == null || msg.server_time == null) return;
+    const t1 = Date.now() / 1000;
+    const rtt = t1 - msg.t0;
+    // Keep the sample with the smallest round trip: it has the tightest error bound
+    if (rtt <= bestRtt) {
+      bestRtt = rtt;
+      clockOffset = msg.server_time - (msg.t0 + t1) / 2;
+    }
+  }
+  
+  function startClockSync() {
+    bestRtt = Infinity;
+    sendPing();
+    setTimeout(sendPing, 500);
+    setTimeout(sendPing, 1500);
+    clearInterval(pingTimer);
+    pingTimer = setInterval(sendPing, 30000);
+  }
+  
+  function secondsLeft() {
+    const end = state.timers?.phase_ends_at;
+    if (end == null) return null;
+    return Math.max(0, Math.floor(end - serverNow()));
+  }
   let currentScreen = 'screenLobby';
   let lastPhase = 'LOBBY';
   let deathQueue = [];
@@ -604,8 +649,11 @@ function init() {
   }
   
   // ============ CONNECTION ============
+  // Highest seq seen; sent back as ?since= so a reconnect replays only what was missed
+  let lastSeq = 0;
+
   function connect() {
-    const url = `${WS_URL}/ws?client=tv`;
+    const url = `${WS_URL}/ws?client=tv&delta=1&batch=1` + (lastSeq ? `&since=${lastSeq}` : '');
     console.log('[TV] Connecting:', url);
     
     ws = new WebSocket(url);
@@ -613,12 +661,14 @@ function init() {
     ws.onopen = () => {
       console.log('[TV] Connected');
       setConnected(true);
+      startClockSync();
       fx?.burst({ kind: 'magic', count: 20 });
     };
     
     ws.onclose = () => {
       console.log('[TV] Disconnected');
       setConnected(false);
+      clearInterval(pingTimer);
       setTimeout(connect, 1500);
     };
     
@@ -630,7 +680,30 @@ function init() {
     ws.onmessage = (e) => {
       try {
         const msg = JSON.parse(e.data);
-        handleMessage(msg);
+        // BATCH carries every message the server queued for us in one tick
+        for (const m of (msg.type === 'BATCH' ? msg.messages : [msg])) {
+          if (m.type === 'HELLO') lastSeq = m.seq ?? lastSeq;
+          else if (m.seq > lastSeq) lastSeq = m.seq;
+          handleMessage(m);
+        }
+      } catch (err) {
+        console.error('[TV] Parse error:', err);
+      }
+    };
+  }
+  
+  // Read-only alternative for spectator screens (?stream=sse): public messages over
+  // Server-Sent Events, resumed by the browser with Last-Event-ID. No PING, so the
+  // clock offset is only the rough estimate from HELLO.
+  let stream = null;
+
+  function connectStream() {
+    stream = new EventSource(`${API_URL}/api/stream`);
+    stream.onopen = () => setConnected(true);
+    stream.onerror = () => setConnected(false);
+    stream.onmessage = (e) => {
+      try {
+        handleMessage(JSON.parse(e.data));
       } catch (err) {
         console.error('[TV] Parse error:', err);
       }
@@ -645,15 +718,58 @@ function init() {
     }
   }
   
+  // Apply JSON-patch style ops (replace/add/remove) from the server
+  function applyPatch(doc, ops) {
+    for (const op of ops) {
+      const parts = op.path.split('/').slice(1).map(p => p.replace(/~1/g, '/').replace(/~0/g, '~'));
+      if (parts.length === 0) { doc = op.value; continue; }
+      let parent = doc;
+      for (const part of parts.slice(0, -1)) parent = parent[part];
+      const key = parts[parts.length - 1];
+      if (op.op === 'remove') delete parent[key];
+      else parent[key] = op.value;
+    }
+    return doc;
+  }
+  
   // ============ MESSAGE HANDLING ============
   function handleMessage(msg) {
     console.log('[TV] Message:', msg.type);
     
     switch (msg.type) {
+      case 'HELLO':
+        // First rough estimate until a PONG comes back
+        if (bestRtt === Infinity && msg.server_time) clockOffset = msg.server_time - Date.now() / 1000;
+        break;
+        
+      case 'PONG':
+        handlePong(msg);
+        break;
+        
+      case 'HEARTBEAT':
+        // Any reply keeps the server from reaping this socket as half-open
+        if (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify({ type: 'HEARTBEAT_ACK' }));
+        break;
+        
       case 'PUBLIC_STATE':
+        publicData = msg.data;
+        publicVersion = msg.version || 0;
         handlePublicState(msg.data);
         break;
         
+      case 'PUBLIC_PATCH':
+        if (!publicData || msg.base !== publicVersion) {
+          // Missed a version: ask for a full snapshot
+          console.log('[TV] Version gap, resync:', publicVersion, '->', msg.base);
+          if (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify({ type: 'RESYNC' }));
+          else if (stream) fetch(`${API_URL}/api/state`).then(r => r.json()).then(handleMessage).catch(() => {});
+          break;
+        }
+        publicData = applyPatch(publicData, msg.ops);
+        publicVersion = msg.version;
+        handlePublicState(publicData);
+        break;
+        
       case 'NARRATOR_LINE':
         appendNarrator(msg.line);
         break;
@@ -766,10 +882,11 @@ function init() {
   }
   
   function updateTimer() {
+    const secs = secondsLeft();
     const timers = {
-      'nightTimer': state.timers?.seconds_left,
-      'dayTimer': state.timers?.seconds_left,
-      'voteTimer': state.timers?.seconds_left
+      'nightTimer': secs,
+      'dayTimer': secs,
+      'voteTimer': secs
     };
     
     Object.entries(timers).forEach(([id, value]) => {
@@ -1466,7 +1583,9 @@ function init() {
   
   // ============ INITIALIZE ============
   createAmbientParticles();
-  connect();
+  if (params.get('stream') === 'sse') connectStream();
+  else connect();
+  setInterval(updateTimer, 250);
   
   console.log('[TV] === INITIALIZATION COMPLETE ===');
 }
\ No newline at end of file
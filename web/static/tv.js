@@ -197,8 +197,8 @@
     $('aliveCount').textContent = String((state.alive || []).length);
     $('deadCount').textContent = String((state.dead || []).length);
 
-    const secs = state.timers?.seconds_left;
-    $('timer').textContent = (secs === null || secs === undefined) ? '—' : `${secs}s`;
+    phaseEndsAt = state.timers?.phase_ends_at ?? null;
+    renderTimer();
 
     if (phase !== currentPhase){
       currentPhase = phase;
@@ -222,13 +222,43 @@
 
   // WebSocket
   let ws;
+  // Highest seq seen; sent back as ?since= so a reconnect replays only what was missed
+  let lastSeq = 0;
+
+  // Countdown rendered locally from phase_ends_at; clock offset estimated from PING/PONG
+  let clockOffset = 0;
+  let bestRtt = Infinity;
+  let phaseEndsAt = null;
+  function sendPing(){
+    if (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify({ type: 'PING', t0: Date.now() / 1000 }));
+  }
+  function onClockMessage(msg){
+    if (msg.type === 'HELLO' && bestRtt === Infinity && msg.server_time){
+      clockOffset = msg.server_time - Date.now() / 1000;
+    } else if (msg.type === 'PONG' && msg.t0 != null && msg.server_time != null){
+      const t1 = Date.now() / 1000;
+      if (t1 - msg.t0 <= bestRtt){
+        bestRtt = t1 - msg.t0;
+        clockOffset = msg.server_time - (msg.t0 + t1) / 2;
+      }
+    }
+  }
+  function renderTimer(){
+    const secs = phaseEndsAt == null ? null : Math.max(0, Math.floor(phaseEndsAt - (Date.now() / 1000 + clockOffset)));
+    $('timer').textContent = secs === null ? '—' : `${secs}s`;
+  }
+  setInterval(renderTimer, 250);
+  setInterval(sendPing, 30000);
   function connect(){
-    const url = `${WS_ORIGIN}/ws?client=tv`;
+    const url = `${WS_ORIGIN}/ws?client=tv&batch=1` + (lastSeq ? `&since=${lastSeq}` : '');
     ws = new WebSocket(url);
     $('ws').textContent = 'connexion…';
 
     ws.onopen = () => {
       $('ws').textContent = 'connecté';
+      bestRtt = Infinity;
+      sendPing();
+      setTimeout(sendPing, 1000);
       fx?.burst({ kind:'magic', count: 16 });
     };
     ws.onclose = () => {
@@ -240,27 +270,41 @@
     ws.onmessage = (ev) => {
       let msg;
       try{ msg = JSON.parse(ev.data); }catch{ return; }
-      if (msg.type === 'PUBLIC_STATE'){
-        applyState(msg.data);
-      } else if (msg.type === 'VOTE_RESULT'){
-        window.__voteResult = msg;
-        fx?.burst({ kind:'spark', count: 20 });
-        // refresh immediately
-        const last = window.__lastPublicState;
-        if (last) renderVotes($('voteBox'), last.alive || [], last.dead || [], last);
-      } else if (msg.type === 'NARRATOR_LINE'){
-        window.__narratorLines = window.__narratorLines || [];
-        window.__narratorLines.push(msg.line);
-        window.__narratorLines = window.__narratorLines.slice(-200);
-        appendLog(msg.line);
-      } else if (msg.type === 'RESET'){
-        window.__narratorLines = [];
-        window.__voteResult = null;
-        logEl.textContent = '';
-        $('voteBox').innerHTML = '<div class="muted">Aucun vote pour l’instant.</div>';
+      for (const m of (msg.type === 'BATCH' ? msg.messages : [msg])){
+        if (m.type === 'HELLO') lastSeq = m.seq ?? lastSeq;
+        else if (m.seq > lastSeq) lastSeq = m.seq;
+        handleMessage(m);
       }
     };
   }
 
+  function handleMessage(msg){
+    onClockMessage(msg);
+    if (msg.type === 'HEARTBEAT'){
+      // Any reply keeps the server from reaping this socket as half-open
+      if (ws && ws.readyState === WebSocket.OPEN) ws.send(JSON.stringify({ type: 'HEARTBEAT_ACK' }));
+      return;
+    }
+    if (msg.type === 'PUBLIC_STATE'){
+      applyState(msg.data);
+    } else if (msg.type === 'VOTE_RESULT'){
+      window.__voteResult = msg;
+      fx?.burst({ kind:'spark', count: 20 });
+      // refresh immediately
+      const last = window.__lastPublicState;
+      if (last) renderVotes($('voteBox'), last.alive || [], last.dead || [], last);
+    } else if (msg.type === 'NARRATOR_LINE'){
+      window.__narratorLines = window.__narratorLines || [];
+      window.__narratorLines.push(msg.line);
+      window.__narratorLines = window.__narratorLines.slice(-200);
+      appendLog(msg.line);
+    } else if (msg.type === 'RESET'){
+      window.__narratorLines = [];
+      window.__voteResult = null;
+      logEl.textContent = '';
+      $('voteBox').innerHTML = '<div class="muted">Aucun vote pour l’instant.</div>';
+    }
+  }
+
   connect();
 })();